@@ -1,4 +1,4 @@
-from pyteal import Assert, Expr, For, Int, ScratchVar, Seq, Subroutine, TealType
+from pyteal import Assert, Expr, Int, Seq, Subroutine, TealType
 
 from pytealext import Uint64Array
 from pytealext.array import INDEX_NOT_FOUND, array_exists, array_index
@@ -6,18 +6,11 @@ from pytealext.array import INDEX_NOT_FOUND, array_exists, array_index
 
 @Subroutine(TealType.bytes)
 def increment_each_element(encoded_arr: Expr, value: Expr) -> Expr:
-    """Create a copy of an arra"""
+    """Create a copy of an array with the value added to each element"""
     array_in = Uint64Array()
-    result = Uint64Array()
-    n = ScratchVar(TealType.uint64)
     return Seq(
         array_in.decode(encoded_arr),
-        n.store(array_in.length()),
-        result.initialize(),
-        For((i := ScratchVar()).store(Int(0)), i.load() < n.load(), i.store(i.load() + Int(1))).Do(
-            result.append(array_in[i.load()] + value)
-        ),
-        result.encode(),
+        array_in.map(lambda element: element + value).encode(),
     )
 
 
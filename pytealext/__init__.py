@@ -1,7 +1,8 @@
 from . import array, evaluator
-from .array import Uint64Array
+from .array import FenwickTree, PrefixSumArray, Uint64Array
 from .assemble import assemble_steps
 from .auto_load_scratch_var import AutoLoadScratchVar
+from .bitset import Bitset, PopCount
 from .cas import BytesMax, BytesMin, CompareAndSelect, Max, Min
 from .fastexp import FastExp
 from .inner_transactions import (
@@ -23,6 +24,7 @@ from .inner_transactions import (
 from .lazy import LazyAnd, LazyOr
 from .mul128 import Mul128
 from .muldiv64 import MulDiv64
+from .packed_array import BitPackedArray, Uint8Array, Uint16Array, Uint32Array
 from .saturation_math import SaturatingAdd, SaturatingSub
 from .serialize import DeserializeIntegers, DeserializeIntegersToSlots, ExtractSL, SerializeIntegers
 from .state import (
@@ -39,6 +41,7 @@ __all__ = [
     "array",
     "assemble_steps",
     "AutoLoadScratchVar",
+    "Bitset",
     "evaluator",
     "CompareAndSelect",
     "ExtractSL",
@@ -58,6 +61,7 @@ __all__ = [
     "MakeInnerApplicationCallTxn",
     "MakeInnerNoOpTxn",
     "Mul128",
+    "PopCount",
     "MulDiv64",
     "Min",
     "Max",
@@ -78,4 +82,10 @@ __all__ = [
     "SaturatingAdd",
     "SaturatingSub",
     "Uint64Array",
+    "PrefixSumArray",
+    "FenwickTree",
+    "Uint32Array",
+    "Uint16Array",
+    "Uint8Array",
+    "BitPackedArray",
 ]
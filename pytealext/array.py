@@ -1,29 +1,81 @@
+# pylint: disable=too-many-lines
+from typing import Callable, Iterator
+
 from pyteal import (
+    Assert,
     Bytes,
     BytesMul,
+    BytesZero,
+    CompileOptions,
     Concat,
     Expr,
+    Extract,
     ExtractUint64,
     For,
     If,
     Int,
     Itob,
     Len,
+    Op,
     Replace,
     Return,
     ScratchVar,
     Seq,
     Subroutine,
+    TealBlock,
+    TealInputError,
+    TealOp,
+    TealSimpleBlock,
     TealType,
+    While,
 )
+from pyteal.types import require_type
 
+from .assemble import assemble_steps
+from .lazy import LazyOr
 from .mul128 import Mul128
 
 EMPTY_ARRAY = Bytes("")
 INDEX_NOT_FOUND = Int(2**64 - 1)
+# prefix sums of an empty array: a single 0
+EMPTY_PREFIX_SUMS = Bytes(bytes(8))
+
+# Reductions of arrays with a length known at build time are unrolled into straight-line code,
+# which is cheaper than a loop for any length. Unrolled code grows with the length,
+# it's used as long as its estimated size doesn't exceed this many bytes.
+UNROLL_SIZE_LIMIT = 128
+# estimated size of the code unrolled for each element:
+# load cache, offset, extract_uint64 and the operation (+ or *)
+UNROLLED_REDUCE_SIZE = 6
+# load cache, offset, extract_uint64, load value, ==, branches and the result of the matching element
+UNROLLED_EXISTS_SIZE = 15
+UNROLLED_INDEX_SIZE = 18
+# a pair of elements multiplied with Mul128 (2 extracts, mulw, 2 itob, 2 swaps, concat) and its share of b*
+UNROLLED_PRODUCT_BYTES_SIZE = 9
+
+
+def product_bytes_loop_cost(length: int) -> int:
+    """Estimated opcode cost of array_product_bytes for an array of the given length.
+
+    The first pair costs 44 ops including the call, each next pair 45 (b* alone costs 20) and an odd element 27.
+    """
+    if length < 2:
+        return 14 + 5 * length
+    return 44 + 45 * ((length - 2) // 2) + 27 * (length % 2)
+
 
+def product_bytes_tree_cost(length: int) -> int:
+    """Estimated opcode cost of array_product_bytes_tree for an array of the given length.
 
-class Uint64Array:
+    Each pair costs 12 ops (Mul128 of 2 extracted elements), an odd element 4 and each b* joining the results 20.
+    """
+    if length == 0:
+        return 2
+    leaves = (length + 1) // 2
+    return 12 * (length // 2) + 4 * (length % 2) + 20 * (leaves - 1)
+
+
+class Uint64Array:  # pylint: disable=too-many-public-methods
     """Abstraction layer for handling arrays of uint64s stored as bytes
 
     The array must be initialized either by calling initialize() or decode().
@@ -50,12 +102,43 @@ class Uint64Array:
         )
     ```
 
+    Example fixed length array:
+    ```
+        weights = Uint64Array(length=4)
+        program = Seq(
+            weights.decode(App.globalGet(Bytes("weights"))),
+            weights.sum(),  # unrolled, no loop
+        )
+    ```
+
     Note:
         `.set()` method requires TEALv7+
     """
 
-    def __init__(self) -> None:
+    def __init__(self, length: int | None = None, unroll_size_limit: int = UNROLL_SIZE_LIMIT) -> None:
+        """
+        Args:
+            length: number of elements of a fixed length array, the array must hold exactly this many elements.
+                sum, product, exists and index of fixed length arrays are unrolled into straight-line code
+                when the unrolled code isn't estimated to be larger than unroll_size_limit bytes.
+                Operations changing the length (append, extend, insert_sorted, remove_sorted) are not available.
+            unroll_size_limit: maximum estimated size in bytes of unrolled code
+        """
+        if length is not None and length < 0:
+            raise TealInputError(f"Invalid array length: {length}")
         self.cache = ScratchVar(TealType.bytes)
+        self.fixed_length = length
+        self.unroll_size_limit = unroll_size_limit
+
+    def _unrolled_length(self, element_size: int) -> int | None:
+        """Get the length to unroll an operation of the given size per element for, None if it shouldn't be"""
+        if self.fixed_length is not None and self.fixed_length * element_size <= self.unroll_size_limit:
+            return self.fixed_length
+        return None
+
+    def _require_variable_length(self, operation: str):
+        if self.fixed_length is not None:
+            raise TealInputError(f"{operation} changes the length of a fixed length array")
 
     def initialize(self) -> Expr:
         """Initialize an empty array.
@@ -80,8 +163,20 @@ class Uint64Array:
 
     def append(self, value: Expr) -> Expr:
         """Append a new element to the end of this array."""
+        self._require_variable_length("append")
         return self.cache.store(Concat(self.cache.load(), Itob(value)))
 
+    def extend(self, *values: Expr) -> Expr:
+        """Append the values to the end of this array.
+
+        The encoded values are concatenated to the array and stored once,
+        which costs 2 ops per value less than appending them one by one.
+        """
+        self._require_variable_length("extend")
+        if not values:
+            return Seq()
+        return self.cache.store(Concat(self.cache.load(), *(Itob(value) for value in values)))
+
     def set(self, index: Expr | int, value: Expr) -> Expr:
         """Set the value at the given index to the given value."""
         if isinstance(index, int):
@@ -92,6 +187,8 @@ class Uint64Array:
 
     def length(self) -> Expr:
         """Retrieve the expression evaluating to the length of this array."""
+        if self.fixed_length is not None:
+            return Int(self.fixed_length)
         return array_length(self.cache.load())
 
     def __getitem__(self, index: Expr | int) -> Expr:
@@ -103,8 +200,29 @@ class Uint64Array:
 
         If the sum is greater or equal to 2^64, the runtime will panic.
         """
+        if (length := self._unrolled_length(UNROLLED_REDUCE_SIZE)) is not None:
+            return array_sum_unrolled(self.cache.load(), length)
         return array_sum(self.cache.load())
 
+    def sum_wide(self) -> Expr:
+        """Calculate the sum of the values as a 128-bit big-endian integer (16 bytes).
+
+        The result never overflows and is a standard TEAL big int.
+        """
+        return array_sum_wide(self.cache.load())
+
+    def sum_wide_pair(self, hi: ScratchVar, lo: ScratchVar) -> Expr:
+        """Calculate the sum of the values as a 128-bit integer, store its high and low 64 bits in hi and lo."""
+        return array_sum_wide_pair(self.cache.load(), hi, lo)
+
+    def sum_checked(self, result: ScratchVar) -> Expr:
+        """Calculate the sum of the values without panicking on overflow.
+
+        Return 1 and store the sum in result if it's less than 2^64,
+        otherwise return 0 and leave the result unchanged.
+        """
+        return array_sum_checked(self.cache.load(), result)
+
     def product(self):
         """Calculate the product of the values.
 
@@ -112,6 +230,8 @@ class Uint64Array:
 
         NOTE: Product of a 0 length array is one.
         """
+        if (length := self._unrolled_length(UNROLLED_REDUCE_SIZE)) is not None:
+            return array_product_unrolled(self.cache.load(), length)
         return array_product(self.cache.load())
 
     def product_bytes(self):
@@ -120,11 +240,19 @@ class Uint64Array:
         The result is a standard TEAL big int.
 
         NOTE: Product of a 0 length array is one.
+
+        The product of a fixed length array is reduced as a balanced tree of straight-line code
+        when the cost model estimates it to be cheaper than the loop and its size is within the unroll size limit.
         """
+        length = self._unrolled_length(UNROLLED_PRODUCT_BYTES_SIZE)
+        if length is not None and product_bytes_tree_cost(length) < product_bytes_loop_cost(length):
+            return array_product_bytes_tree(self.cache.load(), length)
         return array_product_bytes(self.cache.load())
 
     def exists(self, value: Expr):
         """Check if a value exists in the array."""
+        if (length := self._unrolled_length(UNROLLED_EXISTS_SIZE)) is not None:
+            return array_exists_unrolled(self.cache.load(), value, length)
         return array_exists(self.cache.load(), value)
 
     def index(self, value: Expr):
@@ -132,8 +260,381 @@ class Uint64Array:
 
         If not found, return INDEX_NOT_FOUND (2**64-1).
         """
+        if (length := self._unrolled_length(UNROLLED_INDEX_SIZE)) is not None:
+            return array_index_unrolled(self.cache.load(), value, length)
         return array_index(self.cache.load(), value)
 
+    def lower_bound(self, value: Expr):
+        """Get the index of the first element not less than the value in a sorted array.
+
+        If all elements are less than the value, return the length of the array.
+
+        Complexity: O(log n)
+        """
+        return array_lower_bound(self.cache.load(), value)
+
+    def bsearch(self, value: Expr):
+        """Get the index of the value in a sorted array.
+
+        If not found, return INDEX_NOT_FOUND (2**64-1).
+
+        Complexity: O(log n)
+        """
+        return array_bsearch(self.cache.load(), value)
+
+    def insert_sorted(self, value: Expr) -> Expr:
+        """Insert the value into a sorted array, keeping it sorted.
+
+        The value is inserted before the elements equal to it.
+        """
+        self._require_variable_length("insert_sorted")
+        return self.cache.store(array_insert_sorted(self.cache.load(), value))
+
+    def remove_sorted(self, value: Expr) -> Expr:
+        """Remove the first occurrence of the value from a sorted array.
+
+        If the value is not in the array, the array is left unchanged.
+        """
+        self._require_variable_length("remove_sorted")
+        return self.cache.store(array_remove_sorted(self.cache.load(), value))
+
+    def map(self, f: Callable[[Expr], Expr]) -> "ArrayPipeline":
+        """Transform each element with f, see ArrayPipeline.
+
+        Args:
+            f: function building the expression of the new element (TealType.uint64) from the element
+        """
+        return ArrayPipeline(self.cache).map(f)
+
+    def filter(self, predicate: Callable[[Expr], Expr]) -> "ArrayPipeline":
+        """Keep only the elements for which the predicate evaluates to a non-zero value, see ArrayPipeline.
+
+        Args:
+            predicate: function building the condition (TealType.uint64) from the element
+        """
+        return ArrayPipeline(self.cache).filter(predicate)
+
+    def reduce(self, f: Callable[[Expr, Expr], Expr], initial: Expr) -> Expr:
+        """Combine the elements from left to right into a single value, starting with the initial value.
+
+        Args:
+            f: function building the expression of the next accumulated value from the accumulated value
+                and the element, the type of the result must match the type of the initial value
+            initial: the initial value, returned for an empty array
+        """
+        return ArrayPipeline(self.cache).reduce(f, initial)
+
+
+class ArrayPipeline:
+    """Chain of map and filter operations over a Uint64Array, evaluated in a single loop
+
+    The operations are fused when the pipeline is consumed with encode() or reduce(),
+    so no intermediate arrays are built. The result array of encode() is preallocated with bzero
+    and written with replace instead of appending each element.
+
+    Example usage:
+    ```
+        arr = Uint64Array()
+        result = Uint64Array()
+        program = Seq(
+            arr.decode(Txn.application_args[0]),
+            # single loop: multiply each element by 3 and keep the even results
+            result.decode(arr.map(lambda x: x * Int(3)).filter(lambda x: x % Int(2) == Int(0)).encode()),
+            # single loop: sum of squares
+            arr.reduce(lambda acc, x: acc + x * x, Int(0)),
+        )
+    ```
+
+    Note:
+        The functions may evaluate their arguments any number of times, the arguments are scratch slot loads.
+        `.encode()` method requires TEALv7+
+    """
+
+    def __init__(self, cache: ScratchVar, stages: tuple[tuple[str, Callable[[Expr], Expr]], ...] = ()) -> None:
+        """
+        Args:
+            cache: scratch variable holding the encoded input array
+            stages: map/filter operations applied to each element, in order
+        """
+        self.cache = cache
+        self.stages = stages
+
+    def map(self, f: Callable[[Expr], Expr]) -> "ArrayPipeline":
+        """Transform each element with f."""
+        return ArrayPipeline(self.cache, self.stages + (("map", f),))
+
+    def filter(self, predicate: Callable[[Expr], Expr]) -> "ArrayPipeline":
+        """Keep only the elements for which the predicate evaluates to a non-zero value."""
+        return ArrayPipeline(self.cache, self.stages + (("filter", predicate),))
+
+    def encode(self) -> Expr:
+        """Evaluate the pipeline into a new encoded array."""
+        result = ScratchVar(TealType.bytes)
+        written = ScratchVar(TealType.uint64)
+        filtered = any(kind == "filter" for kind, _ in self.stages)
+
+        def setup(size: Expr) -> Expr:
+            if not filtered:
+                return result.store(BytesZero(size))
+            return Seq(result.store(BytesZero(size)), written.store(Int(0)))
+
+        def emit(value: Expr, position: Expr) -> Expr:
+            if not filtered:
+                # each element is written at its position in the input
+                return result.store(Replace(result.load(), position, Itob(value)))
+            return Seq(
+                result.store(Replace(result.load(), written.load(), Itob(value))),
+                written.store(written.load() + Int(8)),
+            )
+
+        return Seq(
+            self._loop(setup, emit),
+            Extract(result.load(), Int(0), written.load()) if filtered else result.load(),
+        )
+
+    def reduce(self, f: Callable[[Expr, Expr], Expr], initial: Expr) -> Expr:
+        """Combine the elements left after the pipeline from left to right into a single value.
+
+        Args:
+            f: function building the expression of the next accumulated value from the accumulated value
+                and the element, the type of the result must match the type of the initial value
+            initial: the initial value, returned if no elements are left
+        """
+        accumulator = ScratchVar(initial.type_of())
+
+        def emit(value: Expr, _: Expr) -> Expr:
+            step = f(accumulator.load(), value)
+            require_type(step, initial.type_of())
+            return accumulator.store(step)
+
+        return Seq(self._loop(lambda _: accumulator.store(initial), emit), accumulator.load())
+
+    def _loop(self, setup: Callable[[Expr], Expr], emit: Callable[[Expr, Expr], Expr]) -> Expr:
+        """Build the loop passing each element left after the stages and its byte position in the input to emit
+
+        Args:
+            setup: function building the expression evaluated before the loop from the size of the input in bytes
+            emit: function building the expression consuming an element
+        """
+        position = ScratchVar(TealType.uint64)
+        end = ScratchVar(TealType.uint64)
+        element = ScratchVar(TealType.uint64)
+
+        # build the body from the innermost stage outwards
+        body = emit(element.load(), position.load())
+        for kind, f in reversed(self.stages):
+            step = f(element.load())
+            require_type(step, TealType.uint64)
+            if kind == "map":
+                body = Seq(element.store(step), body)
+            else:
+                body = If(step).Then(body)
+
+        return Seq(
+            end.store(Len(self.cache.load())),
+            setup(end.load()),
+            For(position.store(Int(0)), position.load() < end.load(), position.store(position.load() + Int(8))).Do(
+                Seq(element.store(ExtractUint64(self.cache.load(), position.load())), body)
+            ),
+        )
+
+
+class PrefixSumArray:
+    """Array of uint64s stored as its prefix sums, answering range sums in O(1)
+
+    The binary representation is a Uint64Array of the n+1 prefix sums of the n elements, starting with 0:
+    [0, a[0], a[0] + a[1], ...]. A range sum is the difference of two prefix sums,
+    while updating an element rewrites the prefix sums after it in O(n).
+    If the elements are updated about as often as the range sums are queried, use FenwickTree.
+
+    Example usage:
+    ```
+        rewards = PrefixSumArray()
+        program = Seq(
+            rewards.build(App.globalGet(Bytes("epoch_rewards"))),  # encoded Uint64Array
+            rewards.range_sum(Int(2), Int(5)),  # rewards of epochs 2, 3 and 4
+        )
+    ```
+    """
+
+    def __init__(self) -> None:
+        self.cache = ScratchVar(TealType.bytes)
+
+    def initialize(self) -> Expr:
+        """Initialize an empty array.
+
+        If the array is already initialized, this will clear it.
+        """
+        return self.cache.store(EMPTY_PREFIX_SUMS)
+
+    def build(self, values: Expr) -> Expr:
+        """Initialize the array with the values of an encoded Uint64Array.
+
+        Complexity: O(n)
+        """
+        return self.cache.store(prefix_sums(values))
+
+    def decode(self, value: Expr) -> Expr:
+        """Decode a bytestring of prefix sums into an array.
+
+        This method initializes the array.
+        If the array is already initialized, previous content will be lost.
+
+        Lazy, complexity: O(1)
+        """
+        return self.cache.store(value)
+
+    def encode(self) -> Expr:
+        """Retrieve the binary string representation of this array."""
+        return self.cache.load()
+
+    def append(self, value: Expr) -> Expr:
+        """Append a new element to the end of this array.
+
+        If the sum of the elements is greater or equal to 2^64, the runtime will panic.
+        """
+        return self.cache.store(Concat(self.cache.load(), Itob(self.sum() + value)))
+
+    def set(self, index: Expr | int, value: Expr) -> Expr:
+        """Set the value at the given index to the given value.
+
+        Complexity: O(n)
+        """
+        return self.cache.store(prefix_sum_array_set(self.cache.load(), _as_expr(index), value))
+
+    def add(self, index: Expr | int, delta: Expr) -> Expr:
+        """Add delta to the value at the given index.
+
+        Complexity: O(n)
+        """
+        return self.cache.store(prefix_sum_array_add(self.cache.load(), _as_expr(index), delta))
+
+    def length(self) -> Expr:
+        """Retrieve the expression evaluating to the length of this array."""
+        return array_length(self.cache.load()) - Int(1)
+
+    def __getitem__(self, index: Expr | int) -> Expr:
+        """Retrieve the value at the given index."""
+        if isinstance(index, int):
+            return self.range_sum(index, index + 1)
+        i = ScratchVar(TealType.uint64)
+        return Seq(i.store(index), self.range_sum(i.load(), i.load() + Int(1)))
+
+    def prefix_sum(self, end: Expr | int) -> Expr:
+        """Calculate the sum of the first `end` values."""
+        return array_get(self.cache.load(), end)
+
+    def range_sum(self, start: Expr | int, end: Expr | int) -> Expr:
+        """Calculate the sum of the values with indexes from start (inclusive) to end (exclusive).
+
+        Complexity: O(1)
+        """
+        return self.prefix_sum(end) - self.prefix_sum(start)
+
+    def sum(self) -> Expr:
+        """Calculate the sum of the values.
+
+        Complexity: O(1)
+        """
+        return ExtractUint64(self.cache.load(), Len(self.cache.load()) - Int(8))
+
+
+class FenwickTree:
+    """Array of uint64s stored as a Fenwick tree (binary indexed tree), updated and summed in O(log n)
+
+    The binary representation is a Uint64Array of n nodes, node k (counted from 1)
+    holds the sum of the lowbit(k) elements ending with element k-1, where lowbit(k) is the lowest set bit of k.
+
+    Example usage:
+    ```
+        stakes = FenwickTree()
+        program = Seq(
+            stakes.build(App.globalGet(Bytes("stakes"))),  # encoded Uint64Array
+            stakes.add(Int(3), Btoi(Txn.application_args[0])),
+            App.globalPut(Bytes("stakes"), stakes.encode()),
+            stakes.range_sum(Int(0), Int(4)),
+        )
+    ```
+    """
+
+    def __init__(self) -> None:
+        self.cache = ScratchVar(TealType.bytes)
+
+    def initialize(self, length: Expr | int) -> Expr:
+        """Initialize a tree of the given number of zeros.
+
+        If the tree is already initialized, this will clear it.
+        """
+        size = Int(length * 8) if isinstance(length, int) else length * Int(8)
+        return self.cache.store(BytesZero(size))
+
+    def build(self, values: Expr) -> Expr:
+        """Initialize the tree with the values of an encoded Uint64Array.
+
+        Complexity: O(n)
+        """
+        return self.cache.store(fenwick_build(values))
+
+    def decode(self, value: Expr) -> Expr:
+        """Decode a bytestring of nodes into a tree.
+
+        This method initializes the tree.
+        If the tree is already initialized, previous content will be lost.
+
+        Lazy, complexity: O(1)
+        """
+        return self.cache.store(value)
+
+    def encode(self) -> Expr:
+        """Retrieve the binary string representation of this tree."""
+        return self.cache.load()
+
+    def set(self, index: Expr | int, value: Expr) -> Expr:
+        """Set the value at the given index to the given value.
+
+        Complexity: O(log n)
+        """
+        return self.cache.store(fenwick_set(self.cache.load(), _as_expr(index), value))
+
+    def add(self, index: Expr | int, delta: Expr) -> Expr:
+        """Add delta to the value at the given index.
+
+        Complexity: O(log n)
+        """
+        return self.cache.store(fenwick_add(self.cache.load(), _as_expr(index), delta))
+
+    def length(self) -> Expr:
+        """Retrieve the expression evaluating to the length of this array."""
+        return array_length(self.cache.load())
+
+    def __getitem__(self, index: Expr | int) -> Expr:
+        """Retrieve the value at the given index.
+
+        Complexity: O(log n)
+        """
+        return fenwick_get(self.cache.load(), _as_expr(index))
+
+    def prefix_sum(self, end: Expr | int) -> Expr:
+        """Calculate the sum of the first `end` values.
+
+        Complexity: O(log n)
+        """
+        return fenwick_prefix_sum(self.cache.load(), _as_expr(end))
+
+    def range_sum(self, start: Expr | int, end: Expr | int) -> Expr:
+        """Calculate the sum of the values with indexes from start (inclusive) to end (exclusive).
+
+        Complexity: O(log n)
+        """
+        return fenwick_range_sum(self.cache.load(), _as_expr(start), _as_expr(end))
+
+    def sum(self) -> Expr:
+        """Calculate the sum of the values.
+
+        Complexity: O(log n)
+        """
+        return fenwick_prefix_sum(self.cache.load(), self.length())
+
 
 def array_get(cache: Expr, index: Expr | int) -> Expr:
     """Retrieve the value at the given index."""
@@ -149,21 +650,139 @@ def array_length(cache: Expr) -> Expr:
     return Len(cache) / Int(8)
 
 
+def _as_expr(value: Expr | int) -> Expr:
+    return Int(value) if isinstance(value, int) else value
+
+
+def for_each_position(end: Expr, step: int, body: Callable[[Expr], Expr]) -> Expr:
+    """Loop over the positions 0, step, 2*step, ... less than end
+
+    Args:
+        end (TealType.uint64): end of the range, evaluated once before the loop
+        step: difference between consecutive positions
+        body: function building the body of the loop from the expression loading the current position
+    """
+    position = ScratchVar(TealType.uint64)
+    end_position = ScratchVar(TealType.uint64)
+    return Seq(
+        end_position.store(end),
+        For(
+            position.store(Int(0)), position.load() < end_position.load(), position.store(position.load() + Int(step))
+        ).Do(body(position.load())),
+    )
+
+
+class _AddCarry(Expr):
+    """Add the value to the uint64 accumulator with addw, evaluate to the carry (0 or 1)"""
+
+    def __init__(self, accumulator: ScratchVar, value: Expr):
+        super().__init__()
+        require_type(value, TealType.uint64)
+        self.accumulator = accumulator
+        self.value = value
+
+    def _get_steps(self) -> Iterator[Expr | TealOp]:
+        yield self.accumulator.load()
+        yield self.value
+        yield TealOp(self, Op.addw)
+        # store the low 64 bits, the carry stays on the stack
+        yield self.accumulator.slot.store()
+
+    def __teal__(self, options: CompileOptions) -> tuple[TealBlock, TealSimpleBlock]:
+        return assemble_steps(self._get_steps(), options)
+
+    def __str__(self):
+        return f"(AddCarry {self.accumulator} {self.value})"
+
+    def type_of(self):
+        return TealType.uint64
+
+    def has_return(self):
+        return False
+
+
+def array_sum_unrolled(cache: Expr, length: int) -> Expr:
+    """Calculate the sum of the values of an array of the given length without a loop.
+
+    If the sum is greater or equal to 2^64, the runtime will panic.
+    """
+    total: Expr = Int(0)
+    for i in range(length):
+        element = array_get(cache, i)
+        total = element if i == 0 else total + element
+    return total
+
+
+def array_product_unrolled(cache: Expr, length: int) -> Expr:
+    """Calculate the product of the values of an array of the given length without a loop.
+
+    If at any point the accumulator exceeds 2^64, the runtime will panic.
+    """
+    product: Expr = Int(1)
+    for i in range(length):
+        element = array_get(cache, i)
+        product = element if i == 0 else product * element
+    return product
+
+
+def array_exists_unrolled(cache: Expr, value: Expr, length: int) -> Expr:
+    """Check if a value exists in an array of the given length without a loop."""
+    v = ScratchVar(TealType.uint64)
+    if length == 0:
+        return Seq(v.store(value), Int(0))
+    return Seq(v.store(value), LazyOr(*(array_get(cache, i) == v.load() for i in range(length))))
+
+
+def array_index_unrolled(cache: Expr, value: Expr, length: int) -> Expr:
+    """Get the index of the value in an array of the given length without a loop.
+
+    If not found, return INDEX_NOT_FOUND (2**64-1).
+    """
+    v = ScratchVar(TealType.uint64)
+    index: Expr = INDEX_NOT_FOUND
+    for i in reversed(range(length)):
+        index = If(array_get(cache, i) == v.load()).Then(Int(i)).Else(index)
+    return Seq(v.store(value), index)
+
+
+def array_product_bytes_tree(cache: Expr, length: int) -> Expr:
+    """Calculate the product of the values of an array of the given length without a loop.
+
+    The result is a standard TEAL big int.
+
+    Pairs of elements are multiplied with Mul128 and the partial products are multiplied in a balanced tree,
+    so the operands of b* grow evenly. Operands of b* are limited to 64 bytes, with values close to 2^64
+    the tree handles up to 16 elements, while multiplying into a running product handles up to 10.
+    The intermediate results are kept on the stack.
+    """
+    if length == 0:
+        return Itob(Int(1))
+    products: list[Expr] = [Mul128(array_get(cache, i), array_get(cache, i + 1)) for i in range(0, length - 1, 2)]
+    if length % 2:
+        products.append(Itob(array_get(cache, length - 1)))
+    while len(products) > 1:
+        paired = [BytesMul(products[i], products[i + 1]) for i in range(0, len(products) - 1, 2)]
+        if len(products) % 2:
+            paired.append(products[-1])
+        products = paired
+    return products[0]
+
+
+# The loops below step a byte position by 8 and compare it against the length of the array in bytes
+# computed before the loop, instead of converting an element index to a position on each iteration.
+
+
 @Subroutine(TealType.uint64)
 def array_index(cache: Expr, value: Expr) -> Expr:
     """Get the index of the value in the array.
 
     If not found, return INDEX_NOT_FOUND (2**64-1).
     """
-    i = ScratchVar(TealType.uint64)
-    inner_array = Uint64Array()
-    length = ScratchVar(TealType.uint64)
-
     return Seq(
-        inner_array.decode(cache),
-        length.store(inner_array.length()),
-        For(i.store(Int(0)), i.load() < length.load(), i.store(i.load() + Int(1))).Do(
-            If(inner_array[i.load()] == value).Then(Return(i.load()))
+        for_each_position(
+            Len(cache),
+            8,
+            lambda position: If(ExtractUint64(cache, position) == value).Then(Return(position / Int(8))),
         ),
         Return(INDEX_NOT_FOUND),
     )
@@ -172,13 +791,9 @@ def array_index(cache: Expr, value: Expr) -> Expr:
 @Subroutine(TealType.uint64)
 def array_exists(cache: Expr, value: Expr) -> Expr:
     """Check if a value exists in the array."""
-    i = ScratchVar(TealType.uint64)
-    inner_array = Uint64Array()
-
     return Seq(
-        inner_array.decode(cache),
-        For(i.store(Int(0)), i.load() < inner_array.length(), i.store(i.load() + Int(1))).Do(
-            If(inner_array[i.load()] == value).Then(Return(Int(1)))
+        for_each_position(
+            Len(cache), 8, lambda position: If(ExtractUint64(cache, position) == value).Then(Return(Int(1)))
         ),
         Return(Int(0)),
     )
@@ -190,36 +805,72 @@ def array_sum(cache: Expr) -> Expr:
 
     If the sum is greater or equal to 2^64, the runtime will panic.
     """
-    inner_array = Uint64Array()
     S = ScratchVar(TealType.uint64)
-    i = ScratchVar(TealType.uint64)
-    n = ScratchVar(TealType.uint64)
 
     return Seq(
-        inner_array.decode(cache),
-        n.store(inner_array.length()),
         S.store(Int(0)),
-        For(i.store(Int(0)), i.load() < n.load(), i.store(i.load() + Int(1))).Do(
-            S.store(S.load() + inner_array[i.load()])
-        ),
+        for_each_position(Len(cache), 8, lambda position: S.store(S.load() + ExtractUint64(cache, position))),
         S.load(),
     )
 
 
+def _sum_wide(cache: Expr, hi: ScratchVar, lo: ScratchVar) -> Expr:
+    """Sum the values into the high and low 64 bits of a 128-bit accumulator"""
+    return Seq(
+        hi.store(Int(0)),
+        lo.store(Int(0)),
+        # the length of an array is below 2^61, so the high bits can't overflow
+        for_each_position(
+            Len(cache), 8, lambda position: hi.store(hi.load() + _AddCarry(lo, ExtractUint64(cache, position)))
+        ),
+    )
+
+
+@Subroutine(TealType.bytes)
+def array_sum_wide(cache: Expr) -> Expr:
+    """Calculate the sum of the values as a 128-bit big-endian integer (16 bytes)."""
+    hi = ScratchVar(TealType.uint64)
+    lo = ScratchVar(TealType.uint64)
+
+    return Seq(_sum_wide(cache, hi, lo), Concat(Itob(hi.load()), Itob(lo.load())))
+
+
+@Subroutine(TealType.none)
+def array_sum_wide_pair(cache: Expr, hi: ScratchVar, lo: ScratchVar) -> Expr:
+    """Calculate the sum of the values as a 128-bit integer, store its high and low 64 bits in hi and lo."""
+    # accumulate locally, stores to the referenced variables are more expensive
+    local_hi = ScratchVar(TealType.uint64)
+    local_lo = ScratchVar(TealType.uint64)
+
+    return Seq(_sum_wide(cache, local_hi, local_lo), hi.store(local_hi.load()), lo.store(local_lo.load()))
+
+
+@Subroutine(TealType.uint64)
+def array_sum_checked(cache: Expr, result: ScratchVar) -> Expr:
+    """Calculate the sum of the values without panicking on overflow.
+
+    Return 1 and store the sum in result if it's less than 2^64,
+    otherwise return 0 and leave the result unchanged.
+    """
+    S = ScratchVar(TealType.uint64)
+
+    return Seq(
+        S.store(Int(0)),
+        for_each_position(
+            Len(cache), 8, lambda position: If(_AddCarry(S, ExtractUint64(cache, position))).Then(Return(Int(0)))
+        ),
+        result.store(S.load()),
+        Return(Int(1)),
+    )
+
+
 @Subroutine(TealType.uint64)
 def array_product(cache: Expr) -> Expr:
     """Calculate the product of the values. If at any point the accumulator exceeds 2^64, the runtime will panic."""
-    inner_array = Uint64Array()
     p = ScratchVar(TealType.uint64)
-    i = ScratchVar(TealType.uint64)
-    n = ScratchVar(TealType.uint64)
     return Seq(
-        inner_array.decode(cache),
-        n.store(inner_array.length()),
         p.store(Int(1)),
-        For(i.store(Int(0)), i.load() < n.load(), i.store(i.load() + Int(1))).Do(
-            p.store(p.load() * inner_array[i.load()])
-        ),
+        for_each_position(Len(cache), 8, lambda position: p.store(p.load() * ExtractUint64(cache, position))),
         p.load(),
     )
 
@@ -227,30 +878,43 @@ def array_product(cache: Expr) -> Expr:
 @Subroutine(TealType.bytes)
 def array_product_bytes(cache: Expr) -> Expr:
     """Calculate the product of the values. The result is a standard TEAL big int."""
-    inner_array = Uint64Array()
     P = ScratchVar(TealType.bytes)
-    i = ScratchVar(TealType.uint64)
-    n = ScratchVar(TealType.uint64)
+    position = ScratchVar(TealType.uint64)
+    end = ScratchVar(TealType.uint64)
+    pairs_end = ScratchVar(TealType.uint64)
     return Seq(
-        inner_array.decode(cache),
-        n.store(inner_array.length()),
-        If(n.load())
+        end.store(Len(cache)),
+        If(end.load())
         .Then(
-            If(n.load() == Int(1))
+            If(end.load() == Int(8))
             .Then(
-                Itob(inner_array[0]),
+                Itob(ExtractUint64(cache, Int(0))),
             )
             .Else(
                 Seq(
-                    P.store(Mul128(inner_array[0], inner_array[1])),
+                    P.store(Mul128(ExtractUint64(cache, Int(0)), ExtractUint64(cache, Int(8)))),
                     # In this algorithm next values are multiplied in pair and
                     # next multiplied by counter because Mul128 is cheaper then BytesMul
-                    For(i.store(Int(3)), i.load() < n.load(), i.store(i.load() + Int(2))).Do(
-                        P.store(BytesMul(P.load(), Mul128(inner_array[i.load() - Int(1)], inner_array[i.load()])))
+                    pairs_end.store(end.load() - Int(8)),  # position of the last element
+                    For(
+                        position.store(Int(16)),
+                        position.load() < pairs_end.load(),
+                        position.store(position.load() + Int(16)),
+                    ).Do(
+                        P.store(
+                            BytesMul(
+                                P.load(),
+                                Mul128(
+                                    ExtractUint64(cache, position.load()),
+                                    ExtractUint64(cache, position.load() + Int(8)),
+                                ),
+                            )
+                        )
                     ),
-                    If(n.load() % Int(2) == Int(1)).Then(
+                    # the loop stops at the last element when the length is odd
+                    If(position.load() < end.load()).Then(
                         # black: no line break
-                        P.store(BytesMul(P.load(), Itob(inner_array[n.load() - Int(1)])))
+                        P.store(BytesMul(P.load(), Itob(ExtractUint64(cache, position.load()))))
                     ),
                     P.load(),
                 )
@@ -258,3 +922,255 @@ def array_product_bytes(cache: Expr) -> Expr:
         )
         .Else(Itob(Int(1))),
     )
+
+
+@Subroutine(TealType.uint64)
+def array_lower_bound(cache: Expr, value: Expr) -> Expr:
+    """Get the index of the first element not less than the value in a sorted array.
+
+    If all elements are less than the value, return the length of the array.
+    """
+    low = ScratchVar(TealType.uint64)
+    high = ScratchVar(TealType.uint64)
+    mid = ScratchVar(TealType.uint64)
+
+    return Seq(
+        low.store(Int(0)),
+        high.store(array_length(cache)),
+        # the length of an array is below 2^61, so the sum of indices can't overflow
+        While(low.load() < high.load()).Do(
+            mid.store((low.load() + high.load()) / Int(2)),
+            If(array_get(cache, mid.load()) < value).Then(low.store(mid.load() + Int(1))).Else(high.store(mid.load())),
+        ),
+        low.load(),
+    )
+
+
+@Subroutine(TealType.uint64)
+def array_bsearch(cache: Expr, value: Expr) -> Expr:
+    """Get the index of the value in a sorted array.
+
+    If not found, return INDEX_NOT_FOUND (2**64-1).
+    """
+    i = ScratchVar(TealType.uint64)
+
+    return Seq(
+        i.store(array_lower_bound(cache, value)),
+        If(i.load() < array_length(cache)).Then(If(array_get(cache, i.load()) == value).Then(Return(i.load()))),
+        Return(INDEX_NOT_FOUND),
+    )
+
+
+@Subroutine(TealType.bytes)
+def array_insert_sorted(cache: Expr, value: Expr) -> Expr:
+    """Insert the value into a sorted array, keeping it sorted. Return the new array."""
+    position = ScratchVar(TealType.uint64)
+
+    return Seq(
+        position.store(array_lower_bound(cache, value) * Int(8)),
+        Concat(
+            Extract(cache, Int(0), position.load()),
+            Itob(value),
+            Extract(cache, position.load(), Len(cache) - position.load()),
+        ),
+    )
+
+
+@Subroutine(TealType.bytes)
+def array_remove_sorted(cache: Expr, value: Expr) -> Expr:
+    """Remove the first occurrence of the value from a sorted array. Return the new array.
+
+    If the value is not in the array, the array is returned unchanged.
+    """
+    i = ScratchVar(TealType.uint64)
+    position = ScratchVar(TealType.uint64)
+
+    return Seq(
+        i.store(array_bsearch(cache, value)),
+        If(i.load() == INDEX_NOT_FOUND)
+        .Then(cache)
+        .Else(
+            Seq(
+                position.store(i.load() * Int(8)),
+                Concat(
+                    Extract(cache, Int(0), position.load()),
+                    Extract(cache, position.load() + Int(8), Len(cache) - position.load() - Int(8)),
+                ),
+            )
+        ),
+    )
+
+
+@Subroutine(TealType.bytes)
+def prefix_sums(cache: Expr) -> Expr:
+    """Calculate the prefix sums of the array, starting with 0. Return the encoded prefix sums.
+
+    If the sum is greater or equal to 2^64, the runtime will panic.
+    """
+    S = ScratchVar(TealType.uint64)
+    result = ScratchVar(TealType.bytes)
+
+    return Seq(
+        S.store(Int(0)),
+        result.store(EMPTY_PREFIX_SUMS),
+        for_each_position(
+            Len(cache),
+            8,
+            lambda position: Seq(
+                S.store(S.load() + ExtractUint64(cache, position)),
+                result.store(Concat(result.load(), Itob(S.load()))),
+            ),
+        ),
+        result.load(),
+    )
+
+
+def _replace_prefix_sums(cache: Expr, index: Expr, old: Expr, new: Expr) -> Expr:
+    """Replace the element old at the index with new in the prefix sums, evaluate to the updated prefix sums"""
+    result = ScratchVar(TealType.bytes)
+    position = ScratchVar(TealType.uint64)
+    end = ScratchVar(TealType.uint64)
+
+    return Seq(
+        end.store(Len(cache)),
+        result.store(cache),
+        # every prefix sum including the element is at least old, subtracting it first can't underflow
+        For(
+            position.store((index + Int(1)) * Int(8)),
+            position.load() < end.load(),
+            position.store(position.load() + Int(8)),
+        ).Do(
+            result.store(
+                Replace(
+                    result.load(),
+                    position.load(),
+                    Itob(ExtractUint64(result.load(), position.load()) - old + new),
+                )
+            )
+        ),
+        result.load(),
+    )
+
+
+@Subroutine(TealType.bytes)
+def prefix_sum_array_set(cache: Expr, index: Expr, value: Expr) -> Expr:
+    """Set the value at the given index of the array stored as prefix sums. Return the new prefix sums."""
+    old = ScratchVar(TealType.uint64)
+
+    return Seq(
+        # panics if the index is out of bounds
+        old.store(ExtractUint64(cache, (index + Int(1)) * Int(8)) - ExtractUint64(cache, index * Int(8))),
+        _replace_prefix_sums(cache, index, old.load(), value),
+    )
+
+
+@Subroutine(TealType.bytes)
+def prefix_sum_array_add(cache: Expr, index: Expr, delta: Expr) -> Expr:
+    """Add delta to the value at the given index of the array stored as prefix sums. Return the new prefix sums."""
+    return Seq(
+        Assert(index < array_length(cache) - Int(1)),
+        _replace_prefix_sums(cache, index, Int(0), delta),
+    )
+
+
+def _fenwick_update(cache: Expr, index: Expr, old: Expr, new: Expr) -> Expr:
+    """Replace the element old at the index with new in the tree, evaluate to the updated tree"""
+    tree = ScratchVar(TealType.bytes)
+    node = ScratchVar(TealType.uint64)
+    length = ScratchVar(TealType.uint64)
+
+    return Seq(
+        length.store(array_length(cache)),
+        Assert(index < length.load()),
+        tree.store(cache),
+        # every node including the element is at least old, subtracting it first can't underflow
+        For(
+            node.store(index + Int(1)),
+            node.load() <= length.load(),
+            # move to the next node covering the element: node + lowbit(node)
+            node.store(node.load() + node.load() - (node.load() & (node.load() - Int(1)))),
+        ).Do(
+            tree.store(
+                Replace(
+                    tree.load(),
+                    (node.load() - Int(1)) * Int(8),
+                    Itob(ExtractUint64(tree.load(), (node.load() - Int(1)) * Int(8)) - old + new),
+                )
+            )
+        ),
+        tree.load(),
+    )
+
+
+@Subroutine(TealType.uint64)
+def fenwick_prefix_sum(cache: Expr, end: Expr) -> Expr:
+    """Calculate the sum of the first `end` values of the array stored as a Fenwick tree."""
+    S = ScratchVar(TealType.uint64)
+    node = ScratchVar(TealType.uint64)
+
+    return Seq(
+        S.store(Int(0)),
+        # move to the preceding disjoint node by clearing the lowest set bit
+        For(node.store(end), node.load(), node.store(node.load() & (node.load() - Int(1)))).Do(
+            S.store(S.load() + ExtractUint64(cache, (node.load() - Int(1)) * Int(8)))
+        ),
+        S.load(),
+    )
+
+
+@Subroutine(TealType.uint64)
+def fenwick_range_sum(cache: Expr, start: Expr, end: Expr) -> Expr:
+    """Calculate the sum of the values from start to end (exclusive) of the array stored as a Fenwick tree."""
+    return fenwick_prefix_sum(cache, end) - fenwick_prefix_sum(cache, start)
+
+
+@Subroutine(TealType.uint64)
+def fenwick_get(cache: Expr, index: Expr) -> Expr:
+    """Retrieve the value at the given index of the array stored as a Fenwick tree."""
+    return fenwick_prefix_sum(cache, index + Int(1)) - fenwick_prefix_sum(cache, index)
+
+
+@Subroutine(TealType.bytes)
+def fenwick_set(cache: Expr, index: Expr, value: Expr) -> Expr:
+    """Set the value at the given index of the array stored as a Fenwick tree. Return the new tree."""
+    return _fenwick_update(cache, index, fenwick_get(cache, index), value)
+
+
+@Subroutine(TealType.bytes)
+def fenwick_add(cache: Expr, index: Expr, delta: Expr) -> Expr:
+    """Add delta to the value at the given index of the array stored as a Fenwick tree. Return the new tree."""
+    return _fenwick_update(cache, index, Int(0), delta)
+
+
+@Subroutine(TealType.bytes)
+def fenwick_build(cache: Expr) -> Expr:
+    """Build a Fenwick tree of the values of the array. Return the encoded tree.
+
+    Complexity: O(n)
+    """
+    tree = ScratchVar(TealType.bytes)
+    node = ScratchVar(TealType.uint64)
+    parent = ScratchVar(TealType.uint64)
+    length = ScratchVar(TealType.uint64)
+
+    return Seq(
+        length.store(array_length(cache)),
+        tree.store(cache),
+        # add each node to the next node covering it, each node is complete before it's added
+        For(node.store(Int(1)), node.load() <= length.load(), node.store(node.load() + Int(1))).Do(
+            parent.store(node.load() + node.load() - (node.load() & (node.load() - Int(1)))),
+            If(parent.load() <= length.load()).Then(
+                tree.store(
+                    Replace(
+                        tree.load(),
+                        (parent.load() - Int(1)) * Int(8),
+                        Itob(
+                            ExtractUint64(tree.load(), (parent.load() - Int(1)) * Int(8))
+                            + ExtractUint64(tree.load(), (node.load() - Int(1)) * Int(8))
+                        ),
+                    )
+                )
+            ),
+        ),
+        tree.load(),
+    )
@@ -0,0 +1,226 @@
+from typing import Callable, Iterator
+
+from pyteal import (
+    Assert,
+    BitLen,
+    Btoi,
+    BytesAnd,
+    BytesNot,
+    BytesOr,
+    BytesZero,
+    CompileOptions,
+    Expr,
+    Extract,
+    ExtractUint64,
+    GetBit,
+    Int,
+    Len,
+    Op,
+    ScratchVar,
+    Seq,
+    SetBit,
+    Subroutine,
+    TealBlock,
+    TealOp,
+    TealSimpleBlock,
+    TealType,
+)
+from pyteal.types import require_type
+
+from .array import _as_expr, for_each_position
+from .assemble import assemble_steps
+
+
+class Bitset:
+    """Set of integers from the range [0, capacity) stored as a bytestring with one bit per integer
+
+    Useful for membership flags like claimed airdrops or used nonces, one bitset replaces a state key per flag.
+    A state key and its value are limited to 128 bytes, so a bitset stored in global or local state holds
+    at most (128 - key length) * 8 integers, about 1000. Larger bitsets, up to 4096 bytes (32768 integers),
+    have to be stored in a box or kept in scratch space.
+    Integer i is represented by bit i of the bytestring, as numbered by getbit/setbit
+    (the most significant bit of the first byte is bit 0).
+
+    Example usage:
+    ```
+        claimed = Bitset()
+        program = Seq(
+            claimed.decode(App.globalGet(Bytes("claimed"))),
+            Assert(Not(claimed.test(Btoi(Txn.application_args[0])))),
+            claimed.set(Btoi(Txn.application_args[0])),
+            App.globalPut(Bytes("claimed"), claimed.encode()),
+        )
+    ```
+
+    Note:
+        Accessing an integer outside of the capacity will panic.
+    """
+
+    def __init__(self) -> None:
+        self.cache = ScratchVar(TealType.bytes)
+
+    def initialize(self, capacity: Expr | int) -> Expr:
+        """Initialize an empty bitset able to hold integers from 0 to capacity-1.
+
+        The capacity is rounded up to a multiple of 8.
+        If the bitset is already initialized, this will clear it.
+        """
+        if isinstance(capacity, int):
+            return self.cache.store(BytesZero(Int((capacity + 7) // 8)))
+        return self.cache.store(BytesZero((capacity + Int(7)) / Int(8)))
+
+    def decode(self, value: Expr) -> Expr:
+        """Decode a bytestring into a bitset.
+
+        This method initializes the bitset.
+        If the bitset is already initialized, previous content will be lost.
+
+        Lazy, complexity: O(1)
+        """
+        return self.cache.store(value)
+
+    def encode(self) -> Expr:
+        """Retrieve the binary string representation of this bitset."""
+        return self.cache.load()
+
+    def capacity(self) -> Expr:
+        """Retrieve the expression evaluating to the number of integers this bitset can hold."""
+        return Len(self.cache.load()) * Int(8)
+
+    def test(self, value: Expr | int) -> Expr:
+        """Check if the value is in the bitset, evaluates to 1 if it is, 0 otherwise."""
+        return GetBit(self.cache.load(), _as_expr(value))
+
+    def set(self, value: Expr | int) -> Expr:
+        """Add the value to the bitset."""
+        return self.cache.store(SetBit(self.cache.load(), _as_expr(value), Int(1)))
+
+    def clear(self, value: Expr | int) -> Expr:
+        """Remove the value from the bitset."""
+        return self.cache.store(SetBit(self.cache.load(), _as_expr(value), Int(0)))
+
+    def is_empty(self) -> Expr:
+        """Check if the bitset holds no values."""
+        return BitLen(self.cache.load()) == Int(0)
+
+    def count(self) -> Expr:
+        """Calculate the number of values in the bitset.
+
+        Complexity: O(capacity / 64)
+        """
+        return bitset_count(self.cache.load())
+
+    def union(self, other: "Bitset | Expr") -> Expr:
+        """Add all values of the other bitset to this bitset.
+
+        Both bitsets must have the same capacity, otherwise the runtime will panic.
+        """
+        return self._combine(BytesOr, other)
+
+    def intersection(self, other: "Bitset | Expr") -> Expr:
+        """Remove all values which are not in the other bitset from this bitset.
+
+        Both bitsets must have the same capacity, otherwise the runtime will panic.
+        """
+        return self._combine(BytesAnd, other)
+
+    def difference(self, other: "Bitset | Expr") -> Expr:
+        """Remove all values of the other bitset from this bitset.
+
+        Both bitsets must have the same capacity, otherwise the runtime will panic.
+        """
+        return self._combine(lambda left, right: BytesAnd(left, BytesNot(right)), other)
+
+    def _combine(self, operation: Callable[[Expr, Expr], Expr], other: "Bitset | Expr") -> Expr:
+        if isinstance(other, Bitset):
+            other = other.encode()
+        # byte array operations align shorter operands to the right, which would misalign the bits
+        other_bits = ScratchVar(TealType.bytes)
+        return Seq(
+            other_bits.store(other),
+            Assert(Len(other_bits.load()) == Len(self.cache.load())),
+            self.cache.store(operation(self.cache.load(), other_bits.load())),
+        )
+
+
+class PopCount(Expr):
+    """
+    PopCount calculates the number of set bits of a TealType.uint64 value.
+
+    Uses a constant number of operations and no scratch slots.
+    """
+
+    def __init__(self, value: Expr):
+        """Calculate the number of set bits of the value
+
+        Args:
+            value (TealType.uint64): value whose bits are counted
+        """
+        super().__init__()
+        require_type(value, TealType.uint64)
+        self.value = value
+
+    def _get_steps(self) -> Iterator[Expr | TealOp]:
+        yield self.value
+        # count the bits of each pair of bits: x - ((x >> 1) & 0x55...)
+        yield TealOp(self, Op.dup)
+        yield Int(1)
+        yield TealOp(self, Op.shr)
+        yield Int(0x5555555555555555)
+        yield TealOp(self, Op.bitwise_and)
+        yield TealOp(self, Op.minus)
+        # sum the pairs into nibbles: (x & 0x33...) + ((x >> 2) & 0x33...)
+        yield TealOp(self, Op.dup)
+        yield Int(0x3333333333333333)
+        yield TealOp(self, Op.bitwise_and)
+        yield TealOp(self, Op.swap)
+        yield Int(2)
+        yield TealOp(self, Op.shr)
+        yield Int(0x3333333333333333)
+        yield TealOp(self, Op.bitwise_and)
+        yield TealOp(self, Op.add)
+        # sum the nibbles into bytes: (x + (x >> 4)) & 0x0F...
+        yield TealOp(self, Op.dup)
+        yield Int(4)
+        yield TealOp(self, Op.shr)
+        yield TealOp(self, Op.add)
+        yield Int(0x0F0F0F0F0F0F0F0F)
+        yield TealOp(self, Op.bitwise_and)
+        # sum the bytes into the most significant byte of the low word of x * 0x0101...
+        # mulw is used, because the multiplication overflows 64 bits
+        yield Int(0x0101010101010101)
+        yield TealOp(self, Op.mulw)
+        yield Int(56)
+        yield TealOp(self, Op.shr)
+        # drop the high word
+        yield TealOp(self, Op.swap)
+        yield TealOp(self, Op.pop)
+
+    def __teal__(self, options: CompileOptions) -> tuple[TealBlock, TealSimpleBlock]:
+        return assemble_steps(self._get_steps(), options)
+
+    def __str__(self):
+        return f"(PopCount {self.value})"
+
+    def type_of(self):
+        return TealType.uint64
+
+    def has_return(self):
+        return False
+
+
+@Subroutine(TealType.uint64)
+def bitset_count(cache: Expr) -> Expr:
+    """Calculate the number of set bits of a bytestring."""
+    whole = ScratchVar(TealType.uint64)
+    count = ScratchVar(TealType.uint64)
+    return Seq(
+        # length of the whole 8 byte chunks
+        whole.store(Len(cache) / Int(8) * Int(8)),
+        count.store(Int(0)),
+        for_each_position(
+            whole.load(), 8, lambda position: count.store(count.load() + PopCount(ExtractUint64(cache, position)))
+        ),
+        # the remaining bytes are shorter than uint64, btoi reads them without padding
+        count.load() + PopCount(Btoi(Extract(cache, whole.load(), Len(cache) - whole.load()))),
+    )
@@ -1,15 +1,44 @@
 from .analytics import ExecutionSummary, summarize_execution
-from .evaluator import INTEGER_SIZE, AssertionFailed, EvalContext, Panic, eval_teal
-from .tools import compile_and_run, substitute_template_values
+from .evaluator import (
+    INTEGER_SIZE,
+    AssertionFailed,
+    Checkpoint,
+    Checkpoints,
+    EvalContext,
+    Limits,
+    Panic,
+    Program,
+    eval_teal,
+)
+from .hooks import Hooks
+from .interpreter import eval_expr
+from .snapshot import dump_state_json, dump_state_msgpack, load_state_json, load_state_msgpack
+from .sourcemap import SourceLocation, SourceMap, SourceProfiler, compile_with_source_map
+from .tools import compile_and_run, state_at, substitute_template_values
 
 __all__ = [
     "Panic",
     "AssertionFailed",
+    "Checkpoint",
+    "Checkpoints",
     "EvalContext",
+    "Hooks",
+    "Limits",
     "eval_teal",
+    "Program",
     "INTEGER_SIZE",
     "compile_and_run",
+    "eval_expr",
+    "state_at",
     "substitute_template_values",
     "summarize_execution",
     "ExecutionSummary",
+    "SourceLocation",
+    "SourceMap",
+    "SourceProfiler",
+    "compile_with_source_map",
+    "load_state_json",
+    "dump_state_json",
+    "load_state_msgpack",
+    "dump_state_msgpack",
 ]
@@ -1,6 +1,31 @@
-from dataclasses import dataclass
+"""Summaries of evaluations and comparisons of program builds
 
-from .data import OP_COSTS
+The cost of two builds of a program can be compared on a corpus of recorded calls
+(in the format of the replay module) from the command line:
+    python -m pytealext.evaluator.analytics old.teal new.teal calls.jsonl [--max-cost-increase N]
+The exit status is 1 when the builds behave differently or the total cost increases by more than N.
+"""
+
+import argparse
+import ast
+import base64
+import codecs
+import json
+import sys
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from algosdk.abi import Method
+from algosdk.encoding import decode_address
+
+from .data import IMMEDIATES, LENGTH_COSTS, MAX_VERSION, OPCODES, length_cost, op_cost
+from .evaluator import Program
+from .hooks import Hooks
+from .replay import ReplayResult, read_records, replay_record
+from .sourcemap import SourceLocation, SourceMap
 
 
 @dataclass
@@ -12,6 +37,10 @@ class ExecutionSummary:
     opcode_usage: dict[str, int]
     call_count: dict[str, int]  # counts how many times the specific branch was taken
     execution_cost: int = 0
+    version: int = MAX_VERSION  # TEAL version used to determine opcode costs
+    # cost and number of executed ops per Python source line, filled when a source map is provided
+    source_cost: dict[SourceLocation, int] = field(default_factory=dict)
+    source_op_count: dict[SourceLocation, int] = field(default_factory=dict)
 
     def add_call(self, branch_name: str):
         """Increment the call count for the given branch name."""
@@ -20,36 +49,322 @@ class ExecutionSummary:
         else:
             self.call_count[branch_name] += 1
 
-    def add_opcode(self, opcode: str):
-        """Increment the opcode usage for the given opcode."""
+    def add_opcode(
+        self, opcode: str, field: str | None = None, stack: list | None = None  # pylint: disable=redefined-outer-name
+    ) -> int:
+        """Increment the opcode usage for the given opcode.
+
+        Args:
+            opcode: name of the operation
+            field: first immediate of the operation, determines the cost of some operations
+            stack: stack before the operation, determines the cost of operations priced by the argument length
+
+        Returns:
+            the cost of the operation
+        """
         if self.opcode_usage.get(opcode, 0) == 0:
             self.opcode_usage[opcode] = 1
         else:
             self.opcode_usage[opcode] += 1
-        try:
-            self.execution_cost += OP_COSTS[opcode]()
-        except KeyError:
-            # these pseudoops will have cost of 1 in compiled code
-            # However the total may not be accurate due to usage of intcblock and bytecblock
-            if opcode in ("int", "byte", "addr"):
-                self.execution_cost += 1
-            else:
-                raise
-
-
-def summarize_execution(execution_log: str) -> ExecutionSummary:
+        # pseudo-ops (int, byte, addr) are priced as the constant loading ops they compile to
+        cost = op_cost(opcode, self.version, field)
+        if stack is not None:
+            cost += length_cost(opcode, stack)
+        self.execution_cost += cost
+        return cost
+
+    def add_source(self, location: SourceLocation, cost: int):
+        """Attribute an executed operation and its cost to a Python source line."""
+        self.source_cost[location] = self.source_cost.get(location, 0) + cost
+        self.source_op_count[location] = self.source_op_count.get(location, 0) + 1
+
+
+def summarize_execution(execution_log: str, source_map: SourceMap | None = None) -> ExecutionSummary:
     """Summarize the opcode usage in the execution_log
 
     Args:
         execution_log: the output from eval_teal debug output
+        source_map: source map of the evaluated program (see compile_with_source_map),
+            when provided the cost is also attributed to the Python source lines
     """
     summary = ExecutionSummary(opcode_usage={}, call_count={})
     for line in execution_log.splitlines():
-        operation = line.split()[1]  # [0] is the line number, [1] is the opcode
+        # [0] is the line number, [1] is the opcode, [2] is the first immediate or the stack separator
+        operation, immediate = line.split(maxsplit=3)[1:3]
+        if operation == "#pragma":
+            summary.version = int(line.split()[3])
+            continue
         if operation.startswith("#"):
             continue
         if operation.endswith(":"):
             summary.add_call(operation[:-1])
         else:
-            summary.add_opcode(operation)
+            # the stack is printed after the separator, it is only parsed for ops priced by the argument length
+            stack = ast.literal_eval(line.rpartition(" | ")[2]) if OPCODES.get(operation) in LENGTH_COSTS else None
+            cost = summary.add_opcode(operation, immediate, stack)
+            location = source_map[int(line.split(":", 1)[0])] if source_map is not None else None
+            if location is not None:
+                summary.add_source(location, cost)
     return summary
+
+
+# the assembler replaces constants referenced once with pushint/pushbytes starting from this version
+OPTIMIZE_CONSTANTS_VERSION = 4
+
+
+def _varuint_size(value: int) -> int:
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def _bytes_literal(literal: str) -> bytes:
+    """Decode a bytes literal of byte, pushbytes and bytecblock"""
+    if literal.startswith('"') and literal.endswith('"'):
+        return codecs.escape_decode(literal[1:-1].encode("utf-8"))[0]
+    if literal.startswith("0x"):
+        return bytes.fromhex(literal[2:])
+    encoding, _, value = literal.replace("(", " ").rstrip(")").partition(" ")
+    if encoding in ("base64", "b64"):
+        return base64.b64decode(value.strip())
+    if encoding in ("base32", "b32"):
+        value = value.strip()
+        return base64.b32decode(value + "=" * (-len(value) % 8))
+    raise ValueError(f"Unsupported bytes literal: {literal}")
+
+
+def _constants_size(references: Counter, value_size: Callable[[Any], int], push_single: bool) -> tuple[int, int]:
+    """Size of the constant block and of the references to the constants
+
+    Constants are placed in the block by the descending number of references,
+    the first 4 of them are referenced with 1 byte ops (ex. intc_0), the rest with 2 bytes (ex. intc 4).
+
+    Returns:
+        tuple of (size of the block, size of the operations loading the constants)
+    """
+    block: list = []
+    references_size = 0
+    for value, count in references.most_common():
+        if push_single and count == 1:
+            references_size += 1 + value_size(value)  # pushint / pushbytes
+        else:
+            references_size += count * (1 if len(block) < 4 else 2)
+            block.append(value)
+    if not block:
+        return 0, references_size
+    return 1 + _varuint_size(len(block)) + sum(value_size(value) for value in block), references_size
+
+
+def _immediates_size(opcode: int, line: str, args: list[str]) -> int:
+    immediates = IMMEDIATES.get(opcode, ())
+    if not immediates:
+        return 0
+    variadic = immediates[-1] == "..."  # prefixed by the number of values
+    if immediates[0] == "uint":  # pushint, pushints, intcblock
+        sizes = [_varuint_size(int(arg)) for arg in args]
+    elif immediates[0] == "bytes":  # pushbytes, pushbytess, bytecblock
+        literals = [_bytes_literal(arg) for arg in args] if variadic else [_bytes_literal(line.split(maxsplit=1)[1])]
+        sizes = [_varuint_size(len(value)) + len(value) for value in literals]
+    elif immediates[0] == "target":
+        sizes = [2] * len(args)
+    else:
+        # fields, indexes and the remaining immediates take a byte each,
+        # ex. "txn ApplicationArgs 0" is assembled as txna
+        return len(args)
+    return sum(sizes) + (_varuint_size(len(sizes)) if variadic else 0)
+
+
+def estimate_program_size(program: Program | list[str] | str) -> int:
+    """Estimate the size of the assembled program in bytes
+
+    The encoding of go-algorand's assembler is followed, including the placement of int and byte pseudo-ops
+    in constant blocks. Named int constants (ex. "int NoOp") are assumed to fit in a byte.
+    The result can differ from the size of the actual bytecode by a few bytes,
+    ex. when constants of equal reference counts are ordered differently.
+    """
+    if not isinstance(program, Program):
+        program = Program(program)
+    size = _varuint_size(program.version)
+    ints: Counter[int | str] = Counter()
+    byte_constants: Counter[bytes] = Counter()
+    for instruction in program.instructions:
+        op, args = instruction.op, instruction.args
+        if not op:
+            continue
+        if op == "int":
+            ints[int(args[0]) if args[0].isdigit() else args[0]] += 1
+        elif op == "byte":
+            byte_constants[_bytes_literal(instruction.line.split(maxsplit=1)[1])] += 1
+        elif op == "addr":
+            byte_constants[decode_address(args[0])] += 1
+        elif op == "method":
+            byte_constants[Method.from_signature(args[0].strip('"')).get_selector()] += 1
+        else:
+            size += 1 + _immediates_size(instruction.opcode, instruction.line, args)
+
+    def int_size(value: int | str) -> int:
+        return _varuint_size(value) if isinstance(value, int) else 1
+
+    def bytes_size(value: bytes) -> int:
+        return _varuint_size(len(value)) + len(value)
+
+    push_single = program.version >= OPTIMIZE_CONSTANTS_VERSION
+    for references, value_size in ((ints, int_size), (byte_constants, bytes_size)):
+        block_size, references_size = _constants_size(references, value_size, push_single)
+        size += block_size + references_size
+    return size
+
+
+class _OpcodeCounter(Hooks):
+    def __init__(self):
+        self.counts: Counter[str] = Counter()
+
+    def on_op(self, pc: int, opcode: str, stack: list[int | bytes]) -> None:
+        self.counts[opcode] += 1
+
+
+@dataclass
+class InputCostDiff:
+    """Comparison of the evaluations of a single input by two builds"""
+
+    index: int  # position of the record in the input
+    txid: str
+    old_cost: int
+    new_cost: int
+    divergence: list[str] = field(default_factory=list)  # behavior differences, empty when the builds agree
+
+    @property
+    def delta(self) -> int:
+        """Change of the cost of the input"""
+        return self.new_cost - self.old_cost
+
+
+@dataclass
+class CostDiff:
+    """Comparison of two builds of a program evaluated on the same inputs"""
+
+    old_size: int  # estimated size of the assembled programs
+    new_size: int
+    inputs: list[InputCostDiff] = field(default_factory=list)
+    # number of executed operations of each opcode, summed over all inputs
+    old_opcode_usage: Counter[str] = field(default_factory=Counter)
+    new_opcode_usage: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def old_cost(self) -> int:
+        """Total cost of the inputs with the reference build"""
+        return sum(result.old_cost for result in self.inputs)
+
+    @property
+    def new_cost(self) -> int:
+        """Total cost of the inputs with the new build"""
+        return sum(result.new_cost for result in self.inputs)
+
+    @property
+    def cost_delta(self) -> int:
+        """Change of the total cost"""
+        return self.new_cost - self.old_cost
+
+    @property
+    def size_delta(self) -> int:
+        """Change of the estimated program size"""
+        return self.new_size - self.old_size
+
+    @property
+    def opcode_delta(self) -> dict[str, int]:
+        """Change of the usage of each opcode, opcodes with unchanged usage are omitted"""
+        deltas = {op: self.new_opcode_usage[op] - self.old_opcode_usage[op] for op in self.old_opcode_usage}
+        deltas.update({op: count for op, count in self.new_opcode_usage.items() if op not in self.old_opcode_usage})
+        return {op: delta for op, delta in sorted(deltas.items()) if delta}
+
+    @property
+    def diverged(self) -> list[InputCostDiff]:
+        """Inputs for which the builds behave differently"""
+        return [result for result in self.inputs if result.divergence]
+
+
+def _divergence(old: ReplayResult, new: ReplayResult) -> list[str]:
+    divergence = []
+    if old.error != new.error:
+        divergence.append(f"error: {old.error!r} -> {new.error!r}")
+    if old.global_delta != new.global_delta:
+        divergence.append("global state")
+    if old.local_delta != new.local_delta:
+        divergence.append("local state")
+    if old.log != new.log:
+        divergence.append("log")
+    if old.stack != new.stack:
+        divergence.append(f"stack: {old.stack!r} -> {new.stack!r}")
+    return divergence
+
+
+def diff_costs(old: Program | list[str] | str, new: Program | list[str] | str, records: Iterable[dict]) -> CostDiff:
+    """Evaluate recorded calls with two builds of a program and compare their costs and behavior
+
+    The builds diverge on a call when they fail with different errors
+    or produce different state changes, logs or final stacks.
+
+    Args:
+        old: the reference build of the program
+        new: the build compared against it
+        records: recorded calls in the format of the replay module, see replay.read_records
+    """
+    old = old if isinstance(old, Program) else Program(old)
+    new = new if isinstance(new, Program) else Program(new)
+    diff = CostDiff(estimate_program_size(old), estimate_program_size(new))
+    old_counter, new_counter = _OpcodeCounter(), _OpcodeCounter()
+    for index, record in enumerate(records):
+        old_result = replay_record(old, index, record, old_counter)
+        new_result = replay_record(new, index, record, new_counter)
+        diff.inputs.append(
+            InputCostDiff(index, old_result.txid, old_result.cost, new_result.cost, _divergence(old_result, new_result))
+        )
+    diff.old_opcode_usage = old_counter.counts
+    diff.new_opcode_usage = new_counter.counts
+    return diff
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Compare two builds, print a JSON line per changed input followed by a summary
+
+    Returns:
+        the exit status, 1 when the builds diverge or the cost increases by more than --max-cost-increase
+    """
+    parser = argparse.ArgumentParser(description="Compare the cost and behavior of two builds of a program")
+    parser.add_argument("old", help="TEAL source of the reference build")
+    parser.add_argument("new", help="TEAL source of the new build")
+    parser.add_argument("records", nargs="+", help="JSONL or msgpack files with recorded calls")
+    parser.add_argument(
+        "--max-cost-increase", type=int, default=0, help="allowed increase of the total cost of all calls"
+    )
+    args = parser.parse_args(argv)
+
+    old, new = (Program(Path(path).read_text(encoding="utf-8")) for path in (args.old, args.new))
+    records = (record for path in args.records for record in read_records(path))
+    diff = diff_costs(old, new, records)
+    for result in diff.inputs:
+        if result.delta or result.divergence:
+            output = {
+                "index": result.index,
+                "txid": result.txid,
+                "old-cost": result.old_cost,
+                "new-cost": result.new_cost,
+                "delta": result.delta,
+                "divergence": result.divergence,
+            }
+            print(json.dumps(output))
+    summary = {
+        "calls": len(diff.inputs),
+        "diverged": len(diff.diverged),
+        "old-cost": diff.old_cost,
+        "new-cost": diff.new_cost,
+        "cost-delta": diff.cost_delta,
+        "old-size": diff.old_size,
+        "new-size": diff.new_size,
+        "size-delta": diff.size_delta,
+        "opcode-delta": diff.opcode_delta,
+    }
+    print(json.dumps(summary), file=sys.stderr)
+    return int(bool(diff.diverged) or diff.cost_delta > args.max_cost_increase)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Planning of the opcode budget of application calls
+
+Applications share a pooled budget: every app call in a group, including inner calls, adds MaxAppProgramCost to it.
+Calls more expensive than that need extra app calls in the group (ex. NoOp calls of a minimal application)
+or OpUp inner calls made by the program (see pyteal.OpUp), each of them costs an additional fee.
+
+The plan is based on the costs of calls measured by the evaluator, ex. for calls recorded for the replay module:
+    python -m pytealext.evaluator.budget approval.teal calls.jsonl [--group-size N] [--percentile P]
+"""
+
+import argparse
+import json
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .evaluator import Program
+from .limits import MaxAppProgramCost, MaxInnerTransactions, MaxTxGroupSize, MinTxnFee
+from .replay import read_records, replay
+
+# budget used by each OpUp inner call: the inner transaction ops of pyteal.OpUp and the program of the called app
+OPUP_OVERHEAD = 10
+
+
+@dataclass(frozen=True)
+class GroupLayout:
+    """Additional calls a transaction group needs to cover the cost of an application call"""
+
+    cost: int  # the cost the layout is sized for
+    app_calls: int  # app calls to add to the group
+    opup_calls: int  # OpUp inner calls the program has to make
+    budget: int  # the pooled budget of the group with the additional calls
+
+    @property
+    def fee(self) -> int:
+        """Fee of the additional calls in microAlgos"""
+        return (self.app_calls + self.opup_calls) * MinTxnFee
+
+
+def layout_for(cost: int, group_size: int = 1, app_calls: int = 1, opup_overhead: int = OPUP_OVERHEAD) -> GroupLayout:
+    """The cheapest layout of a group covering the cost
+
+    Additional app calls in the group are preferred, they add the same budget for the same fee as OpUp calls
+    without their overhead. OpUp calls are used once the group is full.
+    To plan for OpUp calls only, pass group_size=MaxTxGroupSize.
+
+    Args:
+        cost: cost of the application call to cover
+        group_size: number of transactions in the group before any calls are added
+        app_calls: number of app calls in the group before any calls are added, including the planned call
+        opup_overhead: budget used by each OpUp inner call
+
+    Raises:
+        ValueError: when the cost can't be covered by a single group
+    """
+    budget = app_calls * MaxAppProgramCost
+    extra_calls = min(max(0, math.ceil((cost - budget) / MaxAppProgramCost)), MaxTxGroupSize - group_size)
+    budget += extra_calls * MaxAppProgramCost
+    opup_calls = max(0, math.ceil((cost - budget) / (MaxAppProgramCost - opup_overhead)))
+    budget += opup_calls * (MaxAppProgramCost - opup_overhead)
+    if opup_calls > (app_calls + extra_calls) * MaxInnerTransactions:
+        raise ValueError(f"Cost {cost} exceeds the budget of a transaction group")
+    return GroupLayout(cost, extra_calls, opup_calls, budget)
+
+
+def percentile(costs: list[int], percent: float) -> int:
+    """The smallest cost greater or equal to percent % of the costs (nearest-rank method)"""
+    if not costs:
+        raise ValueError("No costs given")
+    ordered = sorted(costs)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class BudgetPlan:
+    """Budget requirements of a corpus of application calls"""
+
+    calls: int  # number of measured calls
+    worst_case: int  # the highest cost
+    p99: int  # the 99th percentile of costs
+    layout: GroupLayout  # the recommended layout, sized for the requested percentile
+    coverage: float  # fraction of the calls covered by the layout's budget
+
+
+def plan_budget(
+    costs: Iterable[int],
+    percent: float = 100,
+    group_size: int = 1,
+    app_calls: int = 1,
+    opup_overhead: int = OPUP_OVERHEAD,
+) -> BudgetPlan:
+    """Plan the layout of groups for calls of the measured costs
+
+    Args:
+        costs: costs of calls measured by the evaluator, ex. EvalContext.cost or ExecutionSummary.execution_cost
+        percent: percentage of the calls the layout has to cover, calls above it will fail for lack of budget.
+            The worst case is covered by default.
+        group_size: see layout_for
+        app_calls: see layout_for
+        opup_overhead: see layout_for
+    """
+    costs = list(costs)
+    layout = layout_for(percentile(costs, percent), group_size, app_calls, opup_overhead)
+    return BudgetPlan(
+        calls=len(costs),
+        worst_case=max(costs),
+        p99=percentile(costs, 99),
+        layout=layout,
+        coverage=sum(cost <= layout.budget for cost in costs) / len(costs),
+    )
+
+
+def main(argv: list[str] | None = None):
+    """Measure the costs of recorded calls and print the budget plan as JSON, failed calls are skipped"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("program", help="TEAL source of the approval program")
+    parser.add_argument("records", nargs="+", help="JSONL or msgpack files with recorded calls")
+    parser.add_argument("--percentile", type=float, default=100, help="percentage of the calls to size the group for")
+    parser.add_argument("--group-size", type=int, default=1, help="transactions in the group before adding calls")
+    parser.add_argument("--app-calls", type=int, default=1, help="app calls in the group before adding calls")
+    parser.add_argument("--opup-overhead", type=int, default=OPUP_OVERHEAD)
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    program = Program(Path(args.program).read_text(encoding="utf-8"))
+    records = (record for path in args.records for record in read_records(path))
+    costs = [result.cost for result in replay(program, records, args.processes) if result.error is None]
+    plan = plan_budget(costs, args.percentile, args.group_size, args.app_calls, args.opup_overhead)
+    output = {
+        "calls": plan.calls,
+        "worst-case": plan.worst_case,
+        "p99": plan.p99,
+        "cost": plan.layout.cost,
+        "app-calls": plan.layout.app_calls,
+        "opup-calls": plan.layout.opup_calls,
+        "budget": plan.layout.budget,
+        "fee": plan.layout.fee,
+        "coverage": plan.coverage,
+    }
+    print(json.dumps(output))
+
+
+if __name__ == "__main__":
+    main()
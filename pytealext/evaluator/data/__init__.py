@@ -1,3 +1,82 @@
-from .op_costs import OP_COSTS
+from .opcodes import (
+    FIELD_COSTS,
+    IMMEDIATES,
+    LENGTH_COSTS,
+    MAX_VERSION,
+    MIN_VERSIONS,
+    MODE_ANY,
+    MODE_APP,
+    MODE_SIG,
+    OP_COSTS,
+    OP_MODES,
+    OPCODES,
+    STACK_ARGS,
+    STACK_RETURNS,
+)
 
-__all__ = ["OP_COSTS"]
+
+def op_cost(name: str, version: int = MAX_VERSION, field: str | None = None) -> int:
+    """Get the static cost of an operation
+
+    Args:
+        name: name of the operation (pseudo-ops are accepted)
+        version: TEAL version of the program
+        field: the field immediate of the operation, relevant for ops with field dependent costs
+
+    Raises:
+        KeyError: when the operation is unknown
+        ValueError: when the operation is not available in the given version
+    """
+    opcode = OPCODES[name]
+    cost = OP_COSTS[version][opcode]
+    if not cost:
+        raise ValueError(f"{name} is not available in TEAL v{version}")
+    return FIELD_COSTS.get((opcode, field), cost) if field is not None else cost
+
+
+def length_cost(name: str, stack: list) -> int:
+    """Get the part of the cost of an operation which depends on the length of its argument
+
+    Args:
+        name: name of the operation
+        stack: stack before the operation is executed
+
+    Returns:
+        the cost to add to the static cost, 0 for operations with a static cost only
+    """
+    opcode = OPCODES.get(name)
+    if opcode not in LENGTH_COSTS:
+        return 0
+    _, per_chunk, chunk_size, depth = LENGTH_COSTS[opcode]
+    if len(stack) <= depth or not isinstance(stack[-1 - depth], bytes):
+        return 0
+    return per_chunk * -(-len(stack[-1 - depth]) // chunk_size)
+
+
+def required_immediates(opcode: int) -> int:
+    """Get the minimal number of immediate arguments of an opcode"""
+    immediates = IMMEDIATES.get(opcode, ())
+    if immediates and immediates[-1] == "...":
+        # the variable part may be empty
+        return len(immediates) - 2
+    return len(immediates)
+
+
+__all__ = [
+    "FIELD_COSTS",
+    "IMMEDIATES",
+    "LENGTH_COSTS",
+    "MAX_VERSION",
+    "MIN_VERSIONS",
+    "MODE_ANY",
+    "MODE_APP",
+    "MODE_SIG",
+    "OP_COSTS",
+    "OP_MODES",
+    "OPCODES",
+    "STACK_ARGS",
+    "STACK_RETURNS",
+    "length_cost",
+    "op_cost",
+    "required_immediates",
+]
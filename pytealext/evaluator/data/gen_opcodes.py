@@ -0,0 +1,302 @@
+"""Generate opcodes.py from the go-algorand opcode specification (opcodes.go.txt)
+
+Usage: python gen_opcodes.py
+
+Everything is read from the checked-in copy of opcodes.go, no network access is required.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+
+from pyteal import MAX_PROGRAM_VERSION
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SPEC_FILE = "opcodes.go.txt"
+OUTPUT_FILE = "opcodes.py"
+
+OP_SEARCH_PATTERN = re.compile(
+    r"\{(?P<opcode>0x[0-9a-f]+|protoByte), \"(?P<name>[^\"]+)\", \w+, "
+    r"proto\(\"(?P<args>[^:\"]*):(?P<returns>[^\"]*)\"(?P<effects>[^)]*)\), "
+    r"(?P<version>\w+), (?P<details>.*)},"
+)
+CONST_PATTERN = re.compile(r"^const (?P<name>\w+) = (?P<value>\w+)")
+COST_ARRAY_PATTERN = re.compile(r"^var (?P<name>\w+Costs) = \[\]int\{")
+COST_ARRAY_ITEM_PATTERN = re.compile(r"^(?P<field>\w+): (?P<cost>\d+),")
+
+COSTLY_PATTERN = re.compile(r"\bcostly\((\d+)\)")
+COSTS_PATTERN = re.compile(r"\.costs\((\d+)\)")
+COST_BY_FIELD_PATTERN = re.compile(r"costByField\(\"\w+\", &\w+, (\w+)\)")
+COST_BY_LENGTH_PATTERN = re.compile(r"costByLength\((\d+), (\d+), (\d+), (\d+)\)")
+
+IMMEDIATES_PATTERN = re.compile(r"\bimmediates\(([^)]*)\)")
+IMM_KINDED_PATTERN = re.compile(r"\bimmKinded\(\w+, ([^)]*)\)")
+FIELD_PATTERN = re.compile(r"\b(?:field|costByField)\(\"(\w+)\"")
+CONSTANTS_PATTERN = re.compile(r"\bconstants\(\w+, \w+, \"([^\"]+)\"")
+QUOTED_PATTERN = re.compile(r"\"(\w+)\"")
+EFFECTS_PATTERN = re.compile(r"\"([^\"]*)\"")
+
+PROTO_BYTE = 0x8A
+VARIABLE = "..."  # marks a variable number of trailing immediates
+VARIABLE_ARITY = -1
+# pseudo-ops are assembled into one of the real opcodes
+PSEUDO_OPS = {
+    "int": "intc",
+    "byte": "bytec",
+    "addr": "bytec",
+    "method": "bytec",
+}
+
+MODE_APP = 1
+MODE_SIG = 2
+MODE_ANY = MODE_APP | MODE_SIG
+
+
+@dataclass
+class OpSpec:  # pylint: disable=too-many-instance-attributes
+    """A single entry of OpSpecs, valid from its version until superseded by an entry with the same opcode"""
+
+    opcode: int
+    name: str
+    version: int
+    args: int
+    returns: int
+    immediates: tuple[str, ...]
+    mode: int
+    cost: int
+    by_field: dict[str, int] = field(default_factory=dict)
+    by_length: tuple[int, int, int, int] | None = None
+
+
+versions: dict[str, int | None] = {}  # None marks experimental versions
+field_costs: dict[str, dict[str, int]] = {}
+specs: list[OpSpec] = []
+
+
+def parse_version(version: str) -> int | None:
+    """Translate the version column of OpSpecs into a number, None if the op is experimental"""
+    if version.isdigit():
+        return int(version)
+    if version not in versions:
+        raise ValueError(f"Unknown version constant: {version}")
+    return versions[version]
+
+
+def translate_cost(name: str, details: str) -> tuple[int, dict[str, int], tuple[int, int, int, int] | None]:
+    """Simplify go details to (static cost, costs by field, cost by length)
+
+    The static cost of an op with field dependent costs is the highest of those.
+    """
+    if m := re.search(COSTLY_PATTERN, details):
+        return int(m.group(1)), {}, None
+    if m := re.search(COSTS_PATTERN, details):
+        return int(m.group(1)), {}, None
+    if m := re.search(COST_BY_FIELD_PATTERN, details):
+        by_field = field_costs[m.group(1)]
+        return max(by_field.values()), by_field, None
+    if m := re.search(COST_BY_LENGTH_PATTERN, details):
+        base, chunk_cost, chunk_size, depth = (int(g) for g in m.groups())
+        return base, {}, (base, chunk_cost, chunk_size, depth)
+    if "cost" in details:
+        raise ValueError(f"Unsupported cost function for {name}: {details}")
+    return 1, {}, None
+
+
+def translate_immediates(details: str) -> tuple[str, ...]:
+    """Extract the names of immediate arguments from go details"""
+    if m := re.search(CONSTANTS_PATTERN, details):
+        kind = m.group(1)
+        return (kind[:-4], VARIABLE) if kind.endswith(" ...") else (kind,)
+    if "detBranch()" in details:
+        return ("target",)
+    if "detSwitch()" in details:
+        return ("target", VARIABLE)
+    names: list[str] = []
+    if m := re.search(IMMEDIATES_PATTERN, details) or re.search(IMM_KINDED_PATTERN, details):
+        names.extend(re.findall(QUOTED_PATTERN, m.group(1)))
+    # ops like txn or global have their field as the only immediate
+    if (m := re.search(FIELD_PATTERN, details)) and m.group(1) not in names:
+        names.append(m.group(1))
+    return tuple(names)
+
+
+def translate_arity(types: str, effects: str) -> int:
+    """Number of stack values in a proto, variable if the proto is empty but the effects describe some values"""
+    types = types.replace("x", "")  # x marks that the op ends execution
+    if not types and effects:
+        return VARIABLE_ARITY
+    return len(types)
+
+
+def translate_mode(details: str) -> int:
+    """Modes in which the op may be used"""
+    if "only(ModeApp)" in details:
+        return MODE_APP
+    if "only(ModeSig)" in details:
+        return MODE_SIG
+    return MODE_ANY
+
+
+def read_spec(path: str):
+    """Read the version constants, field costs and op specs from go source"""
+    in_block_comment = False
+    current_cost_array: str | None = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f.readlines():
+            line = line.strip()
+            if line.startswith("/*"):
+                in_block_comment = True
+            if in_block_comment:
+                in_block_comment = not line.endswith("*/")
+                continue
+            if not line or line.startswith("//"):
+                continue
+            if current_cost_array is not None:
+                if m := re.match(COST_ARRAY_ITEM_PATTERN, line):
+                    field_costs[current_cost_array][m["field"]] = int(m["cost"])
+                else:
+                    current_cost_array = None
+                continue
+            if m := re.match(CONST_PATTERN, line):
+                versions[m["name"]] = int(m["value"]) if m["value"].isdigit() else None
+                continue
+            if m := re.match(COST_ARRAY_PATTERN, line):
+                current_cost_array = m["name"]
+                field_costs[current_cost_array] = {}
+                continue
+            if m := re.search(OP_SEARCH_PATTERN, line):
+                version = parse_version(m["version"])
+                if version is None:
+                    continue  # experimental op
+                # a single effect describes returned values, two describe arguments and returned values
+                effects = re.findall(EFFECTS_PATTERN, m["effects"])
+                effects_in, effects_out = effects if len(effects) == 2 else ("", effects[0] if effects else "")
+                cost, by_field, by_length = translate_cost(m["name"], m["details"])
+                specs.append(
+                    OpSpec(
+                        opcode=PROTO_BYTE if m["opcode"] == "protoByte" else int(m["opcode"], 16),
+                        name=m["name"],
+                        version=version,
+                        args=translate_arity(m["args"], effects_in),
+                        returns=translate_arity(m["returns"], effects_out),
+                        immediates=translate_immediates(m["details"]),
+                        mode=translate_mode(m["details"]),
+                        cost=cost,
+                        by_field=by_field,
+                        by_length=by_length,
+                    )
+                )
+
+
+def build_version_tables(attribute: str) -> list[list[int]]:
+    """Build tables of the spec attribute indexed by [version][opcode], 0 marks unavailable opcodes"""
+    tables = [[0] * 256 for _ in range(MAX_PROGRAM_VERSION + 1)]
+    # later specs for the same opcode override the previous ones starting with their version
+    for spec in sorted(specs, key=lambda s: s.version):
+        for version in range(spec.version, MAX_PROGRAM_VERSION + 1):
+            tables[version][spec.opcode] = getattr(spec, attribute)
+    return tables
+
+
+def build_opcode_table(attribute: str) -> list[int]:
+    """Build a table of the attribute of the latest spec of each opcode, 0 for unassigned opcodes"""
+    table = [0] * 256
+    for spec in sorted(specs, key=lambda s: s.version):
+        table[spec.opcode] = getattr(spec, attribute)
+    return table
+
+
+def build_min_versions() -> list[int]:
+    """Build a table of versions in which opcodes were introduced, 0 for unassigned opcodes"""
+    table = [0] * 256
+    for spec in sorted(specs, key=lambda s: s.version, reverse=True):
+        table[spec.opcode] = spec.version
+    return table
+
+
+def format_names(names: tuple[str, ...]) -> str:
+    """Format a tuple of names the way black does (double quotes, trailing comma for a single item)"""
+    items = ", ".join(f'"{name}"' for name in names)
+    return f"({items},)" if len(names) == 1 else f"({items})"
+
+
+def write_table(f, table: list[int], indent: str):
+    """Write the table with 16 opcodes per line"""
+    for row_start in range(0, 256, 16):
+        row = ", ".join(f"{value:4}" for value in table[row_start : row_start + 16])
+        f.write(f"{indent}{row},  # 0x{row_start:02x}\n")
+
+
+def write_version_tables(f, name: str, tables: list[list[int]]):
+    """Write a tuple of tables indexed by [version][opcode]"""
+    f.write("# fmt: off\n")
+    f.write(f"{name}: tuple[tuple[int, ...], ...] = (\n")
+    for version, table in enumerate(tables):
+        f.write(f"    (  # version {version}\n")
+        write_table(f, table, " " * 8)
+        f.write("    ),\n")
+    f.write(")\n")
+    f.write("# fmt: on\n\n")
+
+
+def write_opcode_table(f, name: str, table: list[int]):
+    """Write a single table indexed by opcode"""
+    f.write("# fmt: off\n")
+    f.write(f"{name}: tuple[int, ...] = (\n")
+    write_table(f, table, " " * 4)
+    f.write(")\n")
+    f.write("# fmt: on\n\n")
+
+
+def main():
+    """Regenerate opcodes.py"""
+    read_spec(os.path.join(HERE, SPEC_FILE))
+    latest = {spec.opcode: spec for spec in sorted(specs, key=lambda s: s.version)}
+    opcodes = {spec.name: spec.opcode for spec in specs}
+    for pseudo_op, op in PSEUDO_OPS.items():
+        opcodes[pseudo_op] = opcodes[op]
+
+    with open(os.path.join(HERE, OUTPUT_FILE), "w", encoding="utf-8") as f:
+        f.write(f"# This file was auto-generated by gen_opcodes.py from {SPEC_FILE}\n\n")
+        f.write(f"MAX_VERSION = {MAX_PROGRAM_VERSION}\n\n")
+        f.write(f"MODE_APP = {MODE_APP}\n")
+        f.write(f"MODE_SIG = {MODE_SIG}\n")
+        f.write(f"MODE_ANY = {MODE_ANY}\n\n")
+        f.write("# opcode names (including pseudo-ops) mapped to the opcode byte\n")
+        f.write("OPCODES: dict[str, int] = {\n")
+        for name, opcode in opcodes.items():
+            f.write(f'    "{name}": 0x{opcode:02X},\n')
+        f.write("}\n\n")
+        f.write(f'# names of immediate arguments, "{VARIABLE}" marks a variable number of trailing immediates\n')
+        f.write("IMMEDIATES: dict[int, tuple[str, ...]] = {\n")
+        for opcode, spec in sorted(latest.items()):
+            if spec.immediates:
+                f.write(f"    0x{opcode:02X}: {format_names(spec.immediates)},\n")
+        f.write("}\n\n")
+        f.write("# version in which the opcode was introduced, 0 for unassigned opcodes\n")
+        write_opcode_table(f, "MIN_VERSIONS", build_min_versions())
+        f.write(f"# number of values popped from the stack, {VARIABLE_ARITY} when it depends on the immediates\n")
+        write_opcode_table(f, "STACK_ARGS", build_opcode_table("args"))
+        f.write(f"# number of values pushed to the stack, {VARIABLE_ARITY} when it depends on the immediates\n")
+        write_opcode_table(f, "STACK_RETURNS", build_opcode_table("returns"))
+        f.write("# modes in which the opcode can be used indexed by [version][opcode], 0 marks unavailable opcodes\n")
+        write_version_tables(f, "OP_MODES", build_version_tables("mode"))
+        f.write("# static cost of each opcode indexed by [version][opcode], 0 marks unavailable opcodes\n")
+        write_version_tables(f, "OP_COSTS", build_version_tables("cost"))
+        f.write("# costs of opcodes depending on the field immediate, indexed by (opcode, field)\n")
+        f.write("FIELD_COSTS: dict[tuple[int, str], int] = {\n")
+        for opcode, spec in sorted(latest.items()):
+            for field_name, cost in spec.by_field.items():
+                f.write(f'    (0x{opcode:02X}, "{field_name}"): {cost},\n')
+        f.write("}\n\n")
+        f.write("# costs of opcodes depending on the length of a stack argument\n")
+        f.write("# opcode -> (base cost, cost per chunk, chunk size, depth of the argument on the stack)\n")
+        f.write("LENGTH_COSTS: dict[int, tuple[int, int, int, int]] = {\n")
+        for opcode, spec in sorted(latest.items()):
+            if spec.by_length is not None:
+                f.write(f"    0x{opcode:02X}: {spec.by_length},\n")
+        f.write("}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,186 +0,0 @@
-# This file was auto-generated by op_cost_gen.py
-
-from typing import Callable
-
-OP_COSTS: dict[str, Callable] = {
-    "err": (lambda *a, **k: 1),
-    "sha256": (lambda *a, **k: 35),
-    "keccak256": (lambda *a, **k: 130),
-    "sha512_256": (lambda *a, **k: 45),
-    "ed25519verify": (lambda *a, **k: 1900),
-    "ecdsa_verify": (
-        lambda *a, **k: NotImplementedError('ecdsa_verify: costByField("v", &EcdsaCurves, ecdsaVerifyCosts)')
-    ),
-    "ecdsa_pk_decompress": (
-        lambda *a, **k: NotImplementedError('ecdsa_pk_decompress: costByField("v", &EcdsaCurves, ecdsaDecompressCosts)')
-    ),
-    "ecdsa_pk_recover": (lambda *a, **k: NotImplementedError('ecdsa_pk_recover: field("v", &EcdsaCurves).costs(2000)')),
-    "+": (lambda *a, **k: 1),
-    "-": (lambda *a, **k: 1),
-    "/": (lambda *a, **k: 1),
-    "*": (lambda *a, **k: 1),
-    "<": (lambda *a, **k: 1),
-    ">": (lambda *a, **k: 1),
-    "<=": (lambda *a, **k: 1),
-    ">=": (lambda *a, **k: 1),
-    "&&": (lambda *a, **k: 1),
-    "||": (lambda *a, **k: 1),
-    "==": (lambda *a, **k: 1),
-    "!=": (lambda *a, **k: 1),
-    "!": (lambda *a, **k: 1),
-    "len": (lambda *a, **k: 1),
-    "itob": (lambda *a, **k: 1),
-    "btoi": (lambda *a, **k: 1),
-    "%": (lambda *a, **k: 1),
-    "|": (lambda *a, **k: 1),
-    "&": (lambda *a, **k: 1),
-    "^": (lambda *a, **k: 1),
-    "~": (lambda *a, **k: 1),
-    "mulw": (lambda *a, **k: 1),
-    "addw": (lambda *a, **k: 1),
-    "divmodw": (lambda *a, **k: 20),
-    "intcblock": (lambda *a, **k: 1),
-    "intc": (lambda *a, **k: 1),
-    "intc_0": (lambda *a, **k: 1),
-    "intc_1": (lambda *a, **k: 1),
-    "intc_2": (lambda *a, **k: 1),
-    "intc_3": (lambda *a, **k: 1),
-    "bytecblock": (lambda *a, **k: 1),
-    "bytec": (lambda *a, **k: 1),
-    "bytec_0": (lambda *a, **k: 1),
-    "bytec_1": (lambda *a, **k: 1),
-    "bytec_2": (lambda *a, **k: 1),
-    "bytec_3": (lambda *a, **k: 1),
-    "arg": (lambda *a, **k: 1),
-    "arg_0": (lambda *a, **k: 1),
-    "arg_1": (lambda *a, **k: 1),
-    "arg_2": (lambda *a, **k: 1),
-    "arg_3": (lambda *a, **k: 1),
-    "txn": (lambda *a, **k: 1),
-    "global": (lambda *a, **k: 1),
-    "gtxn": (lambda *a, **k: 1),
-    "load": (lambda *a, **k: 1),
-    "store": (lambda *a, **k: 1),
-    "txna": (lambda *a, **k: 1),
-    "gtxna": (lambda *a, **k: 1),
-    "gtxns": (lambda *a, **k: 1),
-    "gtxnsa": (lambda *a, **k: 1),
-    "gload": (lambda *a, **k: 1),
-    "gloads": (lambda *a, **k: 1),
-    "gaid": (lambda *a, **k: 1),
-    "gaids": (lambda *a, **k: 1),
-    "loads": (lambda *a, **k: 1),
-    "stores": (lambda *a, **k: 1),
-    "bnz": (lambda *a, **k: 1),
-    "bz": (lambda *a, **k: 1),
-    "b": (lambda *a, **k: 1),
-    "return": (lambda *a, **k: 1),
-    "assert": (lambda *a, **k: 1),
-    "bury": (lambda *a, **k: 1),
-    "popn": (lambda *a, **k: 1),
-    "dupn": (lambda *a, **k: 1),
-    "pop": (lambda *a, **k: 1),
-    "dup": (lambda *a, **k: 1),
-    "dup2": (lambda *a, **k: 1),
-    "dig": (lambda *a, **k: 1),
-    "swap": (lambda *a, **k: 1),
-    "select": (lambda *a, **k: 1),
-    "cover": (lambda *a, **k: 1),
-    "uncover": (lambda *a, **k: 1),
-    "concat": (lambda *a, **k: 1),
-    "substring": (lambda *a, **k: 1),
-    "substring3": (lambda *a, **k: 1),
-    "getbit": (lambda *a, **k: 1),
-    "setbit": (lambda *a, **k: 1),
-    "getbyte": (lambda *a, **k: 1),
-    "setbyte": (lambda *a, **k: 1),
-    "extract": (lambda *a, **k: 1),
-    "extract3": (lambda *a, **k: 1),
-    "extract_uint16": (lambda *a, **k: 1),
-    "extract_uint32": (lambda *a, **k: 1),
-    "extract_uint64": (lambda *a, **k: 1),
-    "replace2": (lambda *a, **k: 1),
-    "replace3": (lambda *a, **k: 1),
-    "base64_decode": (lambda *a, **k: 1),
-    "json_ref": (lambda *a, **k: 1),
-    "balance": (lambda *a, **k: 1),
-    "app_opted_in": (lambda *a, **k: 1),
-    "app_local_get": (lambda *a, **k: 1),
-    "app_local_get_ex": (lambda *a, **k: 1),
-    "app_global_get": (lambda *a, **k: 1),
-    "app_global_get_ex": (lambda *a, **k: 1),
-    "app_local_put": (lambda *a, **k: 1),
-    "app_global_put": (lambda *a, **k: 1),
-    "app_local_del": (lambda *a, **k: 1),
-    "app_global_del": (lambda *a, **k: 1),
-    "asset_holding_get": (lambda *a, **k: 1),
-    "asset_params_get": (lambda *a, **k: 1),
-    "app_params_get": (lambda *a, **k: 1),
-    "acct_params_get": (lambda *a, **k: 1),
-    "min_balance": (lambda *a, **k: 1),
-    "pushbytes": (lambda *a, **k: 1),
-    "pushint": (lambda *a, **k: 1),
-    "pushbytess": (lambda *a, **k: 1),
-    "pushints": (lambda *a, **k: 1),
-    "ed25519verify_bare": (lambda *a, **k: 1900),
-    "callsub": (lambda *a, **k: 1),
-    "retsub": (lambda *a, **k: 1),
-    "proto": (lambda *a, **k: 1),
-    "frame_dig": (lambda *a, **k: 1),
-    "frame_bury": (lambda *a, **k: 1),
-    "switch": (lambda *a, **k: 1),
-    "match": (lambda *a, **k: 1),
-    "shl": (lambda *a, **k: 1),
-    "shr": (lambda *a, **k: 1),
-    "sqrt": (lambda *a, **k: 4),
-    "bitlen": (lambda *a, **k: 1),
-    "exp": (lambda *a, **k: 1),
-    "expw": (lambda *a, **k: 10),
-    "bsqrt": (lambda *a, **k: 40),
-    "divw": (lambda *a, **k: 1),
-    "sha3_256": (lambda *a, **k: 130),
-    "bn256_add": (lambda *a, **k: 70),
-    "bn256_scalar_mul": (lambda *a, **k: 970),
-    "bn256_pairing": (lambda *a, **k: 8700),
-    "b+": (lambda *a, **k: 10),
-    "b-": (lambda *a, **k: 10),
-    "b/": (lambda *a, **k: 20),
-    "b*": (lambda *a, **k: 20),
-    "b<": (lambda *a, **k: 1),
-    "b>": (lambda *a, **k: 1),
-    "b<=": (lambda *a, **k: 1),
-    "b>=": (lambda *a, **k: 1),
-    "b==": (lambda *a, **k: 1),
-    "b!=": (lambda *a, **k: 1),
-    "b%": (lambda *a, **k: 20),
-    "b|": (lambda *a, **k: 6),
-    "b&": (lambda *a, **k: 6),
-    "b^": (lambda *a, **k: 6),
-    "b~": (lambda *a, **k: 4),
-    "bzero": (lambda *a, **k: 1),
-    "log": (lambda *a, **k: 1),
-    "itxn_begin": (lambda *a, **k: 1),
-    "itxn_field": (lambda *a, **k: 1),
-    "itxn_submit": (lambda *a, **k: 1),
-    "itxn": (lambda *a, **k: 1),
-    "itxna": (lambda *a, **k: 1),
-    "itxn_next": (lambda *a, **k: 1),
-    "gitxn": (lambda *a, **k: 1),
-    "gitxna": (lambda *a, **k: 1),
-    "box_create": (lambda *a, **k: 1),
-    "box_extract": (lambda *a, **k: 1),
-    "box_replace": (lambda *a, **k: 1),
-    "box_del": (lambda *a, **k: 1),
-    "box_len": (lambda *a, **k: 1),
-    "box_get": (lambda *a, **k: 1),
-    "box_put": (lambda *a, **k: 1),
-    "txnas": (lambda *a, **k: 1),
-    "gtxnas": (lambda *a, **k: 1),
-    "gtxnsas": (lambda *a, **k: 1),
-    "args": (lambda *a, **k: 1),
-    "gloadss": (lambda *a, **k: 1),
-    "itxnas": (lambda *a, **k: 1),
-    "gitxnas": (lambda *a, **k: 1),
-    "vrf_verify": (lambda *a, **k: NotImplementedError('vrf_verify: field("s", &VrfStandards).costs(5700)')),
-    "block": (lambda *a, **k: 1),
-}
@@ -0,0 +1,741 @@
+# This file was auto-generated by gen_opcodes.py from opcodes.go.txt
+
+MAX_VERSION = 10
+
+MODE_APP = 1
+MODE_SIG = 2
+MODE_ANY = 3
+
+# opcode names (including pseudo-ops) mapped to the opcode byte
+OPCODES: dict[str, int] = {
+    "err": 0x00,
+    "sha256": 0x01,
+    "keccak256": 0x02,
+    "sha512_256": 0x03,
+    "ed25519verify": 0x04,
+    "ecdsa_verify": 0x05,
+    "ecdsa_pk_decompress": 0x06,
+    "ecdsa_pk_recover": 0x07,
+    "+": 0x08,
+    "-": 0x09,
+    "/": 0x0A,
+    "*": 0x0B,
+    "<": 0x0C,
+    ">": 0x0D,
+    "<=": 0x0E,
+    ">=": 0x0F,
+    "&&": 0x10,
+    "||": 0x11,
+    "==": 0x12,
+    "!=": 0x13,
+    "!": 0x14,
+    "len": 0x15,
+    "itob": 0x16,
+    "btoi": 0x17,
+    "%": 0x18,
+    "|": 0x19,
+    "&": 0x1A,
+    "^": 0x1B,
+    "~": 0x1C,
+    "mulw": 0x1D,
+    "addw": 0x1E,
+    "divmodw": 0x1F,
+    "intcblock": 0x20,
+    "intc": 0x21,
+    "intc_0": 0x22,
+    "intc_1": 0x23,
+    "intc_2": 0x24,
+    "intc_3": 0x25,
+    "bytecblock": 0x26,
+    "bytec": 0x27,
+    "bytec_0": 0x28,
+    "bytec_1": 0x29,
+    "bytec_2": 0x2A,
+    "bytec_3": 0x2B,
+    "arg": 0x2C,
+    "arg_0": 0x2D,
+    "arg_1": 0x2E,
+    "arg_2": 0x2F,
+    "arg_3": 0x30,
+    "txn": 0x31,
+    "global": 0x32,
+    "gtxn": 0x33,
+    "load": 0x34,
+    "store": 0x35,
+    "txna": 0x36,
+    "gtxna": 0x37,
+    "gtxns": 0x38,
+    "gtxnsa": 0x39,
+    "gload": 0x3A,
+    "gloads": 0x3B,
+    "gaid": 0x3C,
+    "gaids": 0x3D,
+    "loads": 0x3E,
+    "stores": 0x3F,
+    "bnz": 0x40,
+    "bz": 0x41,
+    "b": 0x42,
+    "return": 0x43,
+    "assert": 0x44,
+    "bury": 0x45,
+    "popn": 0x46,
+    "dupn": 0x47,
+    "pop": 0x48,
+    "dup": 0x49,
+    "dup2": 0x4A,
+    "dig": 0x4B,
+    "swap": 0x4C,
+    "select": 0x4D,
+    "cover": 0x4E,
+    "uncover": 0x4F,
+    "concat": 0x50,
+    "substring": 0x51,
+    "substring3": 0x52,
+    "getbit": 0x53,
+    "setbit": 0x54,
+    "getbyte": 0x55,
+    "setbyte": 0x56,
+    "extract": 0x57,
+    "extract3": 0x58,
+    "extract_uint16": 0x59,
+    "extract_uint32": 0x5A,
+    "extract_uint64": 0x5B,
+    "replace2": 0x5C,
+    "replace3": 0x5D,
+    "base64_decode": 0x5E,
+    "json_ref": 0x5F,
+    "balance": 0x60,
+    "app_opted_in": 0x61,
+    "app_local_get": 0x62,
+    "app_local_get_ex": 0x63,
+    "app_global_get": 0x64,
+    "app_global_get_ex": 0x65,
+    "app_local_put": 0x66,
+    "app_global_put": 0x67,
+    "app_local_del": 0x68,
+    "app_global_del": 0x69,
+    "asset_holding_get": 0x70,
+    "asset_params_get": 0x71,
+    "app_params_get": 0x72,
+    "acct_params_get": 0x73,
+    "min_balance": 0x78,
+    "pushbytes": 0x80,
+    "pushint": 0x81,
+    "pushbytess": 0x82,
+    "pushints": 0x83,
+    "ed25519verify_bare": 0x84,
+    "callsub": 0x88,
+    "retsub": 0x89,
+    "proto": 0x8A,
+    "frame_dig": 0x8B,
+    "frame_bury": 0x8C,
+    "switch": 0x8D,
+    "match": 0x8E,
+    "shl": 0x90,
+    "shr": 0x91,
+    "sqrt": 0x92,
+    "bitlen": 0x93,
+    "exp": 0x94,
+    "expw": 0x95,
+    "bsqrt": 0x96,
+    "divw": 0x97,
+    "sha3_256": 0x98,
+    "b+": 0xA0,
+    "b-": 0xA1,
+    "b/": 0xA2,
+    "b*": 0xA3,
+    "b<": 0xA4,
+    "b>": 0xA5,
+    "b<=": 0xA6,
+    "b>=": 0xA7,
+    "b==": 0xA8,
+    "b!=": 0xA9,
+    "b%": 0xAA,
+    "b|": 0xAB,
+    "b&": 0xAC,
+    "b^": 0xAD,
+    "b~": 0xAE,
+    "bzero": 0xAF,
+    "log": 0xB0,
+    "itxn_begin": 0xB1,
+    "itxn_field": 0xB2,
+    "itxn_submit": 0xB3,
+    "itxn": 0xB4,
+    "itxna": 0xB5,
+    "itxn_next": 0xB6,
+    "gitxn": 0xB7,
+    "gitxna": 0xB8,
+    "box_create": 0xB9,
+    "box_extract": 0xBA,
+    "box_replace": 0xBB,
+    "box_del": 0xBC,
+    "box_len": 0xBD,
+    "box_get": 0xBE,
+    "box_put": 0xBF,
+    "txnas": 0xC0,
+    "gtxnas": 0xC1,
+    "gtxnsas": 0xC2,
+    "args": 0xC3,
+    "gloadss": 0xC4,
+    "itxnas": 0xC5,
+    "gitxnas": 0xC6,
+    "vrf_verify": 0xD0,
+    "block": 0xD1,
+    "int": 0x21,
+    "byte": 0x27,
+    "addr": 0x27,
+    "method": 0x27,
+}
+
+# names of immediate arguments, "..." marks a variable number of trailing immediates
+IMMEDIATES: dict[int, tuple[str, ...]] = {
+    0x05: ("v",),
+    0x06: ("v",),
+    0x07: ("v",),
+    0x20: ("uint", "..."),
+    0x21: ("i",),
+    0x26: ("bytes", "..."),
+    0x27: ("i",),
+    0x2C: ("n",),
+    0x31: ("f",),
+    0x32: ("f",),
+    0x33: ("t", "f"),
+    0x34: ("i",),
+    0x35: ("i",),
+    0x36: ("f", "i"),
+    0x37: ("t", "f", "i"),
+    0x38: ("f",),
+    0x39: ("f", "i"),
+    0x3A: ("t", "i"),
+    0x3B: ("i",),
+    0x3C: ("t",),
+    0x40: ("target",),
+    0x41: ("target",),
+    0x42: ("target",),
+    0x45: ("n",),
+    0x46: ("n",),
+    0x47: ("n",),
+    0x4B: ("n",),
+    0x4E: ("n",),
+    0x4F: ("n",),
+    0x51: ("s", "e"),
+    0x57: ("s", "l"),
+    0x5C: ("s",),
+    0x5E: ("e",),
+    0x5F: ("r",),
+    0x70: ("f",),
+    0x71: ("f",),
+    0x72: ("f",),
+    0x73: ("f",),
+    0x80: ("bytes",),
+    0x81: ("uint",),
+    0x82: ("bytes", "..."),
+    0x83: ("uint", "..."),
+    0x88: ("target",),
+    0x8A: ("a", "r"),
+    0x8B: ("i",),
+    0x8C: ("i",),
+    0x8D: ("target", "..."),
+    0x8E: ("target", "..."),
+    0xB2: ("f",),
+    0xB4: ("f",),
+    0xB5: ("f", "i"),
+    0xB7: ("t", "f"),
+    0xB8: ("t", "f", "i"),
+    0xC0: ("f",),
+    0xC1: ("t", "f"),
+    0xC2: ("f",),
+    0xC5: ("f",),
+    0xC6: ("t", "f"),
+    0xD0: ("s",),
+    0xD1: ("f",),
+}
+
+# version in which the opcode was introduced, 0 for unassigned opcodes
+# fmt: off
+MIN_VERSIONS: tuple[int, ...] = (
+       1,    1,    1,    1,    1,    5,    5,    5,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+       1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    2,    4,  # 0x10
+       1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+       1,    1,    1,    1,    1,    1,    2,    2,    3,    3,    4,    4,    4,    4,    5,    5,  # 0x30
+       1,    2,    2,    2,    3,    8,    8,    8,    1,    1,    2,    3,    3,    3,    5,    5,  # 0x40
+       2,    2,    2,    3,    3,    3,    3,    5,    5,    5,    5,    5,    7,    7,    7,    7,  # 0x50
+       2,    2,    2,    2,    2,    2,    2,    2,    2,    2,    0,    0,    0,    0,    0,    0,  # 0x60
+       2,    2,    5,    6,    0,    0,    0,    0,    3,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+       3,    3,    8,    8,    7,    0,    0,    0,    4,    4,    8,    8,    8,    8,    8,    0,  # 0x80
+       4,    4,    4,    4,    4,    4,    6,    6,    7,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+       4,    4,    4,    4,    4,    4,    4,    4,    4,    4,    4,    4,    4,    4,    4,    4,  # 0xa0
+       5,    5,    5,    5,    5,    5,    6,    6,    6,    8,    8,    8,    8,    8,    8,    8,  # 0xb0
+       5,    5,    5,    5,    6,    6,    6,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+       7,    7,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+       0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+       0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+)
+# fmt: on
+
+# number of values popped from the stack, -1 when it depends on the immediates
+# fmt: off
+STACK_ARGS: tuple[int, ...] = (
+       0,    1,    1,    1,    3,    5,    1,    4,    2,    2,    2,    2,    2,    2,    2,    2,  # 0x00
+       2,    2,    2,    2,    1,    1,    1,    1,    2,    2,    2,    2,    1,    2,    2,    4,  # 0x10
+       0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x20
+       0,    0,    0,    0,    0,    1,    0,    0,    1,    1,    0,    1,    0,    1,    1,    2,  # 0x30
+       1,    1,    0,    1,    1,    1,   -1,    1,    1,    1,    2,    1,    2,    3,    1,    1,  # 0x40
+       2,    1,    3,    2,    3,    2,    3,    1,    3,    2,    2,    2,    2,    3,    1,    2,  # 0x50
+       1,    2,    2,    3,    1,    2,    3,    2,    2,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+       2,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+       0,    0,    0,    0,    3,    0,    0,    0,    0,    0,    0,    0,    1,    1,   -1,    0,  # 0x80
+       2,    2,    1,    1,    2,    2,    1,    3,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+       2,    2,    2,    2,    2,    2,    2,    2,    2,    2,    2,    2,    2,    2,    1,    1,  # 0xa0
+       1,    0,    1,    0,    0,    0,    0,    0,    0,    2,    3,    3,    1,    1,    1,    2,  # 0xb0
+       1,    1,    2,    1,    2,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+       3,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+       0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+       0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+)
+# fmt: on
+
+# number of values pushed to the stack, -1 when it depends on the immediates
+# fmt: off
+STACK_RETURNS: tuple[int, ...] = (
+       0,    1,    1,    1,    1,    1,    2,    2,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+       1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    2,    2,    4,  # 0x10
+       0,    1,    1,    1,    1,    1,    0,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+       1,    1,    1,    1,    1,    0,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,  # 0x30
+       0,    0,    0,    0,    0,    0,    0,   -1,    0,    2,    4,    2,    2,    1,    1,    1,  # 0x40
+       1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x50
+       1,    1,    1,    2,    1,    2,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x60
+       2,    2,    2,    2,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+       1,    1,   -1,   -1,    1,    0,    0,    0,    0,    0,    0,    1,    0,    0,    0,    0,  # 0x80
+       1,    1,    1,    1,    1,    2,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+       1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0xa0
+       0,    0,    0,    0,    1,    1,    0,    1,    1,    1,    1,    0,    1,    2,    2,    0,  # 0xb0
+       1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+       2,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+       0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+       0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+)
+# fmt: on
+
+# modes in which the opcode can be used indexed by [version][opcode], 0 marks unavailable opcodes
+# fmt: off
+OP_MODES: tuple[tuple[int, ...], ...] = (
+    (  # version 0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x00
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x10
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x20
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x30
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x40
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x60
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 1
+           3,    3,    3,    3,    2,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x30
+           3,    0,    0,    0,    0,    0,    0,    0,    3,    3,    0,    0,    0,    0,    0,    0,  # 0x40
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x60
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 2
+           3,    3,    3,    3,    2,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    0,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x30
+           3,    3,    3,    3,    0,    0,    0,    0,    3,    3,    3,    0,    0,    0,    0,    0,  # 0x40
+           3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 3
+           3,    3,    3,    3,    2,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    0,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,  # 0x30
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    0,    0,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    0,    0,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 4
+           3,    3,    3,    3,    2,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    1,    1,    1,    1,    0,    0,  # 0x30
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    0,    0,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    0,    0,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    0,    0,    0,    0,    0,    0,    3,    3,    0,    0,    0,    0,    0,    0,  # 0x80
+           3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 5
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    1,    1,    1,    1,    3,    3,  # 0x30
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    0,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    0,    0,    0,    0,    0,    0,    3,    3,    0,    0,    0,    0,    0,    0,  # 0x80
+           3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0xa0
+           1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           3,    3,    3,    2,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 6
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    1,    1,    1,    1,    3,    3,  # 0x30
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    0,    0,    0,    0,    0,    0,    3,    3,    0,    0,    0,    0,    0,    0,  # 0x80
+           3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           3,    3,    3,    2,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 7
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    1,    1,    1,    1,    3,    3,  # 0x30
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    0,    0,    3,    0,    0,    0,    3,    3,    0,    0,    0,    0,    0,    0,  # 0x80
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           3,    3,    3,    2,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 8
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    1,    1,    1,    1,    3,    3,  # 0x30
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    0,  # 0x80
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0xb0
+           3,    3,    3,    2,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 9
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    1,    1,    1,    1,    3,    3,  # 0x30
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    0,  # 0x80
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0xb0
+           3,    3,    3,    2,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x00
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x10
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    2,    2,    2,    2,  # 0x20
+           2,    3,    3,    3,    3,    3,    3,    3,    3,    3,    1,    1,    1,    1,    3,    3,  # 0x30
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x40
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           3,    3,    3,    3,    3,    0,    0,    0,    3,    3,    3,    3,    3,    3,    3,    0,  # 0x80
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,    3,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0xb0
+           3,    3,    3,    2,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           3,    3,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+)
+# fmt: on
+
+# static cost of each opcode indexed by [version][opcode], 0 marks unavailable opcodes
+# fmt: off
+OP_COSTS: tuple[tuple[int, ...], ...] = (
+    (  # version 0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x00
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x10
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x20
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x30
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x40
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x60
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 1
+           1,    7,   26,    9, 1900,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x30
+           1,    0,    0,    0,    0,    0,    0,    0,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x40
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x60
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 2
+           1,   35,  130,   45, 1900,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x30
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    1,    1,    0,    0,    0,    0,    0,  # 0x40
+           1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 3
+           1,   35,  130,   45, 1900,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x30
+           1,    1,    1,    1,    1,    0,    0,    0,    1,    1,    1,    1,    1,    1,    0,    0,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    0,    0,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x80
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 4
+           1,   35,  130,   45, 1900,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   20,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,  # 0x30
+           1,    1,    1,    1,    1,    0,    0,    0,    1,    1,    1,    1,    1,    1,    0,    0,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    0,    0,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    0,    0,    0,    0,    0,    0,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x80
+           1,    1,    4,    1,    1,   10,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+          10,   10,   20,   20,    1,    1,    1,    1,    1,    1,   20,    6,    6,    6,    4,    1,  # 0xa0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 5
+           1,   35,  130,   45, 1900, 2500, 2400, 2000,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   20,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x30
+           1,    1,    1,    1,    1,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    0,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    0,    0,    0,    0,    0,    0,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x80
+           1,    1,    4,    1,    1,   10,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+          10,   10,   20,   20,    1,    1,    1,    1,    1,    1,   20,    6,    6,    6,    4,    1,  # 0xa0
+           1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 6
+           1,   35,  130,   45, 1900, 2500, 2400, 2000,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   20,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x30
+           1,    1,    1,    1,    1,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    0,    0,    0,    0,    0,    0,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x80
+           1,    1,    4,    1,    1,   10,   40,    1,    0,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+          10,   10,   20,   20,    1,    1,    1,    1,    1,    1,   20,    6,    6,    6,    4,    1,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 7
+           1,   35,  130,   45, 1900, 2500, 2400, 2000,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   20,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x30
+           1,    1,    1,    1,    1,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   25,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    0,    0, 1900,    0,    0,    0,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x80
+           1,    1,    4,    1,    1,   10,   40,    1,  130,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+          10,   10,   20,   20,    1,    1,    1,    1,    1,    1,   20,    6,    6,    6,    4,    1,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,  # 0xb0
+           1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+        5700,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 8
+           1,   35,  130,   45, 1900, 2500, 2400, 2000,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   20,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x30
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   25,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    1,    1, 1900,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    0,  # 0x80
+           1,    1,    4,    1,    1,   10,   40,    1,  130,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+          10,   10,   20,   20,    1,    1,    1,    1,    1,    1,   20,    6,    6,    6,    4,    1,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0xb0
+           1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+        5700,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 9
+           1,   35,  130,   45, 1900, 2500, 2400, 2000,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   20,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x30
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   25,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    1,    1, 1900,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    0,  # 0x80
+           1,    1,    4,    1,    1,   10,   40,    1,  130,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+          10,   10,   20,   20,    1,    1,    1,    1,    1,    1,   20,    6,    6,    6,    4,    1,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0xb0
+           1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+        5700,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+    (  # version 10
+           1,   35,  130,   45, 1900, 2500, 2400, 2000,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x00
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   20,  # 0x10
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x20
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x30
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0x40
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,   25,  # 0x50
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,  # 0x60
+           1,    1,    1,    1,    0,    0,    0,    0,    1,    0,    0,    0,    0,    0,    0,    0,  # 0x70
+           1,    1,    1,    1, 1900,    0,    0,    0,    1,    1,    1,    1,    1,    1,    1,    0,  # 0x80
+           1,    1,    4,    1,    1,   10,   40,    1,  130,    0,    0,    0,    0,    0,    0,    0,  # 0x90
+          10,   10,   20,   20,    1,    1,    1,    1,    1,    1,   20,    6,    6,    6,    4,    1,  # 0xa0
+           1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,    1,  # 0xb0
+           1,    1,    1,    1,    1,    1,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xc0
+        5700,    1,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xd0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xe0
+           0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,    0,  # 0xf0
+    ),
+)
+# fmt: on
+
+# costs of opcodes depending on the field immediate, indexed by (opcode, field)
+FIELD_COSTS: dict[tuple[int, str], int] = {
+    (0x05, "Secp256k1"): 1700,
+    (0x05, "Secp256r1"): 2500,
+    (0x06, "Secp256k1"): 650,
+    (0x06, "Secp256r1"): 2400,
+}
+
+# costs of opcodes depending on the length of a stack argument
+# opcode -> (base cost, cost per chunk, chunk size, depth of the argument on the stack)
+LENGTH_COSTS: dict[int, tuple[int, int, int, int]] = {
+    0x5E: (1, 1, 16, 0),
+    0x5F: (25, 2, 7, 1),
+}
@@ -1,21 +1,60 @@
-from dataclasses import dataclass
+# pylint: disable=too-many-lines
+import base64
+import binascii
+import hashlib
+import struct
+from bisect import bisect_right
+from dataclasses import dataclass, replace
 from math import isqrt
 from typing import IO
 
-from algosdk.encoding import decode_address
+from algosdk.encoding import checksum, decode_address
 from algosdk.transaction import ApplicationCallTxn
+from Cryptodome.Hash import keccak
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+from pyteal import Mode
+
+from .data import (
+    FIELD_COSTS,
+    LENGTH_COSTS,
+    MAX_VERSION,
+    MODE_APP,
+    MODE_SIG,
+    OP_COSTS,
+    OP_MODES,
+    OPCODES,
+    length_cost,
+    required_immediates,
+)
+from .hooks import Hooks
+
+# the Max* limits moved to the limits module, they are still importable from here
+from .limits import (  # pylint: disable=unused-import  # noqa: F401
+    DEFAULT_LIMITS,
+    Limits,
+    MaxGlobalStateSize,
+    MaxLocalStateSize,
+    MaxLogCalls,
+    MaxLogSize,
+    MaxStringSize,
+    default_budget,
+)
 
 INTEGER_SIZE = 2**64
 
+UINT16 = struct.Struct(">H")
+UINT32 = struct.Struct(">I")
+UINT64 = struct.Struct(">Q")
+
 
 def int_to_trimmed_bytes(value: int) -> bytes:
     """Convert an integer into a big-endian byte array with no leading zero bytes
 
     Special case: zero is converted to a single zero byte
     """
-    byte_length = (value.bit_length() + 7) // 8
-    byte_length = max(1, byte_length)  # handle zero special case
-    return value.to_bytes(byte_length, "big")
+    # "or 1" handles the zero special case
+    return value.to_bytes((value.bit_length() + 7) // 8 or 1, "big")
 
 
 class Panic(Exception):
@@ -45,17 +84,9 @@ class EvaluatorError(Panic):
     """
 
 
-MaxLogCalls = 32
-MaxLogSize = 1024
-MaxStringSize = 4096
-
-MaxLocalStateSize = 16
-MaxGlobalStateSize = 64
-
-
-class EvalContext:  # pylint: disable=too-few-public-methods
+class EvalContext:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """
-    Class containing the execution environment for an application call
+    Class containing the execution environment for an application call or a logic signature
     """
 
     def __init__(
@@ -64,17 +95,40 @@ class EvalContext:  # pylint: disable=too-few-public-methods
         global_state: dict[bytes, bytes | int] | None = None,
         local_state: dict[bytes, bytes | int] | None = None,
         txn: ApplicationCallTxn | None = None,
+        program_hash: bytes | None = None,
+        mode: Mode = Mode.Application,
+        args: list[bytes] | None = None,
+        budget: int | None = None,
+        limits: Limits = DEFAULT_LIMITS,
     ):
         """
         Args:
             global_state: The global state of the application
             local_state: The local state of the user interacting with the application
             txn: The transaction that is being evaluated
+            program_hash: SHA512/256 hash of the "Program" prefixed bytecode (the program's address, decoded).
+                Required by ed25519verify, which verifies signatures of "ProgData" || program_hash || data.
+            mode: Mode.Signature to evaluate a logic signature, only opcodes available in the mode are allowed
+            args: The arguments of the logic signature (accessed with arg, arg_N and args)
+            budget: Maximum cost of evaluated programs, when exceeded evaluation panics.
+                Defaults to MaxLogicSigCost for logic signatures and no limit for applications,
+                as their budget depends on the transaction group (pooling, OpUp).
+            limits: Resource limits of the network the programs are evaluated for.
+
+        The size of the log is tracked incrementally by the evaluator,
+        log should not be modified directly once the context is in use.
         """
         self.global_state: dict[bytes, int | bytes] = global_state if global_state is not None else {}
         self.local_state: dict[bytes, int | bytes] = local_state if local_state is not None else {}
         self.txn = txn
+        self.program_hash = program_hash
+        self.mode = mode
+        self.args: list[bytes] = args if args is not None else []
+        self.budget = budget if budget is not None else default_budget(mode)
+        self.limits = limits
         self.log: list[bytes] = []
+        self.log_size = 0  # total bytes logged
+        self.cost = 0  # opcode budget consumed by the evaluated programs
 
 
 @dataclass
@@ -88,6 +142,191 @@ class Frame:
     retc: int = 0  # return values count
 
 
+@dataclass
+class Checkpoint:  # pylint: disable=too-many-instance-attributes
+    """State of an evaluation after a number of executed operations"""
+
+    step: int  # number of executed operations
+    line: int  # index of the next line to execute
+    stack: list[int | bytes]
+    slots: list[int | bytes]
+    call_stack: list[Frame]
+    op: str  # the last executed operation
+    cost: int
+    # state of the context, None when evaluated without one.
+    # The context is bounded by its limits, so it is cheap enough to copy whole.
+    global_state: dict[bytes, int | bytes] | None = None
+    local_state: dict[bytes, int | bytes] | None = None
+    log: list[bytes] | None = None
+    context_cost: int = 0  # context.cost as of the checkpoint, including the cost of this evaluation so far
+
+    @classmethod
+    def take(  # pylint: disable=too-many-arguments
+        cls,
+        step: int,
+        line: int,
+        stack: list[int | bytes],
+        slots: list[int | bytes],
+        call_stack: list[Frame],
+        *,
+        op: str,
+        cost: int,
+        context: EvalContext | None,
+        context_cost: int = 0,
+    ) -> "Checkpoint":
+        """Copy the state of an evaluation
+
+        Args:
+            context_cost: context.cost as of the checkpoint, the evaluation adds its cost to the context when it ends
+        """
+        checkpoint = cls(step, line, stack.copy(), slots.copy(), [replace(frame) for frame in call_stack], op, cost)
+        if context is not None:
+            checkpoint.global_state = context.global_state.copy()
+            checkpoint.local_state = context.local_state.copy()
+            checkpoint.log = context.log.copy()
+            checkpoint.context_cost = context_cost
+        return checkpoint
+
+    def restore(self, context: EvalContext | None):
+        """Restore the state of the context from the checkpoint"""
+        if self.global_state is None or self.local_state is None or self.log is None:
+            return  # taken without a context
+        if context is None:
+            raise EvaluatorError("Checkpoint was taken with a context, the context is required to resume", 0)
+        context.global_state = self.global_state.copy()
+        context.local_state = self.local_state.copy()
+        context.log = self.log.copy()
+        context.log_size = sum(len(log) for log in context.log)
+        context.cost = self.context_cost
+
+
+class Checkpoints:  # pylint: disable=too-few-public-methods
+    """Checkpoints taken periodically during an evaluation
+
+    The first checkpoint is the initial state, so the state at any step can be reconstructed
+    by resuming from the nearest checkpoint (see tools.state_at).
+    """
+
+    def __init__(self, interval: int = 10000):
+        """
+        Args:
+            interval: number of operations executed between checkpoints
+        """
+        if interval < 1:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.items: list[Checkpoint] = []
+        self.steps = 0  # operations executed when the evaluation ended, including an operation that panicked
+
+    def nearest(self, step: int) -> Checkpoint:
+        """Get the latest checkpoint taken at or before the given step"""
+        index = bisect_right(self.items, step, key=lambda checkpoint: checkpoint.step)
+        if index == 0:
+            raise ValueError(f"No checkpoint taken at or before step {step}")
+        return self.items[index - 1]
+
+
+@dataclass(frozen=True, slots=True)
+class Instruction:
+    """A single line of a TEAL program decoded for evaluation"""
+
+    line: str
+    op: str  # empty for labels, comments and empty lines
+    args: list[str]
+    opcode: int  # opcode byte, -1 for lines that are not operations or are unknown
+    cost: int  # static cost of the operation
+    cost_by_length: bool = False  # the length of a stack argument adds to the cost, see LENGTH_COSTS
+
+
+class Program:  # pylint: disable=too-few-public-methods
+    """
+    TEAL program decoded once so that it can be evaluated any number of times
+    """
+
+    def __init__(self, lines: list[str] | str, mode: Mode = Mode.Application):
+        """
+        Args:
+            lines: list of TEAL program lines or compiled program string
+            mode: the mode the program will be evaluated in, opcodes unavailable in it are rejected
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        if not isinstance(lines, list):
+            raise TypeError("lines must be a list of strings or a string")
+
+        self.lines = lines
+        self.mode = mode
+        self._mode_mask = MODE_SIG if mode == Mode.Signature else MODE_APP
+        self.version = MAX_VERSION
+        if lines and lines[0].startswith("#pragma version "):
+            self.version = int(lines[0].split()[2])
+            if not 1 <= self.version <= MAX_VERSION:
+                raise EvaluatorError(
+                    f"TEAL v{self.version} is not supported, the evaluator supports versions 1 to {MAX_VERSION}", 1
+                )
+        self.branch_targets = {
+            line[:-1]: nr  # strip trailing ":" from key, ex. b11: -> b11
+            for nr, line in enumerate(lines)
+            if line and line[-1] == ":"
+        }
+        self.instructions: list[Instruction] = []
+        decoded: dict[str, Instruction] = {}  # programs repeat a lot of lines, decode each of them once
+        for nr, line in enumerate(lines):
+            instruction = decoded.get(line)
+            if instruction is None:
+                instruction = decoded[line] = self._decode(line, nr + 1)
+            self.instructions.append(instruction)
+
+    def _decode(self, line: str, line_number: int) -> Instruction:
+        if not line or line.startswith("#") or line[-1] == ":":
+            return Instruction(line, "", [], -1, 0)
+        op, *args = line.split()
+        opcode = OPCODES.get(op, -1)
+        if opcode < 0:
+            return Instruction(line, op, args, opcode, 0)
+        cost = OP_COSTS[self.version][opcode]
+        if not cost:
+            raise Panic(f"{op} is not available in TEAL v{self.version}", line_number)
+        if not OP_MODES[self.version][opcode] & self._mode_mask:
+            raise Panic(f"{op} is not allowed in {self.mode.name} mode", line_number)
+        if len(args) < required_immediates(opcode):
+            raise Panic(f"{op} expects {required_immediates(opcode)} immediate arguments", line_number)
+        if args:
+            cost = FIELD_COSTS.get((opcode, args[0]), cost)
+        if opcode in LENGTH_COSTS:
+            cost = LENGTH_COSTS[opcode][0]
+        return Instruction(line, op, args, opcode, cost, opcode in LENGTH_COSTS)
+
+
+def replace_bytes(value: bytes, start: int, replacement: bytes) -> bytes:
+    """Overwrite value with replacement starting at the given position.
+
+    The result is built in a single copy of value, which is returned as is if nothing changes.
+    """
+    end = start + len(replacement)
+    view = memoryview(value)
+    if view[start:end] == replacement:
+        return value
+    return b"".join((view[:start], replacement, view[end:]))
+
+
+def base64_decode(value: bytes, encoding: str, line_number: int) -> bytes:
+    """Decode strictly base64 encoded value, padded or not, like base64_decode does"""
+    if encoding not in ("StdEncoding", "URLEncoding"):
+        raise Panic(f"invalid base64_decode encoding {encoding}", line_number)
+    altchars = b"+/" if encoding == "StdEncoding" else b"-_"
+    unpadded = value.rstrip(b"=")
+    try:
+        decoded = base64.b64decode(unpadded + b"=" * (-len(unpadded) % 4), altchars, validate=True)
+    except binascii.Error as e:
+        raise Panic(f"invalid base64: {e}", line_number) from e
+    # strict decoding rejects non-zero padding bits and padding of the wrong length
+    encoded = base64.b64encode(decoded, altchars)
+    if value not in (encoded, encoded.rstrip(b"=")):
+        raise Panic("invalid base64: not in canonical form", line_number)
+    return decoded
+
+
 def split128(val: int):
     """
     Splits a 128-bit integer into a tuple (x, y) of 64-bit integers
@@ -96,717 +335,951 @@ def split128(val: int):
     return val // INTEGER_SIZE, val % INTEGER_SIZE
 
 
+def check_state_entry(key: bytes, value: int | bytes, limits: Limits, line_number: int):
+    """Panic if a state entry exceeds the key and value size limits"""
+    if len(key) > limits.max_key_size:
+        raise Panic(f"key too long: length was {len(key)}, maximum is {limits.max_key_size}", line_number)
+    if isinstance(value, bytes) and len(key) + len(value) > limits.max_key_value_size:
+        raise Panic(
+            f"key/value total too long: length was {len(key) + len(value)}, maximum is {limits.max_key_value_size}",
+            line_number,
+        )
+
+
+def ed25519_verify(data: bytes, signature: bytes, public_key: bytes) -> bool:
+    """Check if signature is a valid ed25519 signature of data made with the key public_key"""
+    try:
+        VerifyKey(public_key).verify(data, signature)
+    except BadSignatureError:
+        return False
+    return True
+
+
 def eval_teal(  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
-    lines: list[str] | str,
+    lines: list[str] | str | Program,
     return_stack=True,
     context: EvalContext | None = None,
     debug: IO | None = None,
+    *,
+    hooks: Hooks | None = None,
+    checkpoints: Checkpoints | None = None,
+    resume: Checkpoint | None = None,
+    max_steps: int | None = None,
 ) -> tuple[list, list]:
     """
     Simulate a basic teal program.
 
     Args:
-        lines: list of TEAL program lines or compiled program string
+        lines: list of TEAL program lines, compiled program string or a decoded Program
         return_stack: whenther "return" opcode shall return the whole stack, not just the value on top
             This is useful in validating if custom TEAL code produces correct amount of values on stack.
             Moreover, with pyteal v0.8 every compiled program has a "return" at the end,
             this would prevent checking contents of the stack once an algorithm finishes executing.
         context: execution context for the program (this will be updated, should state modification occour)
+            The cost of executed operations is added to context.cost.
         debug: descriptor to write to after each program step. Current line as well as
             stack contents before the operation are reported.
+        hooks: instrumentation called on operations, branches, subroutine calls, state writes and logs.
+            When not given no calls are made.
+        checkpoints: collects checkpoints of the evaluation state taken every checkpoints.interval operations.
+            A checkpoint is also taken when the evaluation is stopped by max_steps.
+        resume: checkpoint of the same program to continue the evaluation from,
+            the context (if any) is restored to the state it had at the checkpoint.
+        max_steps: stop the evaluation after executing this many operations (counted from resume)
 
     Returns:
         tuple of (stack, slots)
     """
-    if isinstance(lines, str):
-        lines = lines.splitlines()
-    if not isinstance(lines, list):
-        raise TypeError("lines must be a list of strings or a string")
+    mode = context.mode if context is not None else Mode.Application
+    program = lines if isinstance(lines, Program) else Program(lines, mode)
+    if context is not None and program.mode != context.mode:
+        raise EvaluatorError(f"{program.mode.name} program can't be evaluated in {context.mode.name} mode", 0)
+    budget = context.budget if context is not None else default_budget(program.mode)
+    if budget is None:
+        budget = INTEGER_SIZE  # effectively unlimited
+    instructions = program.instructions
+    branch_targets = program.branch_targets
+
+    limits = context.limits if context is not None else DEFAULT_LIMITS
 
     stack: list[int | bytes] = []
     call_stack: list[Frame] = []
     slots: list[int | bytes] = [0 for _ in range(256)]
-    branch_targets = {
-        line[:-1]: nr  # strip trailing ":" from key, ex. b11: -> b11
-        for nr, line in enumerate(lines)
-        if line and line[-1] == ":"
-    }
 
     current_line = 0
     op = "eval_teal__empty_opcode"  # current opcode
+    cost = 0
+    step = 0  # number of executed operations
+    if resume is not None:
+        resume.restore(context)
+        stack = resume.stack.copy()
+        slots = resume.slots.copy()
+        call_stack = [replace(frame) for frame in resume.call_stack]
+        current_line, op, cost, step = resume.line, resume.op, resume.cost, resume.step
+    start_cost = cost
 
-    while current_line < len(lines):
-        line = lines[current_line]
-        current_line += 1
-
-        if debug:
-            print(f"{current_line}: {line} | {stack}", file=debug)
-
-        if line.startswith("#"):
-            continue
-        if not line:
-            continue
-        if line[-1] == ":":
-            continue
-
-        if line == "return":  # ends eval immediately
-            if return_stack:
-                return stack, slots
-            return [stack[-1]], slots
-
-        line_s = line.split()
-        prev_op = op
-        op = line_s[0]
-        args = line_s[1:]
-        res: int | bytes  # defined here to satisfy mypy
-        x: int | bytes  # defined here to satisfy mypy
-        if op == "err":
-            raise Panic("Encountered error opcode", current_line)
-        if op == "dup":
-            stack.append(stack[-1])
-        elif op == "dup2":
-            stack.extend((stack[-2], stack[-1]))
-        elif op == "pop":
-            stack.pop()
-        elif op == "mulw":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            ab = a * b
-            stack.extend(split128(ab))
-        elif op == "addw":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            ab = a + b
-            stack.extend(split128(ab))
-        elif op == "bitlen":
-            a = stack.pop()
-            if isinstance(a, bytes):
-                a = int.from_bytes(a, "big")
-            stack.append(a.bit_length())
-        elif op == "divmodw":
-            divisor_lo = stack.pop()
-            divisor_hi = stack.pop()
-            dividend_lo = stack.pop()
-            dividend_hi = stack.pop()
-            if (
-                not isinstance(divisor_lo, int)
-                or not isinstance(divisor_hi, int)
-                or not isinstance(dividend_lo, int)
-                or not isinstance(dividend_hi, int)
-            ):
-                raise Panic("Invalid type", current_line)
-            divisor = divisor_lo + divisor_hi * INTEGER_SIZE
-            dividend = dividend_lo + dividend_hi * INTEGER_SIZE
-            quotient = dividend // divisor
-            remainder = dividend % divisor
-            stack.extend(split128(quotient))
-            stack.extend(split128(remainder))
-        elif op == "|":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(a | b)
-        elif op == "&":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(a & b)
-        elif op == "^":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(a ^ b)
-        elif op == "~":
-            a = stack.pop()
-            if not isinstance(a, int):
-                raise Panic("Invalid type", current_line)
-            x = (INTEGER_SIZE - 1) ^ a
-            stack.append(x)
-        elif op == "shl":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(a << b % 2**64)
-        elif op == "shr":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(a >> b)
-        elif op == "sqrt":
-            a = stack.pop()
-            if not isinstance(a, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(isqrt(a))
-        elif op == "exp":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if a**b > INTEGER_SIZE:
-                raise Panic("Overflow", current_line)
-            if a == 0 and b == 0:
-                raise Panic("Invalid input", current_line)
-            stack.append(a**b)
-        elif op == "assert":
-            a = stack.pop()
-            if not isinstance(a, int):
-                raise Panic("Invalid type", current_line)
-            if a == 0:
-                raise AssertionFailed(current_line)
-        elif op == "/":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if not b:
-                raise Panic("Division by zero", current_line)
-            x = a // b
-            stack.append(x)
-        elif op == "%":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if not b:
-                raise Panic("Division by zero", current_line)
-            x = a % b
-            stack.append(x)
-        elif op == "!":
-            a = stack.pop()
-            if not isinstance(a, int):
-                raise Panic("Invalid type", current_line)
-            x = int(not a)
-            stack.append(x)
-        elif op == "+":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if a + b >= INTEGER_SIZE:
-                raise Panic("Overflow", current_line)
-            x = a + b
-            stack.append(x)
-        elif op == "-":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if a - b < 0:
-                raise Panic("Underflow", current_line)
-            x = a - b
-            stack.append(x)
-        elif op == "*":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if a * b >= INTEGER_SIZE:
-                raise Panic("Overflow", current_line)
-            x = a * b
-            stack.append(x)
-        elif op == "&&":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if a and b:
-                stack.append(1)
-            else:
-                stack.append(0)
-        elif op == "||":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if a or b:
-                stack.append(1)
-            else:
-                stack.append(0)
-        elif op == ">":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(int(bool(a > b)))
-        elif op == ">=":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(int(bool(a >= b)))
-        elif op == "<":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(int(bool(a < b)))
-        elif op == "<=":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(int(bool(a <= b)))
-        elif op == "==":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            stack.append(int(bool(a == b)))
-        elif op == "!=":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            stack.append(int(bool(a != b)))
-        elif op == "b+":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int_to_trimmed_bytes(int.from_bytes(a, "big") + int.from_bytes(b, "big")))
-        elif op == "b-":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            if int.from_bytes(a, "big") - int.from_bytes(b, "big") < 0:
-                raise Panic("Underflow", current_line)
-            stack.append(int_to_trimmed_bytes(int.from_bytes(a, "big") - int.from_bytes(b, "big")))
-        elif op == "b/":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            if int.from_bytes(b, "big") == 0:
-                raise Panic("Division by 0", current_line)
-            stack.append(int_to_trimmed_bytes(int.from_bytes(a, "big") // int.from_bytes(b, "big")))
-        elif op == "b*":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int_to_trimmed_bytes(int.from_bytes(a, "big") * int.from_bytes(b, "big")))
-        elif op == "b==":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int(bool(int.from_bytes(a, "big") == int.from_bytes(b, "big"))))
-        elif op == "b!=":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int(bool(int.from_bytes(a, "big") != int.from_bytes(b, "big"))))
-        elif op == "b<":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int(bool(int.from_bytes(a, "big") < int.from_bytes(b, "big"))))
-        elif op == "b<=":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int(bool(int.from_bytes(a, "big") <= int.from_bytes(b, "big"))))
-        elif op == "b>":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int(bool(int.from_bytes(a, "big") > int.from_bytes(b, "big"))))
-        elif op == "b>=":
-            b = stack.pop()
-            a = stack.pop()
-            if type(a) is not type(b):
-                raise Panic("Type mismatch", current_line)
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64 or len(b) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int(bool(int.from_bytes(a, "big") >= int.from_bytes(b, "big"))))
-        elif op == "bsqrt":
-            a = stack.pop()
-            if not isinstance(a, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) > 64:
-                raise Panic("Bytes overflow", current_line)
-            stack.append(int_to_trimmed_bytes(isqrt(int.from_bytes(a, "big"))))
-        elif op == "divw":
-            c = stack.pop()
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int) or not isinstance(b, int) or not isinstance(c, int):
-                raise Panic("All arguments to divw must be integers", current_line)
-            res = (a * INTEGER_SIZE + b) // c
-            if res >= INTEGER_SIZE:
-                raise Panic("Division overflow", current_line)
-            stack.append(res)
-        elif op == "bzero":
-            a = stack.pop()
-            if not isinstance(a, int):
-                raise Panic("Invalid type", current_line)
-            if a > MaxStringSize:
-                raise Panic("Produced byte array would be too long", current_line)
-            stack.append(b"\x00" * a)
-        elif op == "select":
-            c = stack.pop()
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(c, int):
-                raise Panic("Invalid types", current_line)
-            if c != 0:
-                stack.append(b)
-            else:
-                stack.append(a)
-        elif op == "swap":
-            b = stack.pop()
-            a = stack.pop()
-            stack.append(b)
-            stack.append(a)
-        elif op == "app_global_get":
-            key = stack.pop()
-            if context is None:
-                raise EvaluatorError("app_global_get requires execution environment context", current_line)
-            if not isinstance(key, bytes):
-                raise Panic("app_global_get key must be a bytes value", current_line)
-            val = context.global_state.get(key, 0)
-            stack.append(val)
-        elif op == "app_global_get_ex":
-            key = stack.pop()
-            app = stack.pop()
-            if context is None:
-                raise EvaluatorError("app_global_get_ex requires execution environment context", current_line)
-            if app != 0:
-                raise EvaluatorError("Accessing other app's global state is unsupported", current_line)
-            if not isinstance(key, bytes):
-                raise Panic("app_global_get_ex key must be a bytes value", current_line)
-            val = context.global_state.get(key, 0)
-            exists = int(key in context.global_state)
-            stack.append(val)
-            stack.append(exists)
-        elif op == "app_global_put":
-            b = stack.pop()
-            a = stack.pop()
-            if context is None:
-                raise EvaluatorError("app_global_put requires execution environment context", current_line)
-            if not isinstance(a, bytes):
-                raise Panic("app_global_put key must be a bytes value", current_line)
-            context.global_state[a] = b
-            if len(context.global_state) > MaxGlobalStateSize:
-                raise Panic("Global state size exceeded", current_line)
-        elif op == "app_local_get":
-            b = stack.pop()
-            a = stack.pop()
-            if context is None:
-                raise EvaluatorError("app_local_get requires execution environment context", current_line)
-            if a != 0:
-                raise EvaluatorError(
-                    "app_local_get is only supported with 0 as the account parameter",
-                    current_line,
-                )
-            if not isinstance(b, bytes):
-                raise Panic("app_local_get key must be a bytes value", current_line)
-            stack.append(context.local_state.get(b, 0))
-        elif op == "app_local_get_ex":
-            key = stack.pop()
-            app = stack.pop()
-            account = stack.pop()
-            if context is None:
-                raise EvaluatorError("app_local_get_ex requires execution environment context", current_line)
-            if app != 0 or account != 0:
-                raise EvaluatorError(
-                    "app_local_get_ex is only supported with 0 as the account and application parameter", current_line
-                )
-            if not isinstance(key, bytes):
-                raise Panic("app_local_get_ex key must be a bytes value", current_line)
-            val = context.local_state.get(key, 0)
-            exists = int(key in context.local_state)
-            stack.append(val)
-            stack.append(exists)
-        elif op == "app_local_put":
-            c = stack.pop()
-            b = stack.pop()
-            a = stack.pop()
-            if context is None:
-                raise EvaluatorError("app_local_put requires execution environment context", current_line)
-            if a != 0:
-                raise Panic(
-                    "app_local_put is only supported with 0 as the account parameter",
-                    current_line,
-                )
-            if not isinstance(b, bytes):
-                raise Panic("app_local_put key must be a bytes value", current_line)
-            context.local_state[b] = c
-            if len(context.local_state) > MaxLocalStateSize:
-                raise Panic("Local state size exceeded", current_line)
-        elif op == "log":
-            val = stack.pop()
-            if not isinstance(val, bytes):
-                raise Panic("log requires bytes value", current_line)
-            if context is None:
-                raise EvaluatorError("log requires execution environment context", current_line)
-            context.log.append(val)
-            if sum(len(log) for log in context.log) > MaxLogSize:
-                raise Panic("log size limit exceeded", current_line)
-            if len(context.log) > MaxLogCalls:
-                raise Panic("log calls limit exceeded", current_line)
-        elif op == "len":
-            val = stack.pop()
-            if not isinstance(val, bytes):
-                raise Panic("len requires bytes value", current_line)
-            stack.append(len(val))
-        elif op == "itob":
-            val = stack.pop()
-            if not isinstance(val, int):
-                raise Panic("itob requires integer value", current_line)
-            val = val.to_bytes(8, "big")
-            stack.append(val)
-        elif op == "btoi":
-            val = stack.pop()
-            if not isinstance(val, bytes):
-                raise Panic("btoi requires bytes value", current_line)
-            if len(val) > 8:
-                raise Panic("btoi requires bytes of length 8 or less", current_line)
-            val = int.from_bytes(val, "big")
-            stack.append(val)
-        elif op == "concat":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if len(a) + len(b) > MaxStringSize:
-                raise Panic("Produced byte array is too long", current_line)
-            stack.append(a + b)
-        elif op == "extract3":
-            c = stack.pop()
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, bytes) or not isinstance(b, int) or not isinstance(c, int):
-                raise Panic("Invalid type", current_line)
-            stack.append(a[b : b + c])
-        elif op == "extract":
-            a = stack.pop()
-            start = int(args[0])
-            length = int(args[1])
-            if not isinstance(a, bytes):
-                raise Panic("Invalid type", current_line)
-            if start < 0 or length < 0 or start + length > len(a):
-                raise Panic("Invalid slice", current_line)
-            stack.append(a[start : start + length])
-        elif op == "extract_uint16":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, bytes) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if b + 2 > len(a):
-                raise Panic("Out of bounds", current_line)
-            stack.append(int.from_bytes(a[b : b + 2], "big"))
-        elif op == "extract_uint32":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, bytes) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if b + 4 > len(a):
-                raise Panic("Out of bounds", current_line)
-            stack.append(int.from_bytes(a[b : b + 4], "big"))
-        elif op == "extract_uint64":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, bytes) or not isinstance(b, int):
-                raise Panic("Invalid type", current_line)
-            if b + 8 > len(a):
-                raise Panic("Out of bounds", current_line)
-            stack.append(int.from_bytes(a[b : b + 8], "big"))
-        elif op == "replace2":
-            start_position = int(args[0])
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, bytes) or not isinstance(b, bytes):
-                raise Panic("Invalid type", current_line)
-            if start_position + len(b) > len(a):
-                raise Panic("Out of bounds", current_line)
-            res = a[:start_position] + b + a[start_position + len(b) :]
-            stack.append(res)
-        elif op == "replace3":
-            c = stack.pop()
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, bytes) or not isinstance(b, int) or not isinstance(c, bytes):
-                raise Panic("Invalid type", current_line)
-            if b + len(c) > len(a):
-                raise Panic("Out of bounds", current_line)
-            res = a[:b] + c + a[b + len(c) :]
-            stack.append(res)
-        # provisional support for txna
-        elif op == "txna":
-            if context is None:
-                raise EvaluatorError("txna requires execution environment context", current_line)
-            if context.txn is None:
-                raise EvaluatorError("txna requires app call txn to be specified in EvalContext", current_line)
-            if args[0] == "ApplicationArgs":
-                arg_index = int(args[1])
-                if arg_index > len(context.txn.app_args):
-                    raise Panic("txna ApplicationArgs index out of bounds", current_line)
-                stack.append(context.txn.app_args[arg_index])
-            else:
-                raise EvaluatorError("Unsupported txna expression", current_line)
-        elif op == "addr":
-            arg = args[0]
-            stack.append(decode_address(arg))
-        elif op == "byte":
-            arg = line[5:]
-            if arg[0] == '"' and arg[-1] == '"':
-                arg = arg[1:-1]  # strip quotes
-                encoded = arg.encode("utf-8")
-            elif arg.startswith("0x"):
-                arg = arg[2:]
-                encoded = bytes.fromhex(arg)
-            else:
-                raise Panic("byte requires string or hex value", current_line)
-            stack.append(encoded)
-        elif op == "int":
-            x = int(args[0])
-            if x < 0 or x >= INTEGER_SIZE:
+    last_step = step + max_steps if max_steps is not None else INTEGER_SIZE
+    next_checkpoint = step if checkpoints is not None else INTEGER_SIZE
+    next_stop = min(next_checkpoint, last_step)  # step at which the loop has to take a checkpoint or stop
+
+    try:
+        while current_line < len(instructions):
+            instruction = instructions[current_line]
+            line = instruction.line
+            current_line += 1
+
+            if debug:
+                print(f"{current_line}: {line} | {stack}", file=debug)
+
+            if not instruction.op:
+                continue
+            if step == next_stop:
+                if checkpoints is not None:
+                    checkpoints.items.append(
+                        Checkpoint.take(
+                            step,
+                            current_line - 1,
+                            stack,
+                            slots,
+                            call_stack,
+                            op=op,
+                            cost=cost,
+                            context=context,
+                            context_cost=context.cost + cost - start_cost if context is not None else 0,
+                        )
+                    )
+                    next_checkpoint = step + checkpoints.interval
+                if step == last_step:
+                    return stack, slots
+                next_stop = min(next_checkpoint, last_step)
+            step += 1
+            cost += instruction.cost
+            if instruction.cost_by_length:
+                cost += length_cost(instruction.op, stack)
+            if cost > budget:
                 raise Panic(
-                    f"int expects non-negative integer smaller than {INTEGER_SIZE} (actual={x})",
-                    current_line,
+                    f"dynamic cost budget exceeded, executing {line}: cost {cost} > budget {budget}", current_line
                 )
-            stack.append(x)
-        elif op == "bnz":
-            cond = stack.pop()
-            if cond != 0:
+            if hooks is not None:
+                hooks.on_op(current_line, instruction.op, stack)
+
+            if line == "return":  # ends eval immediately
+                if return_stack:
+                    return stack, slots
+                return [stack[-1]], slots
+
+            prev_op = op
+            op = instruction.op
+            args = instruction.args
+            res: int | bytes  # defined here to satisfy mypy
+            x: int | bytes  # defined here to satisfy mypy
+            if op == "err":
+                raise Panic("Encountered error opcode", current_line)
+            if op == "dup":
+                stack.append(stack[-1])
+            elif op == "dup2":
+                stack.extend((stack[-2], stack[-1]))
+            elif op == "pop":
+                stack.pop()
+            elif op == "mulw":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                ab = a * b
+                stack.extend(split128(ab))
+            elif op == "addw":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                ab = a + b
+                stack.extend(split128(ab))
+            elif op == "bitlen":
+                a = stack.pop()
+                if isinstance(a, bytes):
+                    a = int.from_bytes(a, "big")
+                stack.append(a.bit_length())
+            elif op == "divmodw":
+                divisor_lo = stack.pop()
+                divisor_hi = stack.pop()
+                dividend_lo = stack.pop()
+                dividend_hi = stack.pop()
+                if (
+                    not isinstance(divisor_lo, int)
+                    or not isinstance(divisor_hi, int)
+                    or not isinstance(dividend_lo, int)
+                    or not isinstance(dividend_hi, int)
+                ):
+                    raise Panic("Invalid type", current_line)
+                divisor = divisor_lo + divisor_hi * INTEGER_SIZE
+                dividend = dividend_lo + dividend_hi * INTEGER_SIZE
+                quotient = dividend // divisor
+                remainder = dividend % divisor
+                stack.extend(split128(quotient))
+                stack.extend(split128(remainder))
+            elif op == "|":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(a | b)
+            elif op == "&":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(a & b)
+            elif op == "^":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(a ^ b)
+            elif op == "~":
+                a = stack.pop()
+                if not isinstance(a, int):
+                    raise Panic("Invalid type", current_line)
+                x = (INTEGER_SIZE - 1) ^ a
+                stack.append(x)
+            elif op == "shl":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if b > 63:
+                    raise Panic(f"shl arg too big, ({b})", current_line)
+                stack.append((a << b) & (INTEGER_SIZE - 1))
+            elif op == "shr":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if b > 63:
+                    raise Panic(f"shr arg too big, ({b})", current_line)
+                stack.append(a >> b)
+            elif op == "sqrt":
+                a = stack.pop()
+                if not isinstance(a, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(isqrt(a))
+            elif op == "exp":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if a**b > INTEGER_SIZE:
+                    raise Panic("Overflow", current_line)
+                if a == 0 and b == 0:
+                    raise Panic("Invalid input", current_line)
+                stack.append(a**b)
+            elif op == "assert":
+                a = stack.pop()
+                if not isinstance(a, int):
+                    raise Panic("Invalid type", current_line)
+                if a == 0:
+                    raise AssertionFailed(current_line)
+            elif op == "/":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if not b:
+                    raise Panic("Division by zero", current_line)
+                x = a // b
+                stack.append(x)
+            elif op == "%":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if not b:
+                    raise Panic("Division by zero", current_line)
+                x = a % b
+                stack.append(x)
+            elif op == "!":
+                a = stack.pop()
+                if not isinstance(a, int):
+                    raise Panic("Invalid type", current_line)
+                x = int(not a)
+                stack.append(x)
+            elif op == "+":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if a + b >= INTEGER_SIZE:
+                    raise Panic("Overflow", current_line)
+                x = a + b
+                stack.append(x)
+            elif op == "-":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if a - b < 0:
+                    raise Panic("Underflow", current_line)
+                x = a - b
+                stack.append(x)
+            elif op == "*":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if a * b >= INTEGER_SIZE:
+                    raise Panic("Overflow", current_line)
+                x = a * b
+                stack.append(x)
+            elif op == "&&":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if a and b:
+                    stack.append(1)
+                else:
+                    stack.append(0)
+            elif op == "||":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if a or b:
+                    stack.append(1)
+                else:
+                    stack.append(0)
+            elif op == ">":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(int(bool(a > b)))
+            elif op == ">=":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(int(bool(a >= b)))
+            elif op == "<":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(int(bool(a < b)))
+            elif op == "<=":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                stack.append(int(bool(a <= b)))
+            elif op == "==":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                stack.append(int(bool(a == b)))
+            elif op == "!=":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                stack.append(int(bool(a != b)))
+            elif op == "b+":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int_to_trimmed_bytes(int.from_bytes(a, "big") + int.from_bytes(b, "big")))
+            elif op == "b-":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                difference = int.from_bytes(a, "big") - int.from_bytes(b, "big")
+                if difference < 0:
+                    raise Panic("Underflow", current_line)
+                stack.append(int_to_trimmed_bytes(difference))
+            elif op == "b/":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                divisor = int.from_bytes(b, "big")
+                if divisor == 0:
+                    raise Panic("Division by 0", current_line)
+                stack.append(int_to_trimmed_bytes(int.from_bytes(a, "big") // divisor))
+            elif op == "b*":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int_to_trimmed_bytes(int.from_bytes(a, "big") * int.from_bytes(b, "big")))
+            elif op == "b==":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int(bool(int.from_bytes(a, "big") == int.from_bytes(b, "big"))))
+            elif op == "b!=":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int(bool(int.from_bytes(a, "big") != int.from_bytes(b, "big"))))
+            elif op == "b<":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int(bool(int.from_bytes(a, "big") < int.from_bytes(b, "big"))))
+            elif op == "b<=":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int(bool(int.from_bytes(a, "big") <= int.from_bytes(b, "big"))))
+            elif op == "b>":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int(bool(int.from_bytes(a, "big") > int.from_bytes(b, "big"))))
+            elif op == "b>=":
+                b = stack.pop()
+                a = stack.pop()
+                if type(a) is not type(b):
+                    raise Panic("Type mismatch", current_line)
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64 or len(b) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int(bool(int.from_bytes(a, "big") >= int.from_bytes(b, "big"))))
+            elif op in ("b|", "b&", "b^"):
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                # the shorter operand is zero-extended on the left
+                size = max(len(a), len(b))
+                x, y = int.from_bytes(a, "big"), int.from_bytes(b, "big")
+                if op == "b|":
+                    res = x | y
+                elif op == "b&":
+                    res = x & y
+                else:
+                    res = x ^ y
+                stack.append(res.to_bytes(size, "big"))
+            elif op == "b~":
+                a = stack.pop()
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                stack.append(bytes(~byte & 0xFF for byte in a))
+            elif op == "bsqrt":
+                a = stack.pop()
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) > 64:
+                    raise Panic("Bytes overflow", current_line)
+                stack.append(int_to_trimmed_bytes(isqrt(int.from_bytes(a, "big"))))
+            elif op == "divw":
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int) or not isinstance(b, int) or not isinstance(c, int):
+                    raise Panic("All arguments to divw must be integers", current_line)
+                res = (a * INTEGER_SIZE + b) // c
+                if res >= INTEGER_SIZE:
+                    raise Panic("Division overflow", current_line)
+                stack.append(res)
+            elif op == "sha256":
+                a = stack.pop()
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                stack.append(hashlib.sha256(a).digest())
+            elif op == "sha3_256":
+                a = stack.pop()
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                stack.append(hashlib.sha3_256(a).digest())
+            elif op == "sha512_256":
+                a = stack.pop()
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                stack.append(checksum(a))
+            elif op == "keccak256":
+                a = stack.pop()
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                stack.append(keccak.new(data=a, digest_bits=256).digest())
+            elif op in ("ed25519verify", "ed25519verify_bare"):
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, bytes) or not isinstance(c, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(c) != 32:
+                    raise Panic("invalid public key", current_line)
+                if len(b) != 64:
+                    raise Panic("invalid signature", current_line)
+                if op == "ed25519verify":
+                    if context is None or context.program_hash is None:
+                        raise EvaluatorError(
+                            "ed25519verify requires program_hash to be specified in EvalContext", current_line
+                        )
+                    a = b"ProgData" + context.program_hash + a
+                stack.append(int(ed25519_verify(a, b, c)))
+            elif op == "base64_decode":
+                a = stack.pop()
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                stack.append(base64_decode(a, args[0], current_line))
+            elif op == "bzero":
+                a = stack.pop()
+                if not isinstance(a, int):
+                    raise Panic("Invalid type", current_line)
+                if a > limits.max_string_size:
+                    raise Panic("Produced byte array would be too long", current_line)
+                stack.append(b"\x00" * a)
+            elif op == "select":
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(c, int):
+                    raise Panic("Invalid types", current_line)
+                if c != 0:
+                    stack.append(b)
+                else:
+                    stack.append(a)
+            elif op == "swap":
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(b)
+                stack.append(a)
+            elif op == "app_global_get":
+                key = stack.pop()
+                if context is None:
+                    raise EvaluatorError("app_global_get requires execution environment context", current_line)
+                if not isinstance(key, bytes):
+                    raise Panic("app_global_get key must be a bytes value", current_line)
+                val = context.global_state.get(key, 0)
+                stack.append(val)
+            elif op == "app_global_get_ex":
+                key = stack.pop()
+                app = stack.pop()
+                if context is None:
+                    raise EvaluatorError("app_global_get_ex requires execution environment context", current_line)
+                if app != 0:
+                    raise EvaluatorError("Accessing other app's global state is unsupported", current_line)
+                if not isinstance(key, bytes):
+                    raise Panic("app_global_get_ex key must be a bytes value", current_line)
+                val = context.global_state.get(key, 0)
+                exists = int(key in context.global_state)
+                stack.append(val)
+                stack.append(exists)
+            elif op == "app_global_put":
+                b = stack.pop()
+                a = stack.pop()
+                if context is None:
+                    raise EvaluatorError("app_global_put requires execution environment context", current_line)
+                if not isinstance(a, bytes):
+                    raise Panic("app_global_put key must be a bytes value", current_line)
+                previous = context.global_state.get(a)
+                if previous is None and len(context.global_state) >= limits.max_global_state_size:
+                    raise Panic("Global state size exceeded", current_line)
+                check_state_entry(a, b, limits, current_line)
+                if hooks is not None:
+                    hooks.on_state_write(current_line, a, b, False)
+                context.global_state[a] = b
+            elif op == "app_local_get":
+                b = stack.pop()
+                a = stack.pop()
+                if context is None:
+                    raise EvaluatorError("app_local_get requires execution environment context", current_line)
+                if a != 0:
+                    raise EvaluatorError(
+                        "app_local_get is only supported with 0 as the account parameter",
+                        current_line,
+                    )
+                if not isinstance(b, bytes):
+                    raise Panic("app_local_get key must be a bytes value", current_line)
+                stack.append(context.local_state.get(b, 0))
+            elif op == "app_local_get_ex":
+                key = stack.pop()
+                app = stack.pop()
+                account = stack.pop()
+                if context is None:
+                    raise EvaluatorError("app_local_get_ex requires execution environment context", current_line)
+                if app != 0 or account != 0:
+                    raise EvaluatorError(
+                        "app_local_get_ex is only supported with 0 as the account and application parameter",
+                        current_line,
+                    )
+                if not isinstance(key, bytes):
+                    raise Panic("app_local_get_ex key must be a bytes value", current_line)
+                val = context.local_state.get(key, 0)
+                exists = int(key in context.local_state)
+                stack.append(val)
+                stack.append(exists)
+            elif op == "app_local_put":
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if context is None:
+                    raise EvaluatorError("app_local_put requires execution environment context", current_line)
+                if a != 0:
+                    raise Panic(
+                        "app_local_put is only supported with 0 as the account parameter",
+                        current_line,
+                    )
+                if not isinstance(b, bytes):
+                    raise Panic("app_local_put key must be a bytes value", current_line)
+                previous = context.local_state.get(b)
+                if previous is None and len(context.local_state) >= limits.max_local_state_size:
+                    raise Panic("Local state size exceeded", current_line)
+                check_state_entry(b, c, limits, current_line)
+                if hooks is not None:
+                    hooks.on_state_write(current_line, b, c, True)
+                context.local_state[b] = c
+            elif op == "log":
+                val = stack.pop()
+                if not isinstance(val, bytes):
+                    raise Panic("log requires bytes value", current_line)
+                if context is None:
+                    raise EvaluatorError("log requires execution environment context", current_line)
+                if context.log_size + len(val) > limits.max_log_size:
+                    raise Panic("log size limit exceeded", current_line)
+                if len(context.log) >= limits.max_log_calls:
+                    raise Panic("log calls limit exceeded", current_line)
+                if hooks is not None:
+                    hooks.on_log(current_line, val)
+                context.log.append(val)
+                context.log_size += len(val)
+            elif op == "len":
+                val = stack.pop()
+                if not isinstance(val, bytes):
+                    raise Panic("len requires bytes value", current_line)
+                stack.append(len(val))
+            elif op == "itob":
+                val = stack.pop()
+                if not isinstance(val, int):
+                    raise Panic("itob requires integer value", current_line)
+                val = val.to_bytes(8, "big")
+                stack.append(val)
+            elif op == "btoi":
+                val = stack.pop()
+                if not isinstance(val, bytes):
+                    raise Panic("btoi requires bytes value", current_line)
+                if len(val) > 8:
+                    raise Panic("btoi requires bytes of length 8 or less", current_line)
+                val = int.from_bytes(val, "big")
+                stack.append(val)
+            elif op == "concat":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if len(a) + len(b) > limits.max_string_size:
+                    raise Panic("Produced byte array is too long", current_line)
+                stack.append(a + b)
+            elif op == "extract3":
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, int) or not isinstance(c, int):
+                    raise Panic("Invalid type", current_line)
+                if b + c > len(a):
+                    raise Panic("Invalid slice", current_line)
+                stack.append(a[b : b + c])
+            elif op == "extract":
+                a = stack.pop()
+                start = int(args[0])
+                length = int(args[1])
+                if not isinstance(a, bytes):
+                    raise Panic("Invalid type", current_line)
+                if start < 0 or length < 0 or start + length > len(a):
+                    raise Panic("Invalid slice", current_line)
+                stack.append(a[start : start + length])
+            elif op == "extract_uint16":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if b + 2 > len(a):
+                    raise Panic("Out of bounds", current_line)
+                stack.append(UINT16.unpack_from(a, b)[0])
+            elif op == "extract_uint32":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if b + 4 > len(a):
+                    raise Panic("Out of bounds", current_line)
+                stack.append(UINT32.unpack_from(a, b)[0])
+            elif op == "extract_uint64":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if b + 8 > len(a):
+                    raise Panic("Out of bounds", current_line)
+                stack.append(UINT64.unpack_from(a, b)[0])
+            elif op == "getbyte":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if b >= len(a):
+                    raise Panic("Out of bounds", current_line)
+                stack.append(a[b])
+            elif op == "setbyte":
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, int) or not isinstance(c, int):
+                    raise Panic("Invalid type", current_line)
+                if b >= len(a):
+                    raise Panic("Out of bounds", current_line)
+                if c > 255:
+                    raise Panic(f"setbyte value {c} > 255", current_line)
+                stack.append(replace_bytes(a, b, bytes((c,))))
+            elif op == "getbit":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(b, int):
+                    raise Panic("Invalid type", current_line)
+                if isinstance(a, int):
+                    if b > 63:
+                        raise Panic("Out of bounds", current_line)
+                    stack.append((a >> b) & 1)
+                else:
+                    # bit 0 of a byte array is the leftmost bit of its first byte
+                    if b >= len(a) * 8:
+                        raise Panic("Out of bounds", current_line)
+                    stack.append((a[b >> 3] >> (7 - (b & 7))) & 1)
+            elif op == "setbit":
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(b, int) or not isinstance(c, int):
+                    raise Panic("Invalid type", current_line)
+                if c > 1:
+                    raise Panic(f"setbit value {c} > 1", current_line)
+                if isinstance(a, int):
+                    if b > 63:
+                        raise Panic("Out of bounds", current_line)
+                    stack.append(a | (1 << b) if c else a & ~(1 << b))
+                else:
+                    if b >= len(a) * 8:
+                        raise Panic("Out of bounds", current_line)
+                    mask = 1 << (7 - (b & 7))
+                    byte = a[b >> 3] | mask if c else a[b >> 3] & ~mask
+                    stack.append(replace_bytes(a, b >> 3, bytes((byte,))))
+            elif op == "replace2":
+                start_position = int(args[0])
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, bytes):
+                    raise Panic("Invalid type", current_line)
+                if start_position + len(b) > len(a):
+                    raise Panic("Out of bounds", current_line)
+                stack.append(replace_bytes(a, start_position, b))
+            elif op == "replace3":
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, bytes) or not isinstance(b, int) or not isinstance(c, bytes):
+                    raise Panic("Invalid type", current_line)
+                if b + len(c) > len(a):
+                    raise Panic("Out of bounds", current_line)
+                stack.append(replace_bytes(a, b, c))
+            elif op in ("arg", "arg_0", "arg_1", "arg_2", "arg_3"):
+                if context is None:
+                    raise EvaluatorError(f"{op} requires execution environment context", current_line)
+                arg_index = int(args[0]) if op == "arg" else int(op[-1])
+                if arg_index >= len(context.args):
+                    raise Panic(f"{op} index {arg_index} out of bounds", current_line)
+                stack.append(context.args[arg_index])
+            elif op == "args":
+                a = stack.pop()
+                if context is None:
+                    raise EvaluatorError("args requires execution environment context", current_line)
+                if not isinstance(a, int):
+                    raise Panic("Invalid type", current_line)
+                if a >= len(context.args):
+                    raise Panic(f"args index {a} out of bounds", current_line)
+                stack.append(context.args[a])
+            # provisional support for txna
+            elif op == "txna":
+                if context is None:
+                    raise EvaluatorError("txna requires execution environment context", current_line)
+                if context.txn is None:
+                    raise EvaluatorError("txna requires app call txn to be specified in EvalContext", current_line)
+                if args[0] == "ApplicationArgs":
+                    arg_index = int(args[1])
+                    if arg_index > len(context.txn.app_args):
+                        raise Panic("txna ApplicationArgs index out of bounds", current_line)
+                    stack.append(context.txn.app_args[arg_index])
+                else:
+                    raise EvaluatorError("Unsupported txna expression", current_line)
+            elif op == "addr":
+                arg = args[0]
+                stack.append(decode_address(arg))
+            elif op == "byte":
+                arg = line[5:]
+                if arg[0] == '"' and arg[-1] == '"':
+                    arg = arg[1:-1]  # strip quotes
+                    encoded = arg.encode("utf-8")
+                elif arg.startswith("0x"):
+                    arg = arg[2:]
+                    encoded = bytes.fromhex(arg)
+                else:
+                    raise Panic("byte requires string or hex value", current_line)
+                stack.append(encoded)
+            elif op == "int":
+                x = int(args[0])
+                if x < 0 or x >= INTEGER_SIZE:
+                    raise Panic(
+                        f"int expects non-negative integer smaller than {INTEGER_SIZE} (actual={x})",
+                        current_line,
+                    )
+                stack.append(x)
+            elif op == "bnz":
+                cond = stack.pop()
+                if cond != 0:
+                    if hooks is not None:
+                        hooks.on_branch(current_line, branch_targets[args[0]] + 1)
+                    current_line = branch_targets[args[0]]
+            elif op == "bz":
+                cond = stack.pop()
+                if cond == 0:
+                    if hooks is not None:
+                        hooks.on_branch(current_line, branch_targets[args[0]] + 1)
+                    current_line = branch_targets[args[0]]
+            elif op == "b":
+                if hooks is not None:
+                    hooks.on_branch(current_line, branch_targets[args[0]] + 1)
                 current_line = branch_targets[args[0]]
-        elif op == "bz":
-            cond = stack.pop()
-            if cond == 0:
+            elif op == "callsub":
+                if hooks is not None:
+                    hooks.on_callsub(current_line, branch_targets[args[0]] + 1)
+                call_stack.append(Frame(current_line, len(stack)))
                 current_line = branch_targets[args[0]]
-        elif op == "b":
-            current_line = branch_targets[args[0]]
-        elif op == "callsub":
-            call_stack.append(Frame(current_line, len(stack)))
-            current_line = branch_targets[args[0]]
-        elif op == "retsub":
-            if len(call_stack) == 0:
-                raise Panic("retsub with empty call stack", current_line)
-            frame = call_stack.pop()
-            if frame.clear:
-                expect = frame.height + frame.retc
-                if len(stack) < expect:
+            elif op == "retsub":
+                if len(call_stack) == 0:
+                    raise Panic("retsub with empty call stack", current_line)
+                frame = call_stack.pop()
+                if frame.clear:
+                    expect = frame.height + frame.retc
+                    if len(stack) < expect:
+                        raise Panic(
+                            f"retsub with stack size {len(stack)} but expected at least {expect}",
+                            current_line,
+                        )
+                    argstart = frame.height - frame.argc
+                    bottom_stack = stack[:argstart]
+                    returns = stack[frame.height : expect]
+                    stack = bottom_stack + returns
+
+                current_line = frame.ret_line
+            elif op == "proto":
+                if prev_op != "callsub":
+                    raise Panic("proto must only be used after callsub", current_line)
+                if len(stack) < int(args[0]):
                     raise Panic(
-                        f"retsub with stack size {len(stack)} but expected at least {expect}",
+                        f"proto with stack size {len(stack)} but expected at least {args[0]}",
                         current_line,
                     )
-                argstart = frame.height - frame.argc
-                bottom_stack = stack[:argstart]
-                returns = stack[frame.height : expect]
-                stack = bottom_stack + returns
-
-            current_line = frame.ret_line
-        elif op == "proto":
-            if prev_op != "callsub":
-                raise Panic("proto must only be used after callsub", current_line)
-            if len(stack) < int(args[0]):
-                raise Panic(
-                    f"proto with stack size {len(stack)} but expected at least {args[0]}",
-                    current_line,
-                )
-            call_stack[-1].argc = int(args[0])
-            call_stack[-1].retc = int(args[1])
-            call_stack[-1].clear = True
-        elif op in ("frame_dig", "frame_bury"):
-            arg_slot = int(args[0])  # should be negative
-            if len(call_stack) == 0:
-                raise Panic("frame_dig with empty call stack", current_line)
-            frame = call_stack[-1]
-            if frame.clear and -arg_slot > frame.argc:
-                raise Panic(
-                    f"frame_dig with arg_slot {arg_slot} but argc {frame.argc}",
-                    current_line,
-                )
-            index = frame.height + arg_slot
-            if index < 0 or index >= len(stack):
-                raise Panic(
-                    f"index {index} out of stack bounds [0,{len(stack)}]",
-                    current_line,
-                )
-            if op == "frame_dig":
-                stack.append(stack[index])
-            else:  # bury
-                if index == len(stack) - 1:
-                    raise Panic("frame_bury with index on top of stack", current_line)
-                stack[index] = stack.pop()
-        elif op == "cover":
-            nr = int(args[0])
-            top = stack.pop()
-            if nr > len(stack):
-                raise Panic(f"cover {nr} with stack size {len(stack)}", current_line)
-            stack.insert(-nr, top)
-        elif op == "store":
-            i = int(args[0])
-            x = stack.pop()
-            slots[i] = x
-        elif op == "load":
-            i = int(args[0])
-            x = slots[i]
-            stack.append(x)
-        elif op == "stores":
-            b = stack.pop()
-            a = stack.pop()
-            if not isinstance(a, int):
-                raise Panic("stores expects integer slot ID", current_line)
-            slots[a] = b
-        elif op == "loads":
-            a = stack.pop()
-            if not isinstance(a, int):
-                raise Panic("loads expects integer slot ID", current_line)
-            stack.append(slots[a])
-        else:
-            raise EvaluatorError(f"Operation '{line}' is not supported by the simulator", current_line)
-    return stack, slots
+                call_stack[-1].argc = int(args[0])
+                call_stack[-1].retc = int(args[1])
+                call_stack[-1].clear = True
+            elif op in ("frame_dig", "frame_bury"):
+                arg_slot = int(args[0])  # should be negative
+                if len(call_stack) == 0:
+                    raise Panic("frame_dig with empty call stack", current_line)
+                frame = call_stack[-1]
+                if frame.clear and -arg_slot > frame.argc:
+                    raise Panic(
+                        f"frame_dig with arg_slot {arg_slot} but argc {frame.argc}",
+                        current_line,
+                    )
+                index = frame.height + arg_slot
+                if index < 0 or index >= len(stack):
+                    raise Panic(
+                        f"index {index} out of stack bounds [0,{len(stack)}]",
+                        current_line,
+                    )
+                if op == "frame_dig":
+                    stack.append(stack[index])
+                else:  # bury
+                    if index == len(stack) - 1:
+                        raise Panic("frame_bury with index on top of stack", current_line)
+                    stack[index] = stack.pop()
+            elif op == "cover":
+                nr = int(args[0])
+                top = stack.pop()
+                if nr > len(stack):
+                    raise Panic(f"cover {nr} with stack size {len(stack)}", current_line)
+                stack.insert(-nr, top)
+            elif op == "store":
+                i = int(args[0])
+                x = stack.pop()
+                slots[i] = x
+            elif op == "load":
+                i = int(args[0])
+                x = slots[i]
+                stack.append(x)
+            elif op == "stores":
+                b = stack.pop()
+                a = stack.pop()
+                if not isinstance(a, int):
+                    raise Panic("stores expects integer slot ID", current_line)
+                slots[a] = b
+            elif op == "loads":
+                a = stack.pop()
+                if not isinstance(a, int):
+                    raise Panic("loads expects integer slot ID", current_line)
+                stack.append(slots[a])
+            else:
+                raise EvaluatorError(f"Operation '{line}' is not supported by the simulator", current_line)
+        return stack, slots
+    finally:
+        if context is not None:
+            context.cost += cost - start_cost
+        if checkpoints is not None:
+            checkpoints.steps = step
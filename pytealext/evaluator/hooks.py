@@ -0,0 +1,34 @@
+class Hooks:
+    """Instrumentation of eval_teal, subclass it and override the events to observe.
+
+    Line numbers are 1-based and match the line numbers reported by Panic and debug output.
+    The stack passed to on_op is the live evaluation stack and must not be modified.
+
+    Example counting executed operations:
+        ```python
+        class OpCounter(Hooks):
+            def __init__(self):
+                self.counts = Counter()
+
+            def on_op(self, pc, opcode, stack):
+                self.counts[opcode] += 1
+
+        counter = OpCounter()
+        eval_teal(program, hooks=counter)
+        ```
+    """
+
+    def on_op(self, pc: int, opcode: str, stack: list[int | bytes]) -> None:
+        """Called before an operation is executed"""
+
+    def on_branch(self, pc: int, target: int) -> None:
+        """Called when a branch (b, bz, bnz) is taken, target is the line of the label jumped to"""
+
+    def on_callsub(self, pc: int, target: int) -> None:
+        """Called when a subroutine is called, target is the line of the subroutine's label"""
+
+    def on_state_write(self, pc: int, key: bytes, value: int | bytes, local: bool) -> None:
+        """Called before a value is written to global state or local state (when local is True)"""
+
+    def on_log(self, pc: int, value: bytes) -> None:
+        """Called when a value is logged"""
@@ -0,0 +1,431 @@
+from itertools import count
+from typing import Callable, cast
+
+from pyteal import (
+    MAX_PROGRAM_VERSION,
+    Assert,
+    BinaryExpr,
+    Break,
+    CompileOptions,
+    Cond,
+    Continue,
+    Expr,
+    For,
+    If,
+    Int,
+    LabelReference,
+    Mode,
+    NaryExpr,
+    Op,
+    OptimizeOptions,
+    Return,
+    ScratchLoad,
+    ScratchSlot,
+    ScratchStore,
+    Seq,
+    SetBit,
+    SubroutineCall,
+    SubroutineDeclaration,
+    SubroutineDefinition,
+    TealOp,
+    TealSimpleBlock,
+    TealType,
+    UnaryExpr,
+    While,
+)
+
+from ..lazy import LazyAnd, LazyOr
+from .evaluator import EvalContext, Program, eval_teal
+from .tools import compile_and_run
+
+NUM_SLOTS = 256
+# the class of expressions with three operands, like SetBit, isn't exported by pyteal
+TernaryExpr = type(SetBit(Int(0), Int(0), Int(0)))
+
+
+class Unsupported(Exception):
+    """Raised when an expression can't be assembled directly, it has to be compiled with compileTeal"""
+
+
+class Assembler:
+    """Assembles a PyTeal expression into TEAL source lines by walking its tree, without compileTeal
+
+    The lines are parsed by Program like any other TEAL source.
+    Control flow, scratch space and subroutine calls are lowered by the assembler,
+    any other expression is assembled from its own TEAL blocks as long as they don't branch.
+    Slot numbering and the scratch slot optimization follow compileTeal, so the slots hold the same values,
+    but the lowering of control flow is the assembler's own: the ops and labels differ from compileTeal's output.
+    """
+
+    def __init__(self, options: CompileOptions):
+        self.options = options
+        self.lines: list[str | TealOp] = []
+        self._labels = count()
+        self.loops: list[tuple[str, str]] = []  # (continue label, break label) of the enclosing loops
+        self.subroutines: dict[SubroutineDefinition, str] = {}
+        self.deferred: Expr | None = None  # expression evaluated before each retsub of the current subroutine
+        self.handlers: dict[type, Callable] = {
+            Seq: self._seq,
+            If: self._if,
+            Cond: self._cond,
+            While: self._while,
+            For: self._for,
+            Break: self._break,
+            Continue: self._continue,
+            Assert: self._assert,
+            Return: self._return,
+            ScratchStore: self._store,
+            ScratchLoad: self._load,
+            BinaryExpr: self._operands("argLeft", "argRight"),
+            UnaryExpr: self._operands("arg"),
+            TernaryExpr: self._operands("firstArg", "secondArg", "thirdArg"),
+            NaryExpr: self._nary,
+            LazyAnd: self._lazy(Op.bz, 0),
+            LazyOr: self._lazy(Op.bnz, 1),
+            SubroutineCall: self._callsub,
+            SubroutineDeclaration: lambda expr: self.expr(expr.body),
+        }
+
+    def assemble(self, expr: Expr) -> list[str]:
+        """Assemble the main program and the subroutines it calls"""
+        self._routine(expr)
+        emitted: set[SubroutineDefinition] = set()
+        while len(emitted) < len(self.subroutines):
+            subroutine = next(s for s in self.subroutines if s not in emitted)
+            emitted.add(subroutine)
+            self.options.setSubroutine(subroutine)
+            declaration = subroutine.get_declaration_by_option(self.options.use_frame_pointers)
+            self.deferred = declaration.deferred_expr
+            self.lines.append(self.subroutines[subroutine] + ":")
+            self._routine(declaration)
+        self.options.setSubroutine(None)
+        return [f"#pragma version {self.options.version}"] + self._render()
+
+    def label(self) -> str:
+        """A new unique label"""
+        return f"l{next(self._labels)}"
+
+    def op(self, op: Op, *args):
+        """Emit an op, its arguments are rendered once all slots and subroutines are known"""
+        self.lines.append(TealOp(None, op, *args))
+
+    def branch(self, op: Op, label: str):
+        """Emit a branch to a label of this assembler"""
+        self.lines.append(f"{op} {label}")
+
+    def expr(self, expr: Expr | None):
+        """Emit the ops of an expression"""
+        if expr is None:
+            raise Unsupported("incomplete expression")
+        handler = self.handlers.get(type(expr))
+        if handler is not None:
+            handler(expr)
+        else:
+            self._blocks(expr)
+
+    def _routine(self, expr: Expr):
+        # the same implicit return compileTeal adds to the main program and subroutines
+        self.expr(expr)
+        if not expr.has_return():
+            self._exit(expr.type_of() != TealType.none)
+
+    def _exit(self, has_value: bool):
+        if self.options.currentSubroutine is None:
+            if not has_value:
+                raise Unsupported("Return from main program must have an argument")
+            self.op(Op.return_)
+            return
+        if self.deferred is not None:
+            self.expr(self.deferred)
+        self.op(Op.retsub)
+
+    def _blocks(self, expr: Expr):
+        start, end = expr.__teal__(self.options)
+        block = start
+        while True:
+            if not isinstance(block, TealSimpleBlock):
+                raise Unsupported(f"{type(expr).__name__} branches")
+            for op in block.ops:
+                if op.op in (Op.retsub, Op.callsub, Op.b, Op.bz, Op.bnz):
+                    raise Unsupported(f"{type(expr).__name__} uses {op.op}")
+                if op.op != Op.comment:
+                    self.lines.append(op)
+            if block is end or block.nextBlock is None:
+                break
+            block = block.nextBlock
+
+    def _seq(self, expr: Seq):
+        for arg in expr.args:
+            self.expr(arg)
+
+    def _if(self, expr: If):
+        end = self.label()
+        self.expr(expr.cond)
+        if expr.elseBranch is None:
+            self.branch(Op.bz, end)
+            self.expr(expr.thenBranch)
+        else:
+            otherwise = self.label()
+            self.branch(Op.bz, otherwise)
+            self.expr(expr.thenBranch)
+            self.branch(Op.b, end)
+            self.lines.append(otherwise + ":")
+            self.expr(expr.elseBranch)
+        self.lines.append(end + ":")
+
+    def _cond(self, expr: Cond):
+        end = self.label()
+        for condition, value in expr.args:
+            otherwise = self.label()
+            self.expr(condition)
+            self.branch(Op.bz, otherwise)
+            self.expr(value)
+            self.branch(Op.b, end)
+            self.lines.append(otherwise + ":")
+        self.op(Op.err)
+        self.lines.append(end + ":")
+
+    def _loop(self, cond: Expr, body: Expr | None, step: Expr | None):
+        start, next_iteration, end = self.label(), self.label(), self.label()
+        self.lines.append(start + ":")
+        self.expr(cond)
+        self.branch(Op.bz, end)
+        self.loops.append((next_iteration, end))
+        self.expr(body)
+        self.loops.pop()
+        self.lines.append(next_iteration + ":")
+        if step is not None:
+            self.expr(step)
+        self.branch(Op.b, start)
+        self.lines.append(end + ":")
+
+    def _while(self, expr: While):
+        self._loop(expr.cond, expr.doBlock, None)
+
+    def _for(self, expr: For):
+        self.expr(expr.start)
+        self._loop(expr.cond, expr.doBlock, expr.step)
+
+    def _break(self, _: Break):
+        if not self.loops:
+            raise Unsupported("break is only allowed in a loop")
+        self.branch(Op.b, self.loops[-1][1])
+
+    def _continue(self, _: Continue):
+        if not self.loops:
+            raise Unsupported("continue is only allowed in a loop")
+        self.branch(Op.b, self.loops[-1][0])
+
+    def _assert(self, expr: Assert):
+        if self.options.version < Op.assert_.min_version:
+            raise Unsupported("assert is not available")
+        for cond in expr.cond:
+            self.expr(cond)
+            self.op(Op.assert_)
+
+    def _return(self, expr: Return):
+        if expr.value is not None:
+            self.expr(expr.value)
+        self._exit(expr.value is not None)
+
+    def _store(self, expr: ScratchStore):
+        if expr.index_expression is not None:
+            self.expr(expr.index_expression)
+            self.expr(expr.value)
+            self.op(Op.stores)
+        else:
+            self.expr(expr.value)
+            self.op(Op.store, expr.slot)
+
+    def _load(self, expr: ScratchLoad):
+        if expr.index_expression is not None:
+            self.expr(expr.index_expression)
+            self.op(Op.loads)
+        else:
+            self.op(Op.load, expr.slot)
+
+    def _operands(self, *names: str) -> Callable:
+        def handler(expr):
+            for name in names:
+                self.expr(getattr(expr, name))
+            self.op(expr.op)
+
+        return handler
+
+    def _nary(self, expr: NaryExpr):
+        for i, arg in enumerate(expr.args):
+            self.expr(arg)
+            if i:
+                self.op(expr.op)
+
+    def _lazy(self, exit_branch: Op, exit_value: int) -> Callable:
+        def handler(expr):
+            short_circuit, end = self.label(), self.label()
+            for arg in expr.args[:-1]:
+                self.expr(arg)
+                self.branch(exit_branch, short_circuit)
+            self.expr(expr.args[-1])
+            self.branch(Op.b, end)
+            self.lines.append(short_circuit + ":")
+            self.op(Op.int, exit_value)
+            self.lines.append(end + ":")
+
+        return handler
+
+    def _callsub(self, expr: SubroutineCall):
+        if expr.output_kwarg:
+            raise Unsupported("subroutines with an output argument are not supported")
+        for arg in expr.args:
+            if not isinstance(arg, Expr):
+                raise Unsupported("only subroutines with expression arguments are supported")
+            self.expr(arg)
+        if expr.subroutine not in self.subroutines:
+            self.subroutines[expr.subroutine] = f"{expr.subroutine.name()}_{len(self.subroutines)}"
+        self.op(Op.callsub, expr.subroutine)
+
+    def _optimize_slots(self):
+        """Cancel contiguous store/load pairs of local slots like compileTeal does from version 9
+
+        A slot is local when only one routine uses it, it isn't reserved and no DynamicScratchVar references it.
+        When a store of a local slot is directly followed by the only load of the slot in its routine,
+        all ops of the slot are removed and the value stays on the stack.
+        Each run of ops between labels and branches is a basic block, the blocks are optimized in order.
+        """
+        if not OptimizeOptions().optimize_scratch_slots(self.options.version):
+            return
+        labels = {label + ":" for label in self.subroutines.values()}
+        routines: list[list[list[TealOp]]] = [[]]  # blocks of the main program and of each subroutine
+        blocks: list[tuple[int, int, list[TealOp]]] = []  # (first line, line after the last one, ops)
+        start = 0
+        for i, line in enumerate(self.lines + [""]):
+            if isinstance(line, TealOp):
+                continue
+            if start < i:
+                ops = cast(list[TealOp], self.lines[start:i])
+                routines[-1].append(ops)
+                blocks.append((start, i, ops))
+            if line in labels:
+                routines.append([])
+            start = i + 1
+
+        routine_slots = [{slot for ops in routine for op in ops for slot in op.getSlots()} for routine in routines]
+        skip = {slot for slots in routine_slots for slot in slots if slot.isReservedSlot}
+        # slots referenced by DynamicScratchVars are loaded and stored with loads/stores
+        skip.update(
+            slot for routine in routines for ops in routine for op in ops if op.op == Op.int for slot in op.getSlots()
+        )
+        for i, slots in enumerate(routine_slots):
+            for other in routine_slots[i + 1 :]:
+                skip.update(slots & other)
+
+        for routine in routines:
+            for ops in routine:
+                while _cancel_store_load(routine, ops, skip):
+                    pass
+        for first, end, ops in reversed(blocks):
+            self.lines[first:end] = ops
+
+    def _render(self) -> list[str]:
+        self._optimize_slots()
+        slots: set[ScratchSlot] = set()
+        for line in self.lines:
+            if isinstance(line, TealOp):
+                slots.update(line.getSlots())
+                for subroutine in line.getSubroutines():
+                    if subroutine not in self.subroutines:
+                        raise Unsupported("subroutine called from an expression assembled from blocks")
+        slot_ids = assign_slots(slots)
+        rendered = []
+        for line in self.lines:
+            if isinstance(line, str):
+                rendered.append(line)
+                continue
+            parts = [str(line.op)]
+            for arg in line.args:
+                if isinstance(arg, ScratchSlot):
+                    parts.append(str(slot_ids[arg]))
+                elif isinstance(arg, SubroutineDefinition):
+                    parts.append(self.subroutines[arg])
+                elif isinstance(arg, LabelReference):
+                    parts.append(arg.getLabel())
+                else:
+                    parts.append(str(arg))
+            rendered.append(" ".join(parts))
+        return rendered
+
+
+def _cancel_store_load(routine: list[list[TealOp]], block: list[TealOp], skip: set[ScratchSlot]) -> bool:
+    """Remove the ops of the local slots of the block loaded right after they are stored and nowhere else
+
+    Returns:
+        True when any ops were removed
+    """
+    removed = set()
+    for op, next_op in zip(block, block[1:]):
+        if op.op != Op.store or next_op.op != Op.load or op.getSlots() != next_op.getSlots():
+            continue
+        slot = op.getSlots()[0]
+        loads = sum(1 for ops in routine for other in ops if other.op == Op.load and slot in other.getSlots())
+        if slot not in skip and loads == 1:
+            removed.add(slot)
+    if not removed:
+        return False
+    for ops in routine:
+        ops[:] = [op for op in ops if op.op not in (Op.store, Op.load) or not set(op.getSlots()) <= removed]
+    return True
+
+
+def assign_slots(slots: set[ScratchSlot]) -> dict[ScratchSlot, int]:
+    """Assign ids to the slots like compileTeal does: reserved slots keep theirs, the rest get the lowest free ones"""
+    reserved = {slot.id for slot in slots if slot.isReservedSlot}
+    if len(slots) > NUM_SLOTS:
+        raise Unsupported(f"Too many slots in use: {len(slots)}")
+    assignments = {}
+    next_id = 0
+    for slot in sorted(slots, key=lambda slot: slot.id):
+        if slot.isReservedSlot:
+            assignments[slot] = slot.id
+            continue
+        while next_id in reserved:
+            next_id += 1
+        assignments[slot] = next_id
+        reserved.add(next_id)
+    return assignments
+
+
+def assemble_expr(ast: Expr, mode: Mode = Mode.Application, *, version: int = MAX_PROGRAM_VERSION) -> Program:
+    """Assemble a PyTeal expression into a Program without compileTeal, see Assembler
+
+    Raises:
+        Unsupported: when the expression contains control flow the assembler doesn't understand
+    """
+    assembler = Assembler(CompileOptions(mode=mode, version=version))
+    return Program(assembler.assemble(ast), mode)
+
+
+def eval_expr(
+    ast: Expr,
+    mode: Mode = Mode.Application,
+    *,
+    version: int = MAX_PROGRAM_VERSION,
+    context: EvalContext | None = None,
+) -> tuple[list[bytes | int], list[bytes | int]]:
+    """Evaluate a PyTeal expression, a faster alternative to compile_and_run for unit tests
+
+    The expression tree is rendered into TEAL source lines by the Assembler, which are parsed and evaluated
+    with eval_teal. This skips compileTeal's validation, block sorting and flattening passes,
+    which are the dominant cost of evaluating small expressions.
+    The results (stack and slots) are the same as the ones of compile_and_run.
+    Expressions the assembler doesn't understand are compiled and evaluated with compile_and_run.
+
+    Args:
+        ast: The PyTEAL AST to evaluate
+        mode: The mode to evaluate the expression in
+        version: TEAL version
+        context: instance of EvalContext, its mode must match the mode
+    """
+    try:
+        program = assemble_expr(ast, mode, version=version)
+    except Unsupported:
+        return compile_and_run(ast, mode, version=version, context=context)
+    return eval_teal(program, context=context)
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+from pyteal import Mode
+
+MaxLogCalls = 32
+MaxLogSize = 1024
+MaxStringSize = 4096
+
+MaxLocalStateSize = 16
+MaxGlobalStateSize = 64
+MaxAppKeyLen = 64
+MaxAppSumKeyValueLens = 128
+
+MaxLogicSigCost = 20000
+MaxAppProgramCost = 700  # budget added to the group's pool by each app call, outer or inner
+
+MaxTxGroupSize = 16
+MaxInnerTransactions = 16  # per app call in the group, pooled across the group
+MinTxnFee = 1000  # microAlgos
+
+
+def default_budget(mode: Mode) -> int | None:
+    """The opcode budget of a single program in the given mode, None for applications as it depends on the group"""
+    return MaxLogicSigCost if mode == Mode.Signature else None
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Resource limits of a network (its consensus parameters) enforced by the evaluator
+
+    The defaults match the current MainNet and TestNet consensus,
+    a different profile can be used to evaluate programs for networks with other parameters.
+    """
+
+    max_log_calls: int = MaxLogCalls
+    max_log_size: int = MaxLogSize  # total bytes logged
+    max_string_size: int = MaxStringSize
+    max_local_state_size: int = MaxLocalStateSize  # number of keys
+    max_global_state_size: int = MaxGlobalStateSize  # number of keys
+    max_key_size: int = MaxAppKeyLen
+    max_key_value_size: int = MaxAppSumKeyValueLens  # combined length of a key and its bytes value
+
+
+DEFAULT_LIMITS = Limits()
@@ -0,0 +1,159 @@
+"""Replay recorded application calls against a local build of the approval program
+
+Records are read from JSONL files (one JSON object per line) or from msgpack files (a stream of maps).
+Each record holds a transaction and the state of the application before it was executed:
+    - "txn": the transaction, encoded with algosdk.encoding.msgpack_encode in JSONL files
+        or as the dictified transaction (txn.dictify()) in msgpack files, signed transactions are accepted too
+    - "global-state": the global state of the application before the call
+    - "local-state": the local state of the sender before the call
+States use the algod TealKeyValue format: [{"key": base64, "value": {"type": 1, "bytes": base64, "uint": 0}}],
+see the snapshot module.
+
+Usage: python -m pytealext.evaluator.replay approval.teal calls.jsonl [--processes N]
+"""
+
+import argparse
+import base64
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from pathlib import Path
+
+import msgpack
+from algosdk.encoding import msgpack_decode
+from algosdk.transaction import ApplicationCallTxn
+
+from .evaluator import EvalContext, Panic, Program, eval_teal
+from .hooks import Hooks
+from .snapshot import State, decode_state
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of replaying a single recorded call"""
+
+    index: int  # position of the record in the input
+    txid: str
+    cost: int = 0
+    error: str | None = None  # the panic message if the call failed
+    # state entries modified by the call, their values after the call
+    global_delta: State = field(default_factory=dict)
+    local_delta: State = field(default_factory=dict)
+    log: list[bytes] = field(default_factory=list)
+    stack: list[int | bytes] = field(default_factory=list)  # the stack at the end of a successful call
+
+
+def read_records(path: str | Path) -> Iterator[dict]:
+    """Stream the records of a JSONL (.jsonl, .json) or msgpack file"""
+    path = Path(path)
+    if path.suffix in (".jsonl", ".json"):
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with path.open("rb") as file:
+            yield from msgpack.Unpacker(file, raw=False)
+
+
+def state_delta(before: State, after: State) -> State:
+    """Entries of after which are new or differ from before"""
+    return {key: value for key, value in after.items() if key not in before or before[key] != value}
+
+
+def replay_record(program: Program, index: int, record: dict, hooks: Hooks | None = None) -> ReplayResult:
+    """Evaluate the program for a single recorded call, hooks are passed to eval_teal"""
+    txn = msgpack_decode(record["txn"])
+    txn = getattr(txn, "transaction", txn)  # unwrap signed transactions
+    result = ReplayResult(index, txn.get_txid())
+    if not isinstance(txn, ApplicationCallTxn):
+        result.error = f"not an application call: {txn.type}"
+        return result
+    global_state = decode_state(record.get("global-state", []))
+    local_state = decode_state(record.get("local-state", []))
+    context = EvalContext(global_state=dict(global_state), local_state=dict(local_state), txn=txn)
+    try:
+        result.stack, _ = eval_teal(program, context=context, hooks=hooks)
+    except Panic as e:
+        result.error = e.message
+    result.cost = context.cost
+    result.global_delta = state_delta(global_state, context.global_state)
+    result.local_delta = state_delta(local_state, context.local_state)
+    result.log = context.log
+    return result
+
+
+_program: Program | None = None  # program evaluated by a worker process
+
+
+def _init_worker(program: Program):
+    global _program  # pylint: disable=global-statement
+    _program = program
+
+
+def _replay_in_worker(item: tuple[int, dict]) -> ReplayResult:
+    assert _program is not None
+    return replay_record(_program, *item)
+
+
+def replay(
+    program: Program | list[str] | str, records: Iterable[dict], processes: int = 1, chunksize: int = 64
+) -> Iterator[ReplayResult]:
+    """Replay recorded calls against the program, the results are yielded in the order of the records
+
+    The program is decoded once and shared by all calls (and sent once to each worker process).
+
+    Args:
+        program: the approval program
+        records: recorded calls, see read_records
+        processes: number of worker processes to evaluate the calls in
+        chunksize: number of records sent to a worker process at once
+    """
+    if not isinstance(program, Program):
+        program = Program(program)
+    if processes <= 1:
+        for index, record in enumerate(records):
+            yield replay_record(program, index, record)
+        return
+    with Pool(processes, initializer=_init_worker, initargs=(program,)) as pool:
+        yield from pool.imap(_replay_in_worker, enumerate(records), chunksize)
+
+
+def _encode_delta(delta: State) -> dict[str, int | str]:
+    return {
+        base64.b64encode(key).decode(): value if isinstance(value, int) else base64.b64encode(value).decode()
+        for key, value in delta.items()
+    }
+
+
+def main(argv: list[str] | None = None):
+    """Replay recorded calls and print a JSON line per call followed by a summary"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("program", help="TEAL source of the approval program")
+    parser.add_argument("records", nargs="+", help="JSONL or msgpack files with recorded calls")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    program = Program(Path(args.program).read_text(encoding="utf-8"))
+    records = (record for path in args.records for record in read_records(path))
+    calls = failed = total_cost = 0
+    for result in replay(program, records, args.processes):
+        calls += 1
+        failed += result.error is not None
+        total_cost += result.cost
+        output = {
+            "index": result.index,
+            "txid": result.txid,
+            "cost": result.cost,
+            "error": result.error,
+            "global-delta": _encode_delta(result.global_delta),
+            "local-delta": _encode_delta(result.local_delta),
+        }
+        print(json.dumps(output))
+    print(json.dumps({"calls": calls, "failed": failed, "total-cost": total_cost}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
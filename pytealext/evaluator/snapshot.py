@@ -0,0 +1,159 @@
+"""Import and export of application state for EvalContext
+
+Two formats are supported:
+    - algod/indexer JSON: TealKeyValue entries [{"key": base64, "value": {"type": 1, "bytes": base64, "uint": 0}}]
+        as a JSON array, one entry per line (JSONL) or inside an algod/indexer response
+        (application "params" / "global-state", account "app-local-state" / "key-value").
+    - compact msgpack: a single map of raw keys to raw bytes or integer values.
+
+Loaders stream the input and build the state in a single pass.
+"""
+
+import base64
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+import msgpack
+
+State = dict[bytes, int | bytes]
+
+TEAL_BYTES = 1
+TEAL_UINT = 2
+
+CHUNK_SIZE = 1 << 16
+
+
+def decode_state(entries: Iterable[dict]) -> State:
+    """Decode TealKeyValue entries"""
+    state: State = {}
+    for entry in entries:
+        value = entry["value"]
+        key = base64.b64decode(entry["key"])
+        if value["type"] == TEAL_BYTES:
+            state[key] = base64.b64decode(value.get("bytes", ""))
+        elif value["type"] == TEAL_UINT:
+            state[key] = value.get("uint", 0)
+        else:
+            raise ValueError(f"Unknown TealValue type {value['type']}")
+    return state
+
+
+def encode_state(state: State) -> Iterator[dict]:
+    """Encode a state as TealKeyValue entries"""
+    for key, value in state.items():
+        if isinstance(value, int):
+            teal_value: dict[str, Any] = {"type": TEAL_UINT, "uint": value}
+        else:
+            teal_value = {"type": TEAL_BYTES, "bytes": base64.b64encode(value).decode()}
+        yield {"key": base64.b64encode(key).decode(), "value": teal_value}
+
+
+def _iter_json(file: IO[str]) -> Iterator[Any]:
+    """Stream the values of a top-level JSON array or of whitespace separated JSON values (JSONL)
+
+    Values are yielded as soon as they are read, so the whole input is never held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    index = 0
+    in_array = None  # unknown until the first value
+
+    def refill() -> bool:
+        nonlocal buffer, index
+        chunk = file.read(CHUNK_SIZE)
+        buffer = buffer[index:] + chunk
+        index = 0
+        return bool(chunk)
+
+    while True:
+        # skip whitespace and separators up to the next value
+        while index < len(buffer) and buffer[index] in " \t\r\n" + ("," if in_array else ""):
+            index += 1
+        if index == len(buffer):
+            if refill():
+                continue
+            if in_array:
+                raise ValueError("Unexpected end of a JSON array")
+            return
+        if in_array is None:
+            in_array = buffer[index] == "["
+            index += in_array
+            continue
+        if in_array and buffer[index] == "]":
+            return
+        try:
+            value, index = decoder.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            if refill():
+                continue
+            raise
+        yield value
+
+
+def _teal_key_values(values: Iterator[Any]) -> Iterator[dict]:
+    """Entries of a JSON state dump, unwrapping algod and indexer responses"""
+    for value in values:
+        if "key" in value:
+            yield value
+            continue
+        # algod and indexer responses, ex. GET /v2/applications/{id} or GET /v2/accounts/{address}/applications/{id}
+        for container in ("application", "params", "app-local-state"):
+            value = value.get(container, value)
+        yield from value.get("global-state", value.get("key-value", []))
+
+
+def load_state_json(source: str | Path | IO[str]) -> State:
+    """Load a state from an algod/indexer JSON dump (see module docs for the accepted layouts)
+
+    Args:
+        source: path to the dump or a file opened in text mode
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8") as file:
+            return decode_state(_teal_key_values(_iter_json(file)))
+    return decode_state(_teal_key_values(_iter_json(source)))
+
+
+def dump_state_json(state: State, destination: str | Path | IO[str]):
+    """Write a state as a JSON array of TealKeyValue entries, one entry per line"""
+    if isinstance(destination, (str, Path)):
+        with open(destination, "w", encoding="utf-8") as file:
+            dump_state_json(state, file)
+        return
+    destination.write("[")
+    for i, entry in enumerate(encode_state(state)):
+        destination.write(",\n" if i else "\n")
+        destination.write(json.dumps(entry))
+    destination.write("\n]\n")
+
+
+def load_state_msgpack(source: str | Path | IO[bytes]) -> State:
+    """Load a state from a compact msgpack dump
+
+    Args:
+        source: path to the dump or a file opened in binary mode
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as file:
+            return load_state_msgpack(file)
+    unpacker = msgpack.Unpacker(source, raw=False)
+    state: State = {}
+    for _ in range(unpacker.read_map_header()):
+        key = unpacker.unpack()
+        state[key] = unpacker.unpack()
+    return state
+
+
+def dump_state_msgpack(state: State, destination: str | Path | IO[bytes]):
+    """Write a state as a compact msgpack map, entries are written one by one"""
+    if isinstance(destination, (str, Path)):
+        with open(destination, "wb") as file:
+            dump_state_msgpack(state, file)
+        return
+    packer = msgpack.Packer(use_bin_type=True)
+    destination.write(packer.pack_map_header(len(state)))
+    for key, value in state.items():
+        destination.write(packer.pack(key))
+        destination.write(packer.pack(value))
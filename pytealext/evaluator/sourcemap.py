@@ -0,0 +1,122 @@
+"""Attribution of executed TEAL back to the Python source that built it
+
+PyTeal records where each expression was constructed only when source mapping is enabled,
+preferably before pyteal is imported (expressions built earlier, ex. subroutines, can't be located):
+    ```python
+    from feature_gates import FeatureGates
+    FeatureGates.set_sourcemap_enabled(True)
+
+    from pyteal import *  # noqa
+    ```
+Expressions built by pytealext helpers (ex. Uint64Array.sum) are attributed to the lines of the helpers.
+"""
+
+import os
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pyteal import MAX_PROGRAM_VERSION, Expr, Mode
+
+from .data import length_cost
+from .evaluator import Program
+from .hooks import Hooks
+
+if TYPE_CHECKING:
+    # source maps are available from pyteal 0.24, older versions are supported without them
+    from pyteal import R3SourceMap
+
+
+@dataclass(frozen=True)
+class SourceLocation:
+    """A line of a Python source file"""
+
+    file: str
+    line: int  # 1-based
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}"
+
+
+class SourceMap:
+    """Python source locations of the lines of a TEAL program"""
+
+    def __init__(self, locations: list[SourceLocation | None]):
+        """
+        Args:
+            locations: location of each TEAL line, in the order of the lines, None for unmapped lines
+        """
+        self.locations = locations
+
+    @classmethod
+    def from_r3(cls, r3_sourcemap: "R3SourceMap") -> "SourceMap":
+        """Create from the source map produced by PyTeal's Compilation.compile(with_sourcemap=True)
+
+        A source map stored as JSON can be loaded with R3SourceMap.from_json first.
+        """
+        mappings = sorted(r3_sourcemap.entries.values())
+        locations: list[SourceLocation | None] = [None] * (mappings[-1].line + 1 if mappings else 0)
+        for mapping in mappings:
+            if mapping.source is not None and mapping.source_line is not None:
+                locations[mapping.line] = SourceLocation(mapping.source, mapping.source_line + 1)
+        return cls(locations)
+
+    def __getitem__(self, line_number: int) -> SourceLocation | None:
+        """Location of a TEAL line, line numbers are 1-based like the ones of Panic, debug output and Hooks"""
+        if 0 < line_number <= len(self.locations):
+            return self.locations[line_number - 1]
+        return None
+
+
+def compile_with_source_map(
+    ast: Expr, mode: Mode = Mode.Application, *, version: int = MAX_PROGRAM_VERSION
+) -> tuple[str, SourceMap]:
+    """Compile a PyTeal expression along with the source map of the result
+
+    Lines PyTeal can't locate (ex. of subroutines declared before source mapping was enabled)
+    are left unmapped instead of being attributed to the call of this function.
+
+    Requires pyteal 0.24 or newer.
+
+    Raises:
+        SourceMapDisabledError: when source mapping isn't enabled (see module docs)
+    """
+    from pyteal import Compilation  # pylint: disable=import-outside-toplevel
+
+    results = Compilation(ast, mode, version=version).compile(with_sourcemap=True)
+    assert results.sourcemap is not None and results.sourcemap.r3_sourcemap is not None
+    source_map = SourceMap.from_r3(results.sourcemap.r3_sourcemap)
+    source_map.locations = [
+        None if location is None or os.path.abspath(location.file) == __file__ else location
+        for location in source_map.locations
+    ]
+    return results.teal, source_map
+
+
+class SourceProfiler(Hooks):
+    """Hooks accumulating the number of executed ops and their cost per Python source line
+
+    Example:
+        ```python
+        teal, source_map = compile_with_source_map(expr)
+        program = Program(teal)
+        profiler = SourceProfiler(program, source_map)
+        eval_teal(program, hooks=profiler)
+        for location, cost in profiler.cost.most_common(10):
+            print(f"{location}: {cost} ({profiler.op_count[location]} ops)")
+        ```
+    """
+
+    def __init__(self, program: Program, source_map: SourceMap):
+        self.program = program
+        self.source_map = source_map
+        self.cost: Counter[SourceLocation] = Counter()
+        self.op_count: Counter[SourceLocation] = Counter()
+
+    def on_op(self, pc: int, opcode: str, stack: list[int | bytes]) -> None:
+        location = self.source_map[pc]
+        if location is not None:
+            instruction = self.program.instructions[pc - 1]
+            # the same cost as counted by EvalContext.cost, including the part depending on the argument length
+            self.cost[location] += instruction.cost + (length_cost(opcode, stack) if instruction.cost_by_length else 0)
+            self.op_count[location] += 1
@@ -3,7 +3,8 @@ from typing import IO
 
 from pyteal import MAX_PROGRAM_VERSION, Expr, Mode, compileTeal
 
-from .evaluator import EvalContext, eval_teal
+from .evaluator import INTEGER_SIZE, Checkpoint, Checkpoints, EvalContext, EvaluatorError, Program, eval_teal
+from .hooks import Hooks
 
 
 def substitute_template_values(teal: str, substitutions: dict[str, str]) -> str:
@@ -22,7 +23,8 @@ def compile_and_run(
     version: int = MAX_PROGRAM_VERSION,
     context: EvalContext | None = None,
     debug: IO | None = None,
-    tmpl_subs: dict[str, str] | None = None
+    hooks: Hooks | None = None,
+    tmpl_subs: dict[str, str] | None = None,
 ) -> tuple[list[bytes | int], list[bytes | int]]:
     """Compile the given AST and run it using eval_teal
 
@@ -50,11 +52,46 @@ def compile_and_run(
         ast: The PyTEAL AST to compile and run
         mode: The compiler mode to use
         version: TEAL version
-        context: instance of EvalContext (required when using global state)
+        context: instance of EvalContext (required when using global state or logic signature arguments),
+            its mode must match the compiler mode
         debug: IO object to write execution log to
+        hooks: instrumentation of the evaluation, see Hooks
         tmpl_subs: dict of template substitutions
     """
     compiled = compileTeal(ast, mode, version=version)
     if tmpl_subs is not None:
         compiled = substitute_template_values(compiled, tmpl_subs)
-    return eval_teal(compiled.splitlines(), context=context, debug=debug)
+    return eval_teal(Program(compiled, mode), context=context, debug=debug, hooks=hooks)
+
+
+def state_at(program: Program, checkpoints: Checkpoints, step: int, context: EvalContext | None = None) -> Checkpoint:
+    """Reconstruct the state of an evaluation after the given number of executed operations
+
+    The evaluation is resumed from the nearest checkpoint, so only the operations after it are executed again.
+
+    Example finding the cause of a panic in a long running program:
+        ```python
+        checkpoints = Checkpoints(interval=10000)
+        try:
+            eval_teal(program, checkpoints=checkpoints)
+        except Panic:
+            # state right before the operation which panicked
+            state = state_at(program, checkpoints, checkpoints.steps - 1)
+        ```
+
+    Args:
+        program: the evaluated program
+        checkpoints: checkpoints taken during the evaluation of the program
+        step: number of operations executed
+        context: context to evaluate in, required when the checkpoints were taken with a context.
+            It is modified to reflect the reconstructed state.
+    """
+    checkpoint = checkpoints.nearest(step)
+    if checkpoint.step == step:
+        checkpoint.restore(context)
+        return checkpoint
+    replayed = Checkpoints(interval=INTEGER_SIZE)
+    eval_teal(program, context=context, checkpoints=replayed, resume=checkpoint, max_steps=step - checkpoint.step)
+    if replayed.items[-1].step != step:
+        raise EvaluatorError(f"The evaluation ended after {replayed.steps} steps, before step {step}", 0)
+    return replayed.items[-1]
@@ -0,0 +1,487 @@
+import functools
+from typing import Callable
+
+from pyteal import (
+    Assert,
+    Bytes,
+    BytesZero,
+    Concat,
+    Expr,
+    Extract,
+    ExtractUint16,
+    ExtractUint32,
+    ExtractUint64,
+    For,
+    GetByte,
+    If,
+    Int,
+    Itob,
+    Len,
+    Replace,
+    Return,
+    ScratchVar,
+    Seq,
+    SetByte,
+    ShiftLeft,
+    ShiftRight,
+    Subroutine,
+    SubroutineFnWrapper,
+    TealInputError,
+    TealType,
+    While,
+)
+
+from .array import EMPTY_ARRAY, INDEX_NOT_FOUND, for_each_position
+
+
+class _ByteAlignedArray:
+    """Base of arrays of unsigned integers densely packed in `width` bytes each, see Uint64Array for the API"""
+
+    width: int
+
+    def __init__(self) -> None:
+        self.cache = ScratchVar(TealType.bytes)
+
+    def initialize(self) -> Expr:
+        """Initialize an empty array.
+
+        If the array is already initialized, this will clear it.
+        """
+        return self.cache.store(EMPTY_ARRAY)
+
+    def decode(self, value: Expr) -> Expr:
+        """Decode a bytestring into an array.
+
+        This method initializes the array.
+        If the array is already initialized, previous content will be lost.
+
+        Lazy, complexity: O(1)
+        """
+        return self.cache.store(value)
+
+    def encode(self) -> Expr:
+        """Retrieve the binary string representation of this array."""
+        return self.cache.load()
+
+    def append(self, value: Expr) -> Expr:
+        """Append a new element to the end of this array.
+
+        The runtime will panic if the value doesn't fit in the width of the elements.
+        """
+        return self.cache.store(Concat(self.cache.load(), encode_uint(value, self.width)))
+
+    def set(self, index: Expr | int, value: Expr) -> Expr:
+        """Set the value at the given index to the given value.
+
+        The runtime will panic if the value doesn't fit in the width of the elements.
+        """
+        return self.cache.store(Replace(self.cache.load(), self._position(index), encode_uint(value, self.width)))
+
+    def length(self) -> Expr:
+        """Retrieve the expression evaluating to the length of this array."""
+        return Len(self.cache.load()) / Int(self.width)
+
+    def __getitem__(self, index: Expr | int) -> Expr:
+        """Retrieve the value at the given index."""
+        return get_uint(self.cache.load(), self._position(index), self.width)
+
+    def sum(self) -> Expr:
+        """Calculate the sum of the values.
+
+        If the sum is greater or equal to 2^64, the runtime will panic.
+        """
+        return _packed_array_sum(self.width)(self.cache.load())
+
+    def exists(self, value: Expr) -> Expr:
+        """Check if a value exists in the array."""
+        return _packed_array_index(self.width)(self.cache.load(), value) != INDEX_NOT_FOUND
+
+    def index(self, value: Expr) -> Expr:
+        """Get the index of the value in the array.
+
+        If not found, return INDEX_NOT_FOUND (2**64-1).
+        """
+        return _packed_array_index(self.width)(self.cache.load(), value)
+
+    def _position(self, index: Expr | int) -> Expr:
+        if isinstance(index, int):
+            return Int(index * self.width)
+        return index * Int(self.width)
+
+
+class Uint32Array(_ByteAlignedArray):
+    """Array of uint32s densely packed in 4 bytes each, with the API of Uint64Array
+
+    Note:
+        `.set()` method requires TEALv7+
+    """
+
+    width = 4
+
+
+class Uint16Array(_ByteAlignedArray):
+    """Array of uint16s densely packed in 2 bytes each, with the API of Uint64Array
+
+    Note:
+        `.set()` method requires TEALv7+
+    """
+
+    width = 2
+
+
+class Uint8Array(_ByteAlignedArray):
+    """Array of uint8s stored as bytes, with the API of Uint64Array"""
+
+    width = 1
+
+    def set(self, index: Expr | int, value: Expr) -> Expr:
+        """Set the value at the given index to the given value.
+
+        The runtime will panic if the value is greater than 255.
+        """
+        return self.cache.store(SetByte(self.cache.load(), self._position(index), value))
+
+
+def get_uint(cache: Expr, position: Expr, width: int) -> Expr:
+    """Retrieve the unsigned integer of the given width (in bytes) starting at the given position."""
+    match width:
+        case 1:
+            return GetByte(cache, position)
+        case 2:
+            return ExtractUint16(cache, position)
+        case 4:
+            return ExtractUint32(cache, position)
+        case 8:
+            return ExtractUint64(cache, position)
+    raise ValueError(f"Invalid width: {width}")
+
+
+def encode_uint(value: Expr, width: int) -> Expr:
+    """Encode the value as a big-endian integer of the given width (in bytes).
+
+    The runtime will panic if the value doesn't fit in the width.
+    """
+    if width == 8:
+        return Itob(value)
+    v = ScratchVar(TealType.uint64)
+    return Seq(
+        v.store(value),
+        Assert(v.load() < Int(1 << (8 * width))),
+        Extract(Itob(v.load()), Int(8 - width), Int(width)),
+    )
+
+
+@functools.cache
+def _packed_array_sum(width: int) -> SubroutineFnWrapper:
+    @Subroutine(TealType.uint64, name=f"uint{8 * width}_array_sum")
+    def packed_array_sum(cache: Expr) -> Expr:
+        S = ScratchVar(TealType.uint64)
+        return Seq(
+            S.store(Int(0)),
+            for_each_position(Len(cache), width, lambda position: S.store(S.load() + get_uint(cache, position, width))),
+            S.load(),
+        )
+
+    return packed_array_sum
+
+
+@functools.cache
+def _packed_array_index(width: int) -> SubroutineFnWrapper:
+    @Subroutine(TealType.uint64, name=f"uint{8 * width}_array_index")
+    def packed_array_index(cache: Expr, value: Expr) -> Expr:
+        return Seq(
+            for_each_position(
+                Len(cache),
+                width,
+                lambda position: If(get_uint(cache, position, width) == value).Then(Return(position / Int(width))),
+            ),
+            Return(INDEX_NOT_FOUND),
+        )
+
+    return packed_array_index
+
+
+# Bit-packed arrays start with the number of elements as uint16
+BIT_PACKED_HEADER_SIZE = 2
+# elements are read from 8 byte windows, which may extend up to 7 bytes past the end of the array,
+# the bytes of such windows are copied and padded, the rest is read in place
+BIT_PACKED_PADDING = Bytes(bytes(7))
+MAX_BIT_PACKED_WIDTH = 57  # the widest element an 8 byte window holds at any bit offset
+
+
+class BitPackedArray:
+    """Array of unsigned integers of an arbitrary bit width packed with no padding between the elements
+
+    The binary representation is the number of elements as uint16 followed by the elements, big-endian,
+    most significant bit first. The last byte is padded with zero bits.
+
+    Example usage:
+    ```
+        flags = BitPackedArray(3)  # values 0-7
+        program = Seq(
+            flags.initialize(),
+            flags.append(Int(5)),
+            flags.append(Int(7)),
+            Assert(flags[1] == Int(7)),
+            Assert(Len(flags.encode()) == Int(3)),  # 2 bytes of length and 6 bits of values
+        )
+    ```
+
+    Note:
+        `.set()` and `.append()` methods require TEALv7+
+    """
+
+    def __init__(self, bits: int) -> None:
+        """
+        Args:
+            bits: width of the elements, 1 to 57 bits
+        """
+        if not 1 <= bits <= MAX_BIT_PACKED_WIDTH:
+            raise TealInputError(f"Invalid bit width: {bits}, expected 1 to {MAX_BIT_PACKED_WIDTH}")
+        self.bits = bits
+        self.cache = ScratchVar(TealType.bytes)
+
+    def initialize(self) -> Expr:
+        """Initialize an empty array.
+
+        If the array is already initialized, this will clear it.
+        """
+        return self.cache.store(Bytes(bytes(BIT_PACKED_HEADER_SIZE)))
+
+    def decode(self, value: Expr) -> Expr:
+        """Decode a bytestring into an array.
+
+        This method initializes the array.
+        If the array is already initialized, previous content will be lost.
+
+        Lazy, complexity: O(1)
+        """
+        return self.cache.store(value)
+
+    def encode(self) -> Expr:
+        """Retrieve the binary string representation of this array."""
+        return self.cache.load()
+
+    def append(self, value: Expr) -> Expr:
+        """Append a new element to the end of this array.
+
+        The runtime will panic if the value doesn't fit in the bit width or the array has 65535 elements.
+        """
+        return self.cache.store(_bit_packed_array_append(self.bits)(self.cache.load(), value))
+
+    def set(self, index: Expr | int, value: Expr) -> Expr:
+        """Set the value at the given index to the given value.
+
+        The runtime will panic if the value doesn't fit in the bit width.
+        The index is not checked against the length of the array.
+        """
+        if isinstance(index, int):
+            index = Int(index)
+        return self.cache.store(_bit_packed_array_set(self.bits)(self.cache.load(), index, value))
+
+    def length(self) -> Expr:
+        """Retrieve the expression evaluating to the length of this array."""
+        return ExtractUint16(self.cache.load(), Int(0))
+
+    def __getitem__(self, index: Expr | int) -> Expr:
+        """Retrieve the value at the given index.
+
+        The index is not checked against the length of the array.
+        """
+        offset = ScratchVar(TealType.uint64)
+        start = ScratchVar(TealType.uint64)
+        return Seq(
+            offset.store(Int(index * self.bits) if isinstance(index, int) else index * Int(self.bits)),
+            start.store(window_start(offset.load())),
+            get_bits(read_window(self.cache.load(), start.load()), offset.load(), self.bits),
+        )
+
+    def sum(self) -> Expr:
+        """Calculate the sum of the values.
+
+        If the sum is greater or equal to 2^64, the runtime will panic.
+        """
+        return _bit_packed_array_sum(self.bits)(self.cache.load())
+
+    def exists(self, value: Expr) -> Expr:
+        """Check if a value exists in the array."""
+        return _bit_packed_array_index(self.bits)(self.cache.load(), value) != INDEX_NOT_FOUND
+
+    def index(self, value: Expr) -> Expr:
+        """Get the index of the value in the array.
+
+        If not found, return INDEX_NOT_FOUND (2**64-1).
+        """
+        return _bit_packed_array_index(self.bits)(self.cache.load(), value)
+
+
+def window_start(offset: Expr) -> Expr:
+    """Position of the first byte of the 8 byte window holding the element at the given bit offset.
+
+    Args:
+        offset: bit offset of the element, counted from the end of the header
+    """
+    return ShiftRight(offset, Int(3)) + Int(BIT_PACKED_HEADER_SIZE)
+
+
+def read_window(cache: Expr, start: Expr) -> Expr:
+    """Read the 8 byte window starting at the given position as uint64.
+
+    Bytes past the end of the array are read as zeros, only the window is copied to pad it.
+
+    Args:
+        cache: encoded bit-packed array. Evaluated up to 3 times.
+        start: position of the window, less than the length of the array. Evaluated up to 3 times.
+    """
+    return (
+        If(start + Int(8) <= Len(cache))
+        .Then(ExtractUint64(cache, start))
+        .Else(ExtractUint64(Concat(Extract(cache, start, Len(cache) - start), BIT_PACKED_PADDING), Int(0)))
+    )
+
+
+def get_bits(window: Expr, offset: Expr, bits: int) -> Expr:
+    """Retrieve the element of the given bit width at the given bit offset of a bit-packed array.
+
+    Args:
+        window: 8 byte window of the element, see window_start and read_window
+        offset: bit offset of the element, counted from the end of the header
+        bits: width of the elements
+    """
+    # drop the bits of the preceding elements with shl, then the bits of the following ones with shr
+    return ShiftRight(ShiftLeft(window, offset % Int(8)), Int(64 - bits))
+
+
+def for_each_bit_packed(cache: Expr, bits: int, body: Callable[[Expr, Expr], Expr]) -> Expr:
+    """Loop over the elements of a bit-packed array.
+
+    The windows ending within the array are read in place, the windows of the last elements
+    are read from a padded copy of the last bytes of the array.
+
+    Args:
+        cache: encoded bit-packed array. Evaluated multiple times.
+        bits: width of the elements
+        body: function building the body of the loop from the expressions evaluating to the element
+            and to its bit offset
+    """
+    offset = ScratchVar(TealType.uint64)
+    end = ScratchVar(TealType.uint64)
+    tail_start = ScratchVar(TealType.uint64)
+    split = ScratchVar(TealType.uint64)
+    tail = ScratchVar(TealType.bytes)
+    return Seq(
+        end.store(ExtractUint16(cache, Int(0)) * Int(bits)),
+        # windows starting before the last 7 bytes end within the array
+        tail_start.store(
+            If(Len(cache) < Int(BIT_PACKED_HEADER_SIZE + 8)).Then(Int(BIT_PACKED_HEADER_SIZE)).Else(Len(cache) - Int(7))
+        ),
+        tail.store(Concat(Extract(cache, tail_start.load(), Len(cache) - tail_start.load()), BIT_PACKED_PADDING)),
+        # bit offset at which the windows start in the tail
+        split.store((tail_start.load() - Int(BIT_PACKED_HEADER_SIZE)) * Int(8)),
+        If(split.load() > end.load()).Then(split.store(end.load())),
+        For(offset.store(Int(0)), offset.load() < split.load(), offset.store(offset.load() + Int(bits))).Do(
+            body(get_bits(ExtractUint64(cache, window_start(offset.load())), offset.load(), bits), offset.load())
+        ),
+        While(offset.load() < end.load()).Do(
+            body(
+                get_bits(
+                    ExtractUint64(tail.load(), window_start(offset.load()) - tail_start.load()), offset.load(), bits
+                ),
+                offset.load(),
+            ),
+            offset.store(offset.load() + Int(bits)),
+        ),
+    )
+
+
+@functools.cache
+def _bit_packed_array_set(bits: int) -> SubroutineFnWrapper:
+    @Subroutine(TealType.bytes, name=f"bit{bits}_array_set")
+    def bit_packed_array_set(cache: Expr, index: Expr, value: Expr) -> Expr:
+        start = ScratchVar(TealType.uint64)
+        size = ScratchVar(TealType.uint64)
+        shift = ScratchVar(TealType.uint64)
+        offset = ScratchVar(TealType.uint64)
+
+        def update(window: Expr) -> Expr:
+            """Replace the bits of the element in its 8 byte window"""
+            return Itob(window & ~ShiftLeft(Int((1 << bits) - 1), shift.load()) | ShiftLeft(value, shift.load()))
+
+        return Seq(
+            Assert(value < Int(1 << bits)),
+            offset.store(index * Int(bits)),
+            start.store(window_start(offset.load())),
+            shift.store(Int(64 - bits) - offset.load() % Int(8)),
+            # number of bytes from the start of the window to the end of the array
+            size.store(Len(cache) - start.load()),
+            If(size.load() >= Int(8))
+            .Then(Replace(cache, start.load(), update(ExtractUint64(cache, start.load()))))
+            .Else(
+                Replace(
+                    cache,
+                    start.load(),
+                    Extract(
+                        update(
+                            ExtractUint64(Concat(Extract(cache, start.load(), size.load()), BIT_PACKED_PADDING), Int(0))
+                        ),
+                        Int(0),
+                        size.load(),
+                    ),
+                )
+            ),
+        )
+
+    return bit_packed_array_set
+
+
+@functools.cache
+def _bit_packed_array_append(bits: int) -> SubroutineFnWrapper:
+    @Subroutine(TealType.bytes, name=f"bit{bits}_array_append")
+    def bit_packed_array_append(cache: Expr, value: Expr) -> Expr:
+        n = ScratchVar(TealType.uint64)
+        grown = ScratchVar(TealType.bytes)
+        return Seq(
+            n.store(ExtractUint16(cache, Int(0))),
+            Assert(n.load() < Int(0xFFFF)),
+            # bytes needed for n + 1 elements, minus the bytes already there
+            grown.store(
+                Concat(
+                    cache,
+                    BytesZero(
+                        ((n.load() + Int(1)) * Int(bits) + Int(7)) / Int(8) + Int(BIT_PACKED_HEADER_SIZE) - Len(cache)
+                    ),
+                )
+            ),
+            grown.store(Replace(grown.load(), Int(0), Extract(Itob(n.load() + Int(1)), Int(6), Int(2)))),
+            _bit_packed_array_set(bits)(grown.load(), n.load(), value),
+        )
+
+    return bit_packed_array_append
+
+
+@functools.cache
+def _bit_packed_array_sum(bits: int) -> SubroutineFnWrapper:
+    @Subroutine(TealType.uint64, name=f"bit{bits}_array_sum")
+    def bit_packed_array_sum(cache: Expr) -> Expr:
+        S = ScratchVar(TealType.uint64)
+        return Seq(
+            S.store(Int(0)),
+            for_each_bit_packed(cache, bits, lambda value, _: S.store(S.load() + value)),
+            S.load(),
+        )
+
+    return bit_packed_array_sum
+
+
+@functools.cache
+def _bit_packed_array_index(bits: int) -> SubroutineFnWrapper:
+    @Subroutine(TealType.uint64, name=f"bit{bits}_array_index")
+    def bit_packed_array_index(cache: Expr, value: Expr) -> Expr:
+        return Seq(
+            for_each_bit_packed(
+                cache, bits, lambda element, offset: If(element == value).Then(Return(offset / Int(bits)))
+            ),
+            Return(INDEX_NOT_FOUND),
+        )
+
+    return bit_packed_array_index
@@ -1,8 +1,14 @@
+import json
 from io import StringIO
 
-from pyteal import Addr, Assert, Btoi, Bytes, BytesAdd, If, Int, Itob, Pop, Return, ScratchVar, Seq, Txn
+import pytest
+from pyteal import Addr, Assert, Btoi, Bytes, BytesAdd, If, Int, Itob, Pop, Return, ScratchVar, Seq, Sha256, Txn
 
-from pytealext.evaluator import compile_and_run, summarize_execution
+from pytealext.evaluator import EvalContext, Panic, Program, compile_and_run, eval_teal, summarize_execution
+from pytealext.evaluator.analytics import diff_costs, estimate_program_size, main
+from pytealext.evaluator.data import MAX_VERSION, op_cost
+from pytealext.evaluator.evaluator import EvaluatorError
+from tests.txn_helpers import call_record
 
 
 def test_summarize_execution():
@@ -43,3 +49,123 @@ def test_summarize_execution():
     assert len(summary.call_count) == 2  # the branch + return from branch
     assert summary.execution_cost == expected_cost
     assert summary.opcode_usage == expected_opcodes
+
+
+def test_op_cost_depends_on_version():
+    assert op_cost("sha256", 1) == 7
+    assert op_cost("sha256", 2) == 35
+    assert op_cost("int", 1) == 1
+    with pytest.raises(ValueError, match="not available"):
+        op_cost("replace2", 6)
+    with pytest.raises(KeyError):
+        op_cost("not_an_op")
+
+
+def test_op_cost_by_field():
+    assert op_cost("ecdsa_verify", 7, "Secp256k1") == 1700
+    assert op_cost("ecdsa_verify", 7, "Secp256r1") == 2500
+    assert op_cost("ecdsa_pk_recover", 7, "Secp256k1") == 2000
+
+
+def test_summarize_execution_uses_program_version():
+    costs = []
+    for version in (1, 2):
+        s = StringIO()
+        eval_teal([f"#pragma version {version}", "byte 0x01", "sha256", "len"], debug=s)
+        costs.append(summarize_execution(s.getvalue()).execution_cost)
+
+    assert costs == [1 + 7 + 1, 1 + 35 + 1]  # sha256 became more expensive in v2
+
+
+def test_eval_teal_accumulates_cost():
+    program = Program(["#pragma version 8", "int 1", "byte 0x01", "sha256", "pop", "return"])
+    assert program.version == 8
+
+    ctx = EvalContext()
+    eval_teal(program, context=ctx)
+    assert ctx.cost == 1 + 1 + 35 + 1 + 1
+    eval_teal(program, context=ctx)
+    assert ctx.cost == 2 * (1 + 1 + 35 + 1 + 1)
+
+
+def test_program_rejects_unavailable_opcodes():
+    with pytest.raises(Panic, match="not available in TEAL v6"):
+        Program(["#pragma version 6", "byte 0x01", "byte 0x02", "replace2 0"])
+
+
+def test_program_rejects_unsupported_versions():
+    with pytest.raises(EvaluatorError, match="TEAL v11 is not supported"):
+        Program([f"#pragma version {MAX_VERSION + 1}", "int 1"])
+    with pytest.raises(EvaluatorError, match="TEAL v0 is not supported"):
+        Program(["#pragma version 0", "int 1"])
+
+
+def test_length_dependent_cost():
+    # base64_decode costs 1 + 1 per 16 bytes of the input
+    for encoded, expected_cost in ((b"", 1 + 1), (b"AAAA" * 4, 1 + 1 + 1), (b"AAAA" * 5, 1 + 1 + 2)):
+        program = [f"byte 0x{encoded.hex()}", "base64_decode StdEncoding"]
+        ctx = EvalContext()
+        s = StringIO()
+        eval_teal(program, context=ctx, debug=s)
+        assert ctx.cost == expected_cost
+        assert summarize_execution(s.getvalue()).execution_cost == expected_cost
+
+
+def test_program_rejects_missing_immediates():
+    with pytest.raises(Panic, match="extract expects 2 immediate arguments"):
+        Program(["#pragma version 8", "byte 0x01", "extract 0"])
+    # the variable part of immediates may be empty
+    Program(["#pragma version 8", "intcblock", "int 0", "switch"])
+
+
+def test_estimate_program_size():
+    assert estimate_program_size(["#pragma version 8", "int 1", "return"]) == 1 + 2 + 1  # pushint 1
+    # constants referenced more than once are placed in intcblock/bytecblock
+    assert estimate_program_size(["#pragma version 8", "int 1", "int 1", "+", "return"]) == 1 + 3 + 2 + 1 + 1
+    assert estimate_program_size(["#pragma version 8", 'byte "ab"', "byte 0x6162", "concat", "len", "return"]) == (
+        1 + 5 + 2 + 1 + 1 + 1
+    )
+    # before v4 all constants are placed in the blocks
+    assert estimate_program_size(["#pragma version 3", "int 1", "return"]) == 1 + 3 + 1 + 1
+    assert estimate_program_size(["#pragma version 8", "b l", "l:", "txn ApplicationArgs 0", "extract 1 2"]) == (
+        1 + 3 + 3 + 3
+    )
+    assert estimate_program_size(["#pragma version 8", "int 300", "switch a b", "a:", "b:"]) == 1 + 3 + 6
+
+
+OLD_BUILD = ["#pragma version 8", "txna ApplicationArgs 0", "btoi", "int 2", "*", "int 2", "/", "return"]
+NEW_BUILD = ["#pragma version 8", "txna ApplicationArgs 0", "btoi", "return"]
+BROKEN_BUILD = ["#pragma version 8", "txna ApplicationArgs 0", "btoi", "int 1", "-", "dup", "assert", "return"]
+
+
+def test_diff_costs():
+    diff = diff_costs(OLD_BUILD, NEW_BUILD, [call_record(1), call_record(2)])
+
+    assert [(result.old_cost, result.new_cost, result.delta) for result in diff.inputs] == [(7, 3, -4)] * 2
+    assert diff.cost_delta == -8
+    assert diff.size_delta == -7
+    assert diff.opcode_delta == {"*": -2, "/": -2, "int": -4}
+    assert diff.new_opcode_usage["btoi"] == 2
+    assert not diff.diverged
+
+
+def test_diff_costs_reports_divergence():
+    diff = diff_costs(NEW_BUILD, BROKEN_BUILD, [call_record(2), call_record(1)])
+
+    assert diff.inputs[0].divergence == ["stack: [2] -> [1]"]
+    assert diff.inputs[1].divergence == ["error: None -> 'Assert failed'", "stack: [1] -> []"]
+    assert diff.diverged == diff.inputs
+
+
+def test_diff_costs_main(tmp_path, capsys):
+    old, new, records = tmp_path / "old.teal", tmp_path / "new.teal", tmp_path / "calls.jsonl"
+    old.write_text("\n".join(OLD_BUILD))
+    new.write_text("\n".join(NEW_BUILD))
+    records.write_text(f"{json.dumps(call_record(1))}\n")
+
+    assert main([str(old), str(new), str(records)]) == 0
+    assert main([str(new), str(old), str(records)]) == 1  # cost increase
+    assert main([str(new), str(old), str(records), "--max-cost-increase", "4"]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out.splitlines()[0])["delta"] == -4
+    assert json.loads(err.splitlines()[0])["size-delta"] == -7
@@ -2,14 +2,15 @@ from math import prod
 from typing import cast
 
 import pytest
-from hypothesis import given
+from hypothesis import given, settings
 from hypothesis import strategies as st
 from hypothesis.strategies import DataObject
-from pyteal import Assert, Bytes, Int, ScratchVar, Seq, TealType
+from pyteal import Assert, Bytes, Concat, Int, Itob, Len, ScratchVar, Seq, TealInputError, TealType, TealTypeError
 
 from examples.array import increment_program
-from pytealext import Uint64Array
-from pytealext.evaluator import compile_and_run
+from pytealext import FenwickTree, PrefixSumArray, Uint64Array
+from pytealext.array import product_bytes_loop_cost, product_bytes_tree_cost
+from pytealext.evaluator import EvalContext, Panic, compile_and_run
 
 UINT64_MAX = 2**64 - 1
 
@@ -60,6 +61,23 @@ def test_append(initial: list[int] | None, extension: list[int]):
     assert stack == [1]
 
 
+@given(
+    initial=st.lists(st.integers(min_value=0, max_value=UINT64_MAX), max_size=8),
+    extension=st.lists(st.integers(min_value=0, max_value=UINT64_MAX), max_size=16),
+)
+@settings(deadline=None)
+def test_extend(initial: list[int], extension: list[int]):
+    arr = Uint64Array()
+    program = Seq(
+        arr.decode(Bytes(encode_list(initial))),
+        arr.extend(*(Int(val) for val in extension)),
+        arr.encode() == Bytes(encode_list(initial + extension)),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
 @given(
     values=st.lists(st.integers(min_value=0, max_value=UINT64_MAX), min_size=1, max_size=64),
 )
@@ -186,3 +204,313 @@ def test_product(vals: list[int]):
     stack, _ = compile_and_run(program)
     actual = stack[0]
     assert actual == expected
+
+
+@pytest.mark.parametrize("values", [[], [7], [1, 7, 7], [UINT64_MAX, 0, 3, 5, 0]])
+@pytest.mark.parametrize("value", [0, 3, 7, UINT64_MAX])
+def test_exists_index(values: list[int], value: int):
+    index = values.index(value) if value in values else UINT64_MAX
+
+    arr = Uint64Array()
+    program = Seq(
+        arr.decode(Bytes(encode_list(values))),
+        Assert(arr.exists(Int(value)) == Int(int(value in values))),
+        Assert(arr.index(Int(value)) == Int(index)),
+        Int(1),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [[], [5], [1, 3, 3, 3, 7], [0, 2, 4, 6, 8, 10, 12, 14, 16], [UINT64_MAX - 1, UINT64_MAX]],
+)
+@pytest.mark.parametrize("value", [0, 1, 3, 8, 17, UINT64_MAX])
+def test_sorted_search(values: list[int], value: int):
+    lower_bound = next((i for i, v in enumerate(values) if v >= value), len(values))
+    index = lower_bound if value in values else UINT64_MAX
+
+    arr = Uint64Array()
+    program = Seq(
+        arr.decode(Bytes(encode_list(values))),
+        Assert(arr.lower_bound(Int(value)) == Int(lower_bound)),
+        Assert(arr.bsearch(Int(value)) == Int(index)),
+        Int(1),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
+@given(
+    values=st.lists(st.integers(min_value=0, max_value=UINT64_MAX), max_size=16),
+    inserted=st.lists(st.integers(min_value=0, max_value=UINT64_MAX), min_size=1, max_size=4),
+)
+@settings(deadline=None)
+def test_insert_remove_sorted(values: list[int], inserted: list[int]):
+    values.sort()
+    removed = inserted + [0]  # 0 might not be in the array
+
+    expected_inserted = sorted(values + inserted)
+    expected_removed = list(expected_inserted)
+    for value in removed:
+        if value in expected_removed:
+            expected_removed.remove(value)
+
+    arr = Uint64Array()
+    program = Seq(
+        arr.decode(Bytes(encode_list(values))),
+        *(arr.insert_sorted(Int(value)) for value in inserted),
+        Assert(arr.encode() == Bytes(encode_list(expected_inserted))),
+        *(arr.remove_sorted(Int(value)) for value in removed),
+        arr.encode() == Bytes(encode_list(expected_removed)),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
+def test_bsearch_cost():
+    values = list(range(0, 5000, 10))
+    ctx = EvalContext()
+    arr = Uint64Array()
+    program = Seq(arr.decode(Bytes(encode_list(values))), arr.bsearch(Int(1370)))
+
+    stack, _ = compile_and_run(program, context=ctx)
+    assert stack == [137]
+    assert ctx.cost < 300  # a linear scan costs thousands of ops
+
+
+@pytest.mark.parametrize("values", [[], [7], [3, 1, 7, 7], [2, 3, 5, 7, 11, 13, 17, 19]])
+@pytest.mark.parametrize("unroll_size_limit", [0, 1024])
+def test_fixed_length(values: list[int], unroll_size_limit: int):
+    arr = Uint64Array(len(values), unroll_size_limit)
+    index = values.index(7) if 7 in values else UINT64_MAX
+    program = Seq(
+        arr.decode(Bytes(encode_list(values))),
+        Assert(arr.length() == Int(len(values))),
+        Assert(arr.sum() == Int(sum(values))),
+        Assert(arr.product() == Int(prod(values))),
+        Assert(arr.exists(Int(7)) == Int(int(7 in values))),
+        Assert(arr.exists(Int(4)) == Int(0)),
+        Assert(arr.index(Int(7)) == Int(index)),
+        Int(1),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
+def test_fixed_length_unrolled_cost():
+    values = list(range(1, 9))
+    costs = []
+    for unroll_size_limit in (0, 1024):
+        arr = Uint64Array(len(values), unroll_size_limit)
+        ctx = EvalContext()
+        compile_and_run(Seq(arr.decode(Bytes(encode_list(values))), arr.sum()), context=ctx)
+        costs.append(ctx.cost)
+
+    looped, unrolled = costs
+    assert unrolled < looped / 2
+
+
+def test_fixed_length_rejects_resizing():
+    arr = Uint64Array(2)
+    with pytest.raises(TealInputError):
+        arr.append(Int(1))
+    with pytest.raises(TealInputError):
+        arr.extend(Int(1), Int(2))
+    with pytest.raises(TealInputError):
+        arr.insert_sorted(Int(1))
+    with pytest.raises(TealInputError):
+        Uint64Array(-1)
+
+
+@given(values=st.lists(st.integers(min_value=0, max_value=UINT64_MAX), max_size=8))
+@settings(deadline=None)
+def test_sum_wide(values: list[int]):
+    wide = ScratchVar(TealType.bytes, slotId=1)
+    hi = ScratchVar(TealType.uint64, slotId=2)
+    lo = ScratchVar(TealType.uint64, slotId=3)
+    result = ScratchVar(TealType.uint64, slotId=4)
+    arr = Uint64Array()
+    program = Seq(
+        arr.decode(Bytes(encode_list(values))),
+        wide.store(arr.sum_wide()),
+        arr.sum_wide_pair(hi, lo),
+        result.store(Int(7)),
+        arr.sum_checked(result),
+    )
+
+    stack, slots = compile_and_run(program)
+
+    expected = sum(values)
+    assert slots[1] == expected.to_bytes(16, "big")
+    assert slots[2:4] == [expected >> 64, expected & UINT64_MAX]
+    if expected <= UINT64_MAX:
+        assert stack == [1]
+        assert slots[4] == expected
+    else:
+        assert stack == [0]
+        assert slots[4] == 7
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 5, 8, 11, 16])
+def test_product_bytes_tree(length: int):
+    values = [UINT64_MAX - i for i in range(length)]
+    result = ScratchVar(TealType.bytes, slotId=1)
+    arr = Uint64Array(length, unroll_size_limit=1024)
+    program = Seq(arr.decode(Bytes(encode_list(values))), result.store(arr.product_bytes()), Int(1))
+
+    _, slots = compile_and_run(program)
+    assert int.from_bytes(cast(bytes, slots[1]), "big") == prod(values)
+
+
+def test_product_bytes_cost_model():
+    for length in range(20):
+        values = list(range(2, length + 2))
+        costs = []
+        for unroll_size_limit in (0, 1024):
+            arr = Uint64Array(length, unroll_size_limit)
+            ctx = EvalContext()
+            compile_and_run(Seq(arr.decode(Bytes(encode_list(values))), Len(arr.product_bytes())), context=ctx)
+            costs.append(ctx.cost)
+        # the cost models are accurate up to the few ops surrounding the product
+        assert abs(costs[1] - product_bytes_tree_cost(length)) <= 5
+        if length:
+            assert abs(costs[0] - product_bytes_loop_cost(length)) <= 5
+        assert costs[1] <= costs[0]
+
+
+@given(values=st.lists(st.integers(min_value=0, max_value=2**32 - 1), max_size=20))
+@settings(deadline=None)
+def test_map_filter(values: list[int]):
+    arr = Uint64Array()
+    result = Uint64Array()
+    expected = [x * 3 for x in values if x % 2 == 0]
+    program = Seq(
+        arr.decode(Bytes(encode_list(values))),
+        result.decode(arr.filter(lambda x: x % Int(2) == Int(0)).map(lambda x: x * Int(3)).encode()),
+        Assert(result.encode() == Bytes(encode_list(expected))),
+        result.decode(arr.map(lambda x: x + Int(1)).encode()),
+        Assert(result.encode() == Bytes(encode_list([x + 1 for x in values]))),
+        result.length(),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [len(values)]
+
+
+@given(values=st.lists(st.integers(min_value=0, max_value=2**16), max_size=20))
+@settings(deadline=None)
+def test_reduce(values: list[int]):
+    arr = Uint64Array()
+    program = Seq(
+        arr.decode(Bytes(encode_list(values))),
+        Assert(arr.reduce(lambda acc, x: acc + x * x, Int(0)) == Int(sum(x * x for x in values))),
+        # accumulator of a different type than the elements
+        Assert(
+            arr.map(lambda x: x + Int(1)).reduce(lambda acc, x: Concat(Itob(x), acc), Bytes(""))
+            == Bytes(encode_list([x + 1 for x in reversed(values)]))
+        ),
+        arr.filter(lambda x: x > Int(100)).reduce(lambda acc, x: acc + Int(1), Int(0)),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [len([x for x in values if x > 100])]
+
+
+def test_reduce_type_mismatch():
+    arr = Uint64Array()
+    with pytest.raises(TealTypeError):
+        arr.reduce(lambda acc, x: Itob(x), Int(0))
+    with pytest.raises(TealTypeError):
+        arr.map(Itob).encode()
+
+
+@pytest.mark.parametrize("array_type", (PrefixSumArray, FenwickTree))
+@given(data=st.data())
+@settings(deadline=None)
+def test_range_sums(array_type, data: DataObject):
+    values = data.draw(st.lists(st.integers(min_value=0, max_value=2**32), min_size=1, max_size=20))
+    set_index = data.draw(st.integers(min_value=0, max_value=len(values) - 1))
+    new_value = data.draw(st.integers(min_value=0, max_value=2**32))
+    add_index = data.draw(st.integers(min_value=0, max_value=len(values) - 1))
+    delta = data.draw(st.integers(min_value=0, max_value=2**32))
+    start = data.draw(st.integers(min_value=0, max_value=len(values)))
+    end = data.draw(st.integers(min_value=start, max_value=len(values)))
+    expected = values.copy()
+    expected[set_index] = new_value
+    expected[add_index] += delta
+
+    arr = array_type()
+    program = Seq(
+        arr.build(Bytes(encode_list(values))),
+        arr.set(Int(set_index), Int(new_value)),
+        arr.add(add_index, Int(delta)),
+        *(Assert(arr[i] == Int(val)) for i, val in enumerate(expected)),
+        Assert(arr[Int(add_index)] == Int(expected[add_index])),
+        Assert(arr.range_sum(Int(start), end) == Int(sum(expected[start:end]))),
+        Assert(arr.prefix_sum(Int(end)) == Int(sum(expected[:end]))),
+        Assert(arr.length() == Int(len(expected))),
+        arr.sum(),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [sum(expected)]
+
+
+def test_prefix_sum_array_encoding():
+    arr = PrefixSumArray()
+    program = Seq(
+        arr.initialize(),
+        Assert(arr.sum() == Int(0)),
+        arr.append(Int(3)),
+        arr.append(Int(4)),
+        arr.encode() == Bytes(encode_list([0, 3, 7])),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
+def test_fenwick_tree_encoding():
+    tree = FenwickTree()
+    program = Seq(
+        tree.build(Bytes(encode_list([1, 2, 3, 4, 5]))),
+        tree.encode() == Bytes(encode_list([1, 3, 3, 10, 5])),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
+def test_range_sum_cost():
+    values = list(range(100))
+    prefix_sums = PrefixSumArray()
+    tree = FenwickTree()
+    prefix_sums_context = EvalContext()
+    tree_context = EvalContext()
+
+    compile_and_run(
+        Seq(
+            prefix_sums.decode(Bytes(encode_list([0] + [sum(values[: i + 1]) for i in range(100)]))),
+            prefix_sums.range_sum(Int(10), Int(90)),
+        ),
+        context=prefix_sums_context,
+    )
+    compile_and_run(Seq(tree.initialize(100), tree.range_sum(Int(10), Int(90))), context=tree_context)
+
+    assert prefix_sums_context.cost < 20
+    assert tree_context.cost < 200
+
+
+@pytest.mark.parametrize("array_type", (PrefixSumArray, FenwickTree))
+def test_range_sums_update_out_of_bounds(array_type):
+    for update in ("set", "add"):
+        arr = array_type()
+        program = Seq(arr.build(Bytes(encode_list([1, 2]))), getattr(arr, update)(Int(2), Int(1)), Int(1))
+        with pytest.raises(Panic):
+            compile_and_run(program)
@@ -0,0 +1,104 @@
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from pyteal import Assert, Bytes, Int, Not, Pop, Seq
+
+from pytealext import Bitset, PopCount
+from pytealext.evaluator import Panic, compile_and_run
+
+UINT64_MAX = 2**64 - 1
+
+
+def encode_set(values: set[int], capacity: int) -> bytes:
+    """Encode a set of ints the same way as Bitset."""
+    encoded = bytearray((capacity + 7) // 8)
+    for value in values:
+        encoded[value // 8] |= 0x80 >> (value % 8)
+    return bytes(encoded)
+
+
+@given(value=st.integers(min_value=0, max_value=UINT64_MAX))
+@settings(deadline=None)
+def test_popcount(value: int):
+    stack, _ = compile_and_run(PopCount(Int(value)))
+    assert stack == [bin(value).count("1")]
+
+
+@given(data=st.data())
+@settings(deadline=None)
+def test_set_clear(data: st.DataObject):
+    capacity = data.draw(st.integers(min_value=1, max_value=300))
+    added = data.draw(st.sets(st.integers(min_value=0, max_value=capacity - 1)))
+    removed = data.draw(st.sets(st.sampled_from(sorted(added)))) if added else set()
+    expected = added - removed
+
+    bitset = Bitset()
+    program = Seq(
+        bitset.initialize(Int(capacity)),
+        *(bitset.set(value) for value in added),
+        *(bitset.clear(Int(value)) for value in removed),
+        Assert(bitset.encode() == Bytes(encode_set(expected, capacity))),
+        *(Assert(bitset.test(value)) for value in expected),
+        *(Assert(Not(bitset.test(Int(value)))) for value in removed),
+        Assert(bitset.is_empty() == Int(int(not expected))),
+        bitset.count(),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [len(expected)]
+
+
+@given(
+    left=st.sets(st.integers(min_value=0, max_value=99)),
+    right=st.sets(st.integers(min_value=0, max_value=99)),
+)
+@settings(deadline=None)
+def test_set_operations(left: set[int], right: set[int]):
+    for operation, expected in (
+        (Bitset.union, left | right),
+        (Bitset.intersection, left & right),
+        (Bitset.difference, left - right),
+    ):
+        bitset = Bitset()
+        other = Bitset()
+        program = Seq(
+            bitset.decode(Bytes(encode_set(left, 100))),
+            other.decode(Bytes(encode_set(right, 100))),
+            operation(bitset, other),
+            bitset.encode() == Bytes(encode_set(expected, 100)),
+        )
+
+        stack, _ = compile_and_run(program)
+        assert stack == [1]
+
+
+@pytest.mark.parametrize("size", (4089, 4096))
+def test_count_of_maximum_size(size: int):
+    # bitsets of up to 4096 bytes fit in a box or in scratch space, counting must not pad a copy of them
+    values = set(range(0, size * 8, 7))
+    bitset = Bitset()
+    program = Seq(bitset.decode(Bytes(encode_set(values, size * 8))), bitset.count())
+
+    stack, _ = compile_and_run(program)
+    assert stack == [len(values)]
+
+
+def test_capacity():
+    bitset = Bitset()
+    stack, _ = compile_and_run(Seq(bitset.initialize(10), bitset.capacity()))
+    assert stack == [16]
+
+
+def test_out_of_capacity():
+    bitset = Bitset()
+    for access in (Pop(bitset.test(16)), bitset.set(16), bitset.clear(Int(16))):
+        with pytest.raises(Panic):
+            compile_and_run(Seq(bitset.initialize(16), access, Int(1)))
+
+
+def test_capacity_mismatch():
+    bitset = Bitset()
+    other = Bitset()
+    program = Seq(bitset.initialize(16), other.initialize(8), bitset.union(other), Int(1))
+    with pytest.raises(Panic):
+        compile_and_run(program)
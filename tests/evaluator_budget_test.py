@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from pytealext.evaluator.budget import OPUP_OVERHEAD, layout_for, main, percentile, plan_budget
+from tests.txn_helpers import call_record
+
+
+def test_layout_for():
+    layout = layout_for(700)
+    assert (layout.app_calls, layout.opup_calls, layout.budget, layout.fee) == (0, 0, 700, 0)
+
+    layout = layout_for(701)
+    assert (layout.app_calls, layout.opup_calls, layout.budget, layout.fee) == (1, 0, 1400, 1000)
+
+    # the group is full, the remaining budget is provided by OpUp calls
+    layout = layout_for(2000, group_size=15)
+    assert (layout.app_calls, layout.opup_calls) == (1, 1)
+    assert layout.budget == 3 * 700 - OPUP_OVERHEAD
+
+    layout = layout_for(2000, group_size=16, app_calls=2)
+    assert (layout.app_calls, layout.opup_calls) == (0, 1)
+
+    with pytest.raises(ValueError, match="exceeds the budget"):
+        layout_for(700 + 16 * 700, group_size=16)
+
+
+def test_percentile():
+    costs = list(range(1, 101))
+    assert percentile(costs, 99) == 99
+    assert percentile(costs, 100) == 100
+    assert percentile([5], 99) == 5
+    with pytest.raises(ValueError):
+        percentile([], 99)
+
+
+def test_plan_budget():
+    costs = [500] * 98 + [1000, 3000]
+
+    plan = plan_budget(costs)
+    assert (plan.calls, plan.worst_case, plan.p99) == (100, 3000, 1000)
+    assert (plan.layout.cost, plan.layout.app_calls, plan.coverage) == (3000, 4, 1.0)
+
+    plan = plan_budget(costs, percent=99)
+    assert (plan.layout.cost, plan.layout.app_calls, plan.layout.fee, plan.coverage) == (1000, 1, 1000, 0.99)
+
+
+APPROVAL = """#pragma version 8
+txna ApplicationArgs 0
+btoi
+loop:
+dup
+bz done
+int 1
+-
+b loop
+done:
+int 1
+return"""
+
+
+def test_main(tmp_path, capsys):
+    teal = tmp_path / "approval.teal"
+    teal.write_text(APPROVAL)
+    jsonl = tmp_path / "calls.jsonl"
+    iterations = [10, 100, 300]
+    jsonl.write_text("\n".join(json.dumps(call_record(n)) for n in iterations))
+
+    main([str(teal), str(jsonl)])
+
+    plan = json.loads(capsys.readouterr().out)
+    assert plan["calls"] == 3
+    assert plan["worst-case"] == 2 + 300 * 5 + 4  # txna, btoi, 5 ops per iteration, final check and return
+    assert (plan["app-calls"], plan["opup-calls"], plan["fee"], plan["coverage"]) == (2, 0, 2000, 1.0)
@@ -27,6 +27,14 @@ from pytealext.evaluator.evaluator import EvalContext, Panic, eval_teal, int_to_
 VERSION = 6
 
 
+@given(i=st.integers(min_value=0, max_value=2**512 - 1))
+def test_int_to_trimmed_bytes(i: int):
+    trimmed = int_to_trimmed_bytes(i)
+
+    assert int.from_bytes(trimmed, "big") == i
+    assert len(trimmed) == 1 or trimmed[0] != 0
+
+
 @pytest.mark.parametrize("function", (BytesAdd, BytesMinus, BytesDiv, BytesMul))
 def test_ops_fail_for_overflows(function: Callable):
     large_bytes = Bytes(int_to_trimmed_bytes(2**512))
@@ -0,0 +1,93 @@
+import pytest
+from pyteal import App, Assert, For, If, Int, Itob, Log, Mode, ScratchVar, Seq, Subroutine, TealType, compileTeal
+
+from pytealext.evaluator import Checkpoints, EvalContext, Panic, Program, eval_teal, state_at
+from pytealext.evaluator.evaluator import EvaluatorError
+
+
+@Subroutine(TealType.uint64)
+def square(x):
+    return x * x
+
+
+def looping_program(iterations: int, fail_at: int) -> Program:
+    i = ScratchVar()
+    program = Seq(
+        For(i.store(Int(0)), i.load() < Int(iterations), i.store(i.load() + Int(1))).Do(
+            Assert(i.load() != Int(fail_at)),
+            App.globalPut(Itob(i.load() % Int(4)), square(i.load())),
+            If(i.load() < Int(5)).Then(Log(Itob(i.load()))),
+        ),
+        Int(1),
+    )
+    return Program(compileTeal(program, Mode.Application, version=8))
+
+
+def test_checkpoints_are_taken_periodically():
+    program = looping_program(100, 1000)
+    checkpoints = Checkpoints(interval=50)
+
+    stack, _ = eval_teal(program, context=EvalContext(), checkpoints=checkpoints)
+
+    assert stack == [1]
+    assert [checkpoint.step for checkpoint in checkpoints.items] == list(range(0, checkpoints.steps, 50))
+
+
+def test_state_at_matches_full_evaluation():
+    program = looping_program(100, 1000)
+    checkpoints = Checkpoints(interval=64)
+    eval_teal(program, context=EvalContext(), checkpoints=checkpoints)
+
+    for step in (0, 1, 63, 64, 500, checkpoints.steps - 1):
+        expected = Checkpoints(interval=1)
+        expected_context = EvalContext()
+        eval_teal(program, context=expected_context, checkpoints=expected, max_steps=step)
+        expected_state = expected.items[-1]
+
+        context = EvalContext()
+        state = state_at(program, checkpoints, step, context)
+
+        assert state.step == step
+        assert state.line == expected_state.line
+        assert state.stack == expected_state.stack
+        assert state.slots == expected_state.slots
+        assert state.call_stack == expected_state.call_stack
+        assert state.global_state == expected_state.global_state == context.global_state
+        assert state.log == expected_state.log == context.log
+        assert context.cost == expected_context.cost
+
+
+def test_resume_restores_cost():
+    program = looping_program(100, 1000)
+    full = EvalContext()
+    full.cost = 100  # cost of the previously evaluated programs
+    checkpoints = Checkpoints(interval=64)
+    eval_teal(program, context=full, checkpoints=checkpoints)
+
+    for checkpoint in checkpoints.items:
+        context = EvalContext()
+        eval_teal(program, context=context, resume=checkpoint)
+        assert context.cost == full.cost
+
+
+def test_state_before_panic():
+    program = looping_program(1000, 700)
+    checkpoints = Checkpoints(interval=1000)
+    with pytest.raises(Panic, match="Assert failed"):
+        eval_teal(program, context=EvalContext(), checkpoints=checkpoints)
+
+    state = state_at(program, checkpoints, checkpoints.steps - 1, EvalContext())
+
+    assert program.instructions[state.line].op == "assert"
+    assert state.stack == [0]  # i != 700
+    assert state.global_state is not None
+    assert state.global_state[(699 % 4).to_bytes(8, "big")] == 699 * 699
+
+
+def test_state_at_after_end():
+    program = looping_program(10, 1000)
+    checkpoints = Checkpoints(interval=1000)
+    eval_teal(program, context=EvalContext(), checkpoints=checkpoints)
+
+    with pytest.raises(EvaluatorError, match="ended"):
+        state_at(program, checkpoints, checkpoints.steps + 10, EvalContext())
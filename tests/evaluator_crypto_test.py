@@ -0,0 +1,76 @@
+import hashlib
+
+import pytest
+from algosdk.encoding import checksum
+from Cryptodome.Hash import keccak
+from hypothesis import given
+from hypothesis import strategies as st
+from nacl.signing import SigningKey
+from pyteal import (
+    Bytes,
+    Ed25519Verify,
+    Ed25519Verify_Bare,
+    Expr,
+    Int,
+    Keccak256,
+    ScratchVar,
+    Seq,
+    Sha3_256,
+    Sha256,
+    Sha512_256,
+)
+
+from pytealext.evaluator import EvalContext, Panic, compile_and_run
+
+PROGRAM_HASH = bytes(range(32))
+
+
+def run_to_slot(expr: Expr, context: EvalContext | None = None) -> bytes | int:
+    """Evaluate expr and return the value it produces"""
+    result = ScratchVar(slotId=0)
+    _, slots = compile_and_run(Seq(result.store(expr), Int(1)), context=context)
+    return slots[0]
+
+
+@given(data=st.binary(max_size=256))
+def test_hashes(data: bytes):
+    assert run_to_slot(Sha256(Bytes(data))) == hashlib.sha256(data).digest()
+    assert run_to_slot(Sha3_256(Bytes(data))) == hashlib.sha3_256(data).digest()
+    assert run_to_slot(Sha512_256(Bytes(data))) == checksum(data)
+    assert run_to_slot(Keccak256(Bytes(data))) == keccak.new(data=data, digest_bits=256).digest()
+
+
+def test_ed25519verify_bare():
+    key = SigningKey.generate()
+    pk = bytes(key.verify_key)
+    sig = key.sign(b"hello").signature
+
+    assert run_to_slot(Ed25519Verify_Bare(Bytes(b"hello"), Bytes(sig), Bytes(pk))) == 1
+    assert run_to_slot(Ed25519Verify_Bare(Bytes(b"hellO"), Bytes(sig), Bytes(pk))) == 0
+
+
+def test_ed25519verify():
+    key = SigningKey.generate()
+    pk = bytes(key.verify_key)
+    sig = key.sign(b"ProgData" + PROGRAM_HASH + b"hello").signature
+    context = EvalContext(program_hash=PROGRAM_HASH)
+
+    assert run_to_slot(Ed25519Verify(Bytes(b"hello"), Bytes(sig), Bytes(pk)), context) == 1
+    # a bare signature of the data is not accepted
+    bare_sig = key.sign(b"hello").signature
+    assert run_to_slot(Ed25519Verify(Bytes(b"hello"), Bytes(bare_sig), Bytes(pk)), context) == 0
+
+
+def test_ed25519verify_requires_program_hash():
+    key = SigningKey.generate()
+    sig = key.sign(b"hello").signature
+
+    with pytest.raises(Panic, match="program_hash"):
+        run_to_slot(Ed25519Verify(Bytes(b"hello"), Bytes(sig), Bytes(bytes(key.verify_key))), EvalContext())
+
+
+def test_ed25519verify_invalid_lengths():
+    with pytest.raises(Panic, match="invalid public key"):
+        run_to_slot(Ed25519Verify_Bare(Bytes(b"hello"), Bytes(bytes(64)), Bytes(bytes(31))))
+    with pytest.raises(Panic, match="invalid signature"):
+        run_to_slot(Ed25519Verify_Bare(Bytes(b"hello"), Bytes(bytes(63)), Bytes(bytes(32))))
@@ -0,0 +1,43 @@
+from pytealext.evaluator.data import (
+    IMMEDIATES,
+    MIN_VERSIONS,
+    MODE_ANY,
+    MODE_APP,
+    MODE_SIG,
+    OP_MODES,
+    OPCODES,
+    STACK_ARGS,
+    STACK_RETURNS,
+    required_immediates,
+)
+
+
+def test_min_versions():
+    assert MIN_VERSIONS[OPCODES["+"]] == 1
+    assert MIN_VERSIONS[OPCODES["replace2"]] == 7
+    assert MIN_VERSIONS[OPCODES["proto"]] == 8
+
+
+def test_stack_arity():
+    assert (STACK_ARGS[OPCODES["divmodw"]], STACK_RETURNS[OPCODES["divmodw"]]) == (4, 4)
+    assert (STACK_ARGS[OPCODES["return"]], STACK_RETURNS[OPCODES["return"]]) == (1, 0)
+    assert STACK_ARGS[OPCODES["popn"]] == -1
+    assert STACK_RETURNS[OPCODES["dupn"]] == -1
+
+
+def test_immediates():
+    assert IMMEDIATES[OPCODES["extract"]] == ("s", "l")
+    assert IMMEDIATES[OPCODES["global"]] == ("f",)
+    assert IMMEDIATES[OPCODES["ecdsa_verify"]] == ("v",)
+    assert OPCODES["sha256"] not in IMMEDIATES
+    assert required_immediates(OPCODES["gtxna"]) == 3
+    assert required_immediates(OPCODES["intcblock"]) == 0
+
+
+def test_modes_depend_on_version():
+    ed25519verify = OPCODES["ed25519verify"]
+    assert OP_MODES[4][ed25519verify] == MODE_SIG
+    assert OP_MODES[5][ed25519verify] == MODE_ANY
+    assert OP_MODES[8][OPCODES["app_global_put"]] == MODE_APP
+    assert OP_MODES[8][OPCODES["args"]] == MODE_SIG
+    assert OP_MODES[4][OPCODES["log"]] == 0
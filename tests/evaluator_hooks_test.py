@@ -0,0 +1,66 @@
+from collections import Counter
+
+from pyteal import App, Bytes, For, Int, Itob, Log, Return, ScratchVar, Seq, Subroutine, TealType
+
+from pytealext.evaluator import EvalContext, Hooks, compile_and_run
+
+
+class Recorder(Hooks):
+    def __init__(self):
+        self.ops: Counter[str] = Counter()
+        self.branches: list[tuple[int, int]] = []
+        self.calls: list[tuple[int, int]] = []
+        self.writes: list[tuple[bytes, int | bytes, bool]] = []
+        self.logs: list[bytes] = []
+        self.max_height = 0
+
+    def on_op(self, pc, opcode, stack):
+        self.ops[opcode] += 1
+        self.max_height = max(self.max_height, len(stack))
+
+    def on_branch(self, pc, target):
+        self.branches.append((pc, target))
+
+    def on_callsub(self, pc, target):
+        self.calls.append((pc, target))
+
+    def on_state_write(self, pc, key, value, local):
+        self.writes.append((key, value, local))
+
+    def on_log(self, pc, value):
+        self.logs.append(value)
+
+
+@Subroutine(TealType.uint64)
+def double(x):
+    return x * Int(2)
+
+
+def test_hooks():
+    i = ScratchVar()
+    program = Seq(
+        For(i.store(Int(0)), i.load() < Int(3), i.store(i.load() + Int(1))).Do(Log(Itob(double(i.load())))),
+        App.globalPut(Bytes("key"), Bytes("value")),
+        App.localPut(Int(0), Bytes("counter"), Int(3)),
+        Return(Int(1)),
+    )
+    recorder = Recorder()
+
+    stack, _ = compile_and_run(program, version=8, context=EvalContext(), hooks=recorder)
+
+    assert stack == [1]
+    assert recorder.ops["callsub"] == 3
+    assert recorder.ops["log"] == 3
+    assert recorder.ops["return"] == 1
+    assert len(recorder.calls) == 3
+    assert len({target for _, target in recorder.calls}) == 1
+    # the loop jumps back 3 times and exits once
+    assert len(recorder.branches) == 4
+    assert recorder.writes == [(b"key", b"value", False), (b"counter", 3, True)]
+    assert recorder.logs == [(0).to_bytes(8, "big"), (2).to_bytes(8, "big"), (4).to_bytes(8, "big")]
+    assert recorder.max_height > 0
+
+
+def test_base_hooks_are_noop():
+    stack, _ = compile_and_run(Seq(Log(Bytes("x")), Int(1)), context=EvalContext(), hooks=Hooks())
+    assert stack == [1]
@@ -0,0 +1,208 @@
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from pyteal import (
+    App,
+    Assert,
+    Break,
+    Bytes,
+    Cond,
+    Continue,
+    DynamicScratchVar,
+    Expr,
+    For,
+    If,
+    Int,
+    Itob,
+    Log,
+    Mode,
+    Pop,
+    Return,
+    ScratchVar,
+    Seq,
+    Subroutine,
+    TealType,
+    While,
+)
+
+from examples.array import increment_program
+from pytealext import LazyAnd, LazyOr, Max, Min, MulDiv64, SaturatingAdd, SaturatingSub, Uint64Array
+from pytealext.evaluator import AssertionFailed, EvalContext, compile_and_run, eval_expr
+from pytealext.evaluator.interpreter import Unsupported, assemble_expr
+
+
+@Subroutine(TealType.uint64)
+def square(x: Expr) -> Expr:
+    return x * x
+
+
+@Subroutine(TealType.uint64)
+def first_even(n: Expr) -> Expr:
+    i = ScratchVar()
+    return Seq(
+        For(i.store(Int(0)), i.load() < n, i.store(i.load() + Int(1))).Do(
+            If(i.load() % Int(2) == Int(0)).Then(If(i.load()).Then(Return(i.load())))
+        ),
+        Int(0),
+    )
+
+
+@Subroutine(TealType.none)
+def increment(counter: ScratchVar) -> Expr:
+    return counter.store(counter.load() + Int(1))
+
+
+def loop() -> Expr:
+    i, total = ScratchVar(), ScratchVar()
+    return Seq(
+        total.store(Int(0)),
+        For(i.store(Int(0)), i.load() < Int(10), i.store(i.load() + Int(1))).Do(
+            If(i.load() == Int(3)).Then(Continue()),
+            If(i.load() == Int(8)).Then(Break()),
+            total.store(total.load() + square(i.load())),
+        ),
+        While(i.load()).Do(i.store(i.load() - Int(1))),
+        total.load() + first_even(Int(7)),
+    )
+
+
+def array_ops() -> Expr:
+    arr = Uint64Array()
+    return Seq(
+        arr.decode(Bytes(b"".join(i.to_bytes(8, "big") for i in range(5)))),
+        arr.append(Int(7)),
+        arr.set(Int(2), Int(9)),
+        arr.length() + arr[Int(2)] + arr[Int(5)] + arr.sum() + arr.index(Int(9)),
+    )
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        MulDiv64(Int(2**63), Int(6), Int(4)),
+        Min(Int(3), Int(4)) + Max(Int(1), Int(9)),
+        SaturatingAdd(Int(2**64 - 1), Int(5)),
+        SaturatingSub(Int(3), Int(5)),
+        LazyAnd(Int(1), Int(0), Int(1)),
+        LazyOr(Int(0), Int(0), Int(2)),
+        Cond([Int(0), Int(1)], [Int(1), Int(2)]),
+        Seq(Pop(Bytes("a")), Assert(Int(1), Int(2)), Int(1)),
+        loop(),
+        array_ops(),
+        increment_program(),
+    ],
+)
+def test_eval_expr_matches_compile_and_run(expr: Expr):
+    assemble_expr(expr)  # must not fall back to compileTeal
+
+    assert eval_expr(expr) == compile_and_run(expr)
+
+
+@given(
+    a=st.integers(min_value=0, max_value=2**64 - 1),
+    b=st.integers(min_value=0, max_value=2**64 - 1),
+)
+@settings(deadline=None)
+def test_eval_expr_matches_compile_and_run_for_operands(a: int, b: int):
+    exprs = [
+        Min(Int(a), Int(b)),
+        Max(Int(a), Int(b)),
+        SaturatingAdd(Int(a), Int(b)),
+        SaturatingSub(Int(a), Int(b)),
+        LazyAnd(Int(a), Int(b)),
+        LazyOr(Int(a), Int(b)),
+    ]
+    for expr in exprs:
+        assert eval_expr(expr) == compile_and_run(expr)
+
+
+def test_eval_expr_with_context():
+    expr = Seq(App.globalPut(Bytes("k"), Int(5)), Log(Itob(App.globalGet(Bytes("k")))), Int(1))
+    context = EvalContext()
+
+    stack, _ = eval_expr(expr, context=context)
+
+    assert stack == [1]
+    assert context.global_state == {b"k": 5}
+    assert context.log == [(5).to_bytes(8, "big")]
+
+
+def test_eval_expr_failure():
+    with pytest.raises(AssertionFailed):
+        eval_expr(Seq(Assert(Int(0)), Int(1)))
+
+
+def test_eval_expr_falls_back_to_compile():
+    counter = ScratchVar()
+    expr = Seq(counter.store(Int(1)), increment(counter), increment(counter), counter.load())
+    with pytest.raises(Unsupported):
+        assemble_expr(expr)  # arguments passed by reference are not supported
+
+    stack, _ = eval_expr(expr, Mode.Application, version=6)
+
+    assert stack == [3]
+
+
+@Subroutine(TealType.uint64)
+def inner_sum(n: Expr) -> Expr:
+    i, total = ScratchVar(), ScratchVar()
+    return Seq(
+        total.store(Int(0)),
+        For(i.store(Int(0)), i.load() < n, i.store(i.load() + Int(1))).Do(total.store(total.load() + i.load())),
+        total.load(),
+    )
+
+
+@Subroutine(TealType.uint64)
+def outer_sum(n: Expr) -> Expr:
+    partial = ScratchVar()
+    return Seq(partial.store(inner_sum(n) + square(n)), partial.load() + inner_sum(n + Int(1)))
+
+
+@pytest.mark.parametrize("version", (8, 10))  # without and with compileTeal's scratch slot optimization
+def test_eval_expr_slot_layout_of_nested_subroutines(version: int):
+    first, second = ScratchVar(), ScratchVar()
+    expr = Seq(
+        first.store(outer_sum(Int(4))),
+        second.store(inner_sum(Int(3)) + outer_sum(Int(2))),
+        first.load() + second.load(),
+    )
+    assemble_expr(expr, version=version)  # must not fall back to compileTeal
+
+    stack, slots = eval_expr(expr, version=version)
+    expected_stack, expected_slots = compile_and_run(expr, version=version)
+
+    assert stack == expected_stack
+    assert slots == expected_slots
+
+
+shared = ScratchVar(TealType.uint64)
+
+
+@Subroutine(TealType.uint64)
+def add_shared(x: Expr) -> Expr:
+    local = ScratchVar(TealType.uint64)
+    return Seq(local.store(x + shared.load()), local.load() + Int(1))
+
+
+@pytest.mark.parametrize("version", (8, 10))
+def test_eval_expr_keeps_slots_compileteal_does_not_optimize(version: int):
+    # each store is directly followed by the only load of its slot in the routine,
+    # compileTeal keeps the reserved, global (used by more routines) and DynamicScratchVar slots
+    reserved = ScratchVar(TealType.uint64, 5)
+    target = ScratchVar(TealType.uint64)
+    reference = DynamicScratchVar(TealType.uint64)
+    expr = Seq(
+        shared.store(Int(3)),
+        reserved.store(add_shared(Int(2))),
+        Pop(reserved.load()),
+        target.store(Int(7)),
+        reference.set_index(target),
+        reference.store(reference.load() + Int(1)),
+        shared.store(Int(4)),
+        Pop(shared.load()),
+        target.load() + add_shared(Int(1)),
+    )
+    assemble_expr(expr, version=version)  # must not fall back to compileTeal
+
+    assert eval_expr(expr, version=version) == compile_and_run(expr, version=version)
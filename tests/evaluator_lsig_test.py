@@ -0,0 +1,73 @@
+import pytest
+from pyteal import Arg, Btoi, For, Int, Len, Mode, ScratchVar, Seq
+
+from pytealext.evaluator import EvalContext, Panic, Program, compile_and_run, eval_teal
+from pytealext.evaluator.evaluator import EvaluatorError
+from pytealext.evaluator.limits import MaxLogicSigCost
+
+
+def test_arg():
+    ctx = EvalContext(mode=Mode.Signature, args=[b"\x05", b"hello", b"", b"\x01\x00", b"world!"])
+    program = Btoi(Arg(0)) + Len(Arg(1)) + Len(Arg(2)) + Btoi(Arg(3)) + Len(Arg(4))
+
+    stack, _ = compile_and_run(program, Mode.Signature, context=ctx)
+
+    assert stack == [5 + 5 + 0 + 256 + 6]
+
+
+def test_args():
+    ctx = EvalContext(mode=Mode.Signature, args=[b"\x01", b"\x02\x00\x00"])
+    program = Len(Arg(Btoi(Arg(0))))
+
+    stack, _ = compile_and_run(program, Mode.Signature, context=ctx)
+
+    assert stack == [3]
+
+
+def test_arg_out_of_bounds():
+    ctx = EvalContext(mode=Mode.Signature, args=[b"\x01"])
+
+    with pytest.raises(Panic, match="out of bounds"):
+        compile_and_run(Len(Arg(1)), Mode.Signature, context=ctx)
+    with pytest.raises(Panic, match="out of bounds"):
+        compile_and_run(Len(Arg(Btoi(Arg(0)))), Mode.Signature, context=ctx)
+
+
+def test_logicsig_budget():
+    i = ScratchVar()
+
+    def loop(iterations: int):
+        return Seq(For(i.store(Int(0)), i.load() < Int(iterations), i.store(i.load() + Int(1))).Do(Seq()), Int(1))
+
+    ctx = EvalContext(mode=Mode.Signature)
+    stack, _ = compile_and_run(loop(1000), Mode.Signature, context=ctx)
+    assert stack == [1]
+    assert ctx.cost < MaxLogicSigCost
+
+    # also enforced when no context is given
+    with pytest.raises(Panic, match="budget exceeded"):
+        compile_and_run(loop(10000), Mode.Signature)
+
+    with pytest.raises(Panic, match="budget exceeded"):
+        compile_and_run(loop(1000), Mode.Signature, context=EvalContext(mode=Mode.Signature, budget=700))
+
+    # applications are not limited unless the budget is given
+    compile_and_run(loop(10000), Mode.Application)
+
+
+def test_opcode_allowlist():
+    with pytest.raises(Panic, match="app_global_get is not allowed in Signature mode"):
+        eval_teal(["#pragma version 8", 'byte "key"', "app_global_get"], context=EvalContext(mode=Mode.Signature))
+    with pytest.raises(Panic, match="arg_0 is not allowed in Application mode"):
+        eval_teal(["#pragma version 8", "arg_0"], context=EvalContext())
+    # ed25519verify became available in applications in v5
+    program = ["byte 0x00", "dup", "dup", "ed25519verify"]
+    with pytest.raises(Panic, match="ed25519verify is not allowed in Application mode"):
+        eval_teal(["#pragma version 4"] + program, context=EvalContext())
+    Program(["#pragma version 4"] + program, Mode.Signature)
+    Program(["#pragma version 5"] + program, Mode.Application)
+
+
+def test_mode_mismatch():
+    with pytest.raises(EvaluatorError, match="Application program can't be evaluated in Signature mode"):
+        compile_and_run(Int(1), Mode.Application, context=EvalContext(mode=Mode.Signature))
@@ -0,0 +1,89 @@
+import base64
+import json
+
+import msgpack
+from algosdk.encoding import msgpack_encode
+from algosdk.transaction import PaymentTxn
+from pyteal import App, Assert, Btoi, Bytes, Int, Log, Mode, Seq, Txn, compileTeal
+
+from pytealext.evaluator.replay import main, read_records, replay
+from tests.txn_helpers import PARAMS, SENDER, app_call, call_record
+
+APPROVAL = compileTeal(
+    Seq(
+        Assert(Btoi(Txn.application_args[0])),
+        App.globalPut(Bytes("total"), App.globalGet(Bytes("total")) + Btoi(Txn.application_args[0])),
+        App.localPut(Int(0), Bytes("calls"), App.localGet(Int(0), Bytes("calls")) + Int(1)),
+        Log(Bytes("ok")),
+        Int(1),
+    ),
+    Mode.Application,
+    version=8,
+)
+
+
+def uint_entry(key: bytes, value: int) -> dict:
+    return {"key": base64.b64encode(key).decode(), "value": {"type": 2, "uint": value}}
+
+
+def record(amount: int, total: int) -> dict:
+    return {
+        **call_record(amount),
+        "global-state": [uint_entry(b"total", total)],
+        "local-state": [uint_entry(b"calls", 1)],
+    }
+
+
+def test_replay():
+    records = [record(5, 10), record(0, 10), {"txn": msgpack_encode(PaymentTxn(SENDER, PARAMS, SENDER, 1))}]
+
+    results = list(replay(APPROVAL, records))
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert results[0].error is None
+    assert results[0].cost > 0
+    assert results[0].global_delta == {b"total": 15}
+    assert results[0].local_delta == {b"calls": 2}
+    assert results[0].log == [b"ok"]
+    assert results[0].txid == app_call(5).get_txid()
+    assert results[1].error == "Assert failed"
+    assert results[1].global_delta == {}
+    assert results[2].error == "not an application call: pay"
+
+
+def test_replay_in_processes():
+    records = [record(i % 7, i) for i in range(200)]
+
+    sequential = list(replay(APPROVAL, records))
+    parallel = list(replay(APPROVAL, records, processes=2, chunksize=16))
+
+    assert parallel == sequential
+
+
+def test_read_records(tmp_path):
+    records = [record(1, 2), record(3, 4)]
+    jsonl = tmp_path / "calls.jsonl"
+    jsonl.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+    packed = tmp_path / "calls.msgpack"
+    packed.write_bytes(
+        b"".join(msgpack.packb({**r, "txn": app_call(1 + 2 * i).dictify()}) for i, r in enumerate(records))
+    )
+
+    assert list(read_records(jsonl)) == records
+    from_msgpack = list(replay(APPROVAL, read_records(packed)))
+    assert [result.global_delta for result in from_msgpack] == [{b"total": 3}, {b"total": 7}]
+
+
+def test_main(tmp_path, capsys):
+    teal = tmp_path / "approval.teal"
+    teal.write_text(APPROVAL)
+    jsonl = tmp_path / "calls.jsonl"
+    jsonl.write_text("\n".join(json.dumps(record(i, 0)) for i in range(3)))
+
+    main([str(teal), str(jsonl)])
+
+    out, err = capsys.readouterr()
+    lines = [json.loads(line) for line in out.splitlines()]
+    assert [line["error"] for line in lines] == ["Assert failed", None, None]
+    assert lines[2]["global-delta"] == {base64.b64encode(b"total").decode(): 2}
+    assert json.loads(err) == {"calls": 3, "failed": 1, "total-cost": sum(line["cost"] for line in lines)}
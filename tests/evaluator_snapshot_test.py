@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+
+from pytealext.evaluator import snapshot
+from pytealext.evaluator.snapshot import (
+    decode_state,
+    dump_state_json,
+    dump_state_msgpack,
+    encode_state,
+    load_state_json,
+    load_state_msgpack,
+)
+
+STATE = {
+    b"counter": 2**64 - 1,
+    b"zero": 0,
+    b"name": b"pytealext",
+    b"\x00\xff": b"",
+    b"big": bytes(range(120)),
+}
+
+
+def test_decode_state():
+    entries = [{"key": "YQ==", "value": {"type": 2, "uint": 5}}, {"key": "Yg==", "value": {"type": 1, "bytes": "AAE="}}]
+    assert decode_state(entries) == {b"a": 5, b"b": b"\x00\x01"}
+    # zero values are omitted by algod
+    assert decode_state([{"key": "YQ==", "value": {"type": 2}}, {"key": "Yg==", "value": {"type": 1}}]) == {
+        b"a": 0,
+        b"b": b"",
+    }
+    with pytest.raises(ValueError, match="Unknown TealValue type"):
+        decode_state([{"key": "YQ==", "value": {"type": 3}}])
+
+
+def test_json_roundtrip(tmp_path, monkeypatch):
+    path = tmp_path / "state.json"
+    dump_state_json(STATE, path)
+    assert json.loads(path.read_text()) == list(encode_state(STATE))
+    assert load_state_json(path) == STATE
+
+    # values split across reads are handled
+    monkeypatch.setattr(snapshot, "CHUNK_SIZE", 7)
+    assert load_state_json(path) == STATE
+    assert load_state_json(io.StringIO("[]")) == {}
+    with pytest.raises(ValueError):
+        load_state_json(io.StringIO('[{"key": "YQ==", "value": {"type": 2}}'))
+
+
+def test_json_layouts():
+    entries = list(encode_state(STATE))
+    jsonl = "\n".join(json.dumps(entry) for entry in entries)
+    algod_app = {"id": 1, "params": {"creator": "", "global-state": entries}}
+    indexer_app = {"application": algod_app, "current-round": 10}
+    algod_local = {"app-local-state": {"id": 1, "key-value": entries}, "round": 10}
+
+    for dump in (jsonl, json.dumps(algod_app), json.dumps(indexer_app), json.dumps(algod_local)):
+        assert load_state_json(io.StringIO(dump)) == STATE
+
+
+def test_msgpack_roundtrip(tmp_path):
+    path = tmp_path / "state.msgpack"
+    dump_state_msgpack(STATE, path)
+    assert load_state_msgpack(path) == STATE
+
+    buffer = io.BytesIO()
+    dump_state_msgpack({}, buffer)
+    buffer.seek(0)
+    assert load_state_msgpack(buffer) == {}
@@ -0,0 +1,94 @@
+from io import StringIO
+
+import pytest
+from feature_gates import FeatureGates
+from pyteal import Bytes, For, Int, ScratchVar, Seq
+
+from pytealext import Uint64Array
+from pytealext.evaluator import (
+    EvalContext,
+    Program,
+    SourceLocation,
+    SourceMap,
+    SourceProfiler,
+    compile_with_source_map,
+    eval_teal,
+    summarize_execution,
+)
+
+
+@pytest.fixture
+def sourcemap_enabled():
+    enabled = FeatureGates.sourcemap_enabled()
+    FeatureGates.set_sourcemap_enabled(True)
+    yield
+    FeatureGates.set_sourcemap_enabled(enabled)
+
+
+def build_program():
+    arr = Uint64Array()
+    i, total = ScratchVar(), ScratchVar()
+    return Seq(
+        arr.decode(Bytes(b"".join(i.to_bytes(8, "big") for i in range(10)))),
+        total.store(Int(1)),
+        For(i.store(Int(0)), i.load() < arr.length(), i.store(i.load() + Int(1))).Do(
+            total.store(total.load() + arr[i.load()])
+        ),
+        total.load(),
+    )
+
+
+@pytest.mark.usefixtures("sourcemap_enabled")
+def test_cost_is_attributed_to_python_lines():
+    teal, source_map = compile_with_source_map(build_program(), version=8)
+    program = Program(teal)
+    profiler = SourceProfiler(program, source_map)
+
+    stack, _ = eval_teal(program, hooks=profiler)
+
+    assert stack == [46]
+    files = {location.file for location in profiler.cost}
+    assert any(file.endswith("tests/evaluator_sourcemap_test.py") for file in files)
+    # ops of the array element access are attributed to the lines of Uint64Array
+    array_ops = {location: count for location, count in profiler.op_count.items() if location.file.endswith("array.py")}
+    assert array_ops
+    assert max(array_ops.values()) >= 10  # executed in each iteration
+
+
+def test_profile_adds_up_to_the_execution_cost():
+    # base64_decode costs 1 per 16 bytes of the input on top of its static cost
+    encoded = b"AAAA" * 20
+    program = Program(["#pragma version 8", f"byte 0x{encoded.hex()}", "base64_decode StdEncoding", "len", "return"])
+    location = SourceLocation("contract.py", 1)
+    profiler = SourceProfiler(program, SourceMap([location] * len(program.instructions)))
+    ctx = EvalContext()
+
+    eval_teal(program, context=ctx, hooks=profiler)
+
+    assert profiler.cost[location] == ctx.cost == 1 + 1 + 5 + 1 + 1
+
+
+@pytest.mark.usefixtures("sourcemap_enabled")
+def test_summarize_execution_with_source_map():
+    teal, source_map = compile_with_source_map(build_program(), version=8)
+    program = Program(teal)
+    profiler = SourceProfiler(program, source_map)
+    debug = StringIO()
+    eval_teal(program, debug=debug, hooks=profiler)
+
+    summary = summarize_execution(debug.getvalue(), source_map)
+
+    assert summary.source_cost == dict(profiler.cost)
+    assert summary.source_op_count == dict(profiler.op_count)
+    assert sum(summary.source_cost.values()) <= summary.execution_cost
+    assert str(SourceLocation("pytealext/array.py", 12)) == "pytealext/array.py:12"
+
+
+def test_summarize_execution_without_source_map():
+    debug = StringIO()
+    eval_teal(["#pragma version 8", "int 1", "return"], debug=debug)
+
+    summary = summarize_execution(debug.getvalue())
+
+    assert summary.execution_cost == 2
+    assert not summary.source_cost
@@ -22,7 +22,7 @@ from pyteal import (
     compileTeal,
 )
 
-from pytealext.evaluator import EvalContext, Panic, compile_and_run, eval_teal
+from pytealext.evaluator import EvalContext, Limits, Panic, compile_and_run, eval_teal, evaluator, limits
 
 VERSION = 7
 
@@ -62,6 +62,57 @@ def test_log():
 
     assert stack == [1]
     assert ctx.log == [b"wubwub", b"numbertwo"]
+    assert ctx.log_size == len(b"wubwub") + len(b"numbertwo")
+
+
+def test_log_limits():
+    def log_program(count: int, size: int) -> list[str]:
+        return ["#pragma version 8", f"byte 0x{'00' * size}", "log"] * count + ["int 1"]
+
+    eval_teal(log_program(32, 32), context=EvalContext())
+    with pytest.raises(Panic, match="log calls limit exceeded"):
+        eval_teal(log_program(33, 1), context=EvalContext())
+    with pytest.raises(Panic, match="log size limit exceeded"):
+        eval_teal(log_program(2, 513), context=EvalContext())
+
+    limits = Limits(max_log_calls=1000, max_log_size=2000)
+    eval_teal(log_program(1000, 2), context=EvalContext(limits=limits))
+    with pytest.raises(Panic, match="log size limit exceeded"):
+        eval_teal(log_program(1001, 2), context=EvalContext(limits=limits))
+
+
+def test_state_size_limits():
+    ctx = EvalContext(global_state={b"a": b"xyz", b"b": 1})
+
+    program = [
+        "#pragma version 8",
+        'byte "a"',
+        'byte "long value"',
+        "app_global_put",
+        'byte "c"',
+        "int 5",
+        "app_global_put",
+        "int 0",
+        'byte "local"',
+        'byte "value"',
+        "app_local_put",
+        "int 1",
+    ]
+    eval_teal(program, context=ctx)
+    assert ctx.global_state == {b"a": b"long value", b"b": 1, b"c": 5}
+    assert ctx.local_state == {b"local": b"value"}
+
+    with pytest.raises(Panic, match="key too long"):
+        eval_teal([f"byte 0x{'01' * 65}", "int 1", "app_global_put"], context=EvalContext())
+    with pytest.raises(Panic, match="key/value total too long"):
+        eval_teal([f"byte 0x{'01' * 64}", f"byte 0x{'01' * 65}", "app_global_put"], context=EvalContext())
+    eval_teal([f"byte 0x{'01' * 64}", f"byte 0x{'01' * 64}", "app_global_put"], context=EvalContext())
+
+    full = EvalContext(local_state={bytes([i]): i for i in range(16)})
+    with pytest.raises(Panic, match="Local state size exceeded"):
+        eval_teal(["int 0", "byte 0xff", "int 1", "app_local_put"], context=full)
+    # overwriting an existing key does not need additional space
+    eval_teal(["int 0", "byte 0x00", "int 1", "app_local_put"], context=full)
 
 
 def test_equals():
@@ -137,6 +188,21 @@ def test_extract():
     assert stack[0] == 1
 
 
+def test_extract_out_of_bounds():
+    programs = [
+        ["byte 0x0102030405", "int 2", "int 4", "extract3"],
+        ["byte 0x0102030405", "int 6", "int 0", "extract3"],
+        ["byte 0x01020304", "int 1", "extract_uint32"],
+        ["byte 0x0102", "int 1", "extract_uint16"],
+    ]
+    for program in programs:
+        with pytest.raises(Panic):
+            eval_teal(program)
+
+    stack, _ = eval_teal(["byte 0x0102030405", "int 1", "extract_uint32"])
+    assert stack == [0x02030405]
+
+
 def test_local_state():
     mapping = {
         b"0": 0,
@@ -251,6 +317,9 @@ def test_exp_fails_for_overflow(i: int, j: int):
         ("b", 0, "a", "a"),
         ("Hello, World!", 7, "devil", "Hello, devil!"),
         ("Hello, World!", 5, "", "Hello, World!"),
+        ("Hello, World!", 7, "World", "Hello, World!"),
+        ("Hello, World!", 12, "?", "Hello, World?"),
+        ("Hello, World!", 13, "", "Hello, World!"),
     ),
 )
 def test_replace(string: str, start: int, replacement: str, expected: str):
@@ -269,3 +338,92 @@ def test_replace(string: str, start: int, replacement: str, expected: str):
 
     stack, _ = eval_teal(program_rep3.splitlines())
     assert stack == [1]
+
+
+def test_shifts():
+    stack, _ = eval_teal(["int 18446744073709551615", "int 4", "shl", "int 255", "int 4", "shr"])
+    assert stack == [0xFFFFFFFFFFFFFFF0, 0x0F]
+
+    for program in (["int 1", "int 64", "shl"], ["int 1", "int 64", "shr"]):
+        with pytest.raises(Panic):
+            eval_teal(program)
+
+
+def test_getbyte_setbyte():
+    stack, _ = eval_teal(["byte 0x0102ff", "int 2", "getbyte", "byte 0x0102ff", "int 1", "int 7", "setbyte"])
+    assert stack == [0xFF, b"\x01\x07\xff"]
+
+    programs = [
+        ["byte 0x0102", "int 2", "getbyte"],
+        ["byte 0x0102", "int 2", "int 0", "setbyte"],
+        ["byte 0x0102", "int 0", "int 256", "setbyte"],
+    ]
+    for program in programs:
+        with pytest.raises(Panic):
+            eval_teal(program)
+
+
+def test_getbit_setbit():
+    stack, _ = eval_teal(
+        ["int 5", "int 2", "getbit", "byte 0x4000", "int 1", "getbit", "byte 0x4000", "int 9", "getbit"]
+    )
+    assert stack == [1, 1, 0]
+
+    stack, _ = eval_teal(["int 5", "int 0", "int 0", "setbit", "byte 0x0000", "int 15", "int 1", "setbit"])
+    assert stack == [4, b"\x00\x01"]
+
+    programs = [
+        ["int 1", "int 64", "getbit"],
+        ["byte 0x00", "int 8", "getbit"],
+        ["byte 0x00", "int 8", "int 1", "setbit"],
+        ["byte 0x00", "int 0", "int 2", "setbit"],
+    ]
+    for program in programs:
+        with pytest.raises(Panic):
+            eval_teal(program)
+
+
+def test_bytes_bitwise_ops():
+    stack, _ = eval_teal(
+        ["byte 0x0f0f", "byte 0x01", "b|", "byte 0x0f0f", "byte 0xff", "b&", "byte 0x0f0f", "byte 0x00ff", "b^"]
+    )
+    assert stack == [b"\x0f\x0f", b"\x00\x0f", b"\x0f\xf0"]
+
+    stack, _ = eval_teal(["byte 0x0ff0", "b~"])
+    assert stack == [b"\xf0\x0f"]
+
+
+@pytest.mark.parametrize(
+    "encoding,encoded,expected",
+    [
+        ("StdEncoding", b"aGVsbG8=", b"hello"),
+        ("StdEncoding", b"aGVsbG8", b"hello"),
+        ("StdEncoding", b"+/+/", b"\xfb\xff\xbf"),
+        ("URLEncoding", b"-_-_", b"\xfb\xff\xbf"),
+        ("URLEncoding", b"", b""),
+    ],
+)
+def test_base64_decode(encoding: str, encoded: bytes, expected: bytes):
+    stack, _ = eval_teal([f"byte 0x{encoded.hex()}", f"base64_decode {encoding}"])
+    assert stack == [expected]
+
+
+@pytest.mark.parametrize(
+    "encoding,encoded",
+    [
+        ("StdEncoding", b"-_-_"),  # URL alphabet
+        ("URLEncoding", b"+/+/"),  # standard alphabet
+        ("StdEncoding", b"aGVsbG9="),  # non-zero padding bits
+        ("StdEncoding", b"aGVsbG8=="),  # too much padding
+        ("StdEncoding", b"a"),
+        ("RawEncoding", b"aGVsbG8="),
+    ],
+)
+def test_base64_decode_fails_for_invalid_input(encoding: str, encoded: bytes):
+    with pytest.raises(Panic):
+        eval_teal([f"byte 0x{encoded.hex()}", f"base64_decode {encoding}"])
+
+
+def test_limits_are_importable_from_the_evaluator():
+    for name in ("MaxLogCalls", "MaxLogSize", "MaxStringSize", "MaxLocalStateSize", "MaxGlobalStateSize"):
+        assert getattr(evaluator, name) == getattr(limits, name)
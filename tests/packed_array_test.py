@@ -0,0 +1,159 @@
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from pyteal import Assert, Bytes, Int, Len, Seq, TealInputError
+
+from pytealext import BitPackedArray, Uint8Array, Uint16Array, Uint32Array
+from pytealext.evaluator import Panic, compile_and_run
+
+ARRAY_TYPES = ((Uint8Array, 1), (Uint16Array, 2), (Uint32Array, 4))
+
+
+def encode_list(integers: list[int], width: int) -> bytes:
+    return b"".join(val.to_bytes(width, "big") for val in integers)
+
+
+def encode_bits(integers: list[int], bits: int) -> bytes:
+    """Encode list of ints into the representation of BitPackedArray."""
+    packed = 0
+    for val in integers:
+        packed = (packed << bits) | val
+    padding = -len(integers) * bits % 8
+    return len(integers).to_bytes(2, "big") + (packed << padding).to_bytes((len(integers) * bits + padding) // 8, "big")
+
+
+@pytest.mark.parametrize("array_type,width", ARRAY_TYPES)
+@given(data=st.data())
+@settings(deadline=None)
+def test_byte_aligned_arrays(array_type, width: int, data: st.DataObject):
+    values = data.draw(st.lists(st.integers(min_value=0, max_value=2 ** (8 * width) - 1), min_size=1, max_size=10))
+    index = data.draw(st.integers(min_value=0, max_value=len(values) - 1))
+    new_value = data.draw(st.integers(min_value=0, max_value=2 ** (8 * width) - 1))
+    expected = values.copy()
+    expected[index] = new_value
+
+    arr = array_type()
+    program = Seq(
+        arr.initialize(),
+        *(arr.append(Int(val)) for val in values),
+        Assert(arr.encode() == Bytes(encode_list(values, width))),
+        arr.set(Int(index), Int(new_value)),
+        Assert(arr.encode() == Bytes(encode_list(expected, width))),
+        Assert(arr.length() == Int(len(expected))),
+        Assert(arr[index] == Int(new_value)),
+        Assert(arr[Int(len(expected) - 1)] == Int(expected[-1])),
+        Assert(arr.index(Int(new_value)) == Int(expected.index(new_value))),
+        Assert(arr.exists(Int(new_value))),
+        arr.sum(),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [sum(expected)]
+
+
+@pytest.mark.parametrize("array_type,width", ARRAY_TYPES)
+def test_byte_aligned_array_not_found(array_type, width: int):
+    arr = array_type()
+    program = Seq(
+        arr.decode(Bytes(encode_list([1, 2, 3], width))),
+        Assert(arr.index(Int(4)) == Int(2**64 - 1)),
+        Assert(arr.exists(Int(4)) == Int(0)),
+        Int(1),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [1]
+
+
+@pytest.mark.parametrize("array_type,width", ARRAY_TYPES)
+def test_byte_aligned_array_overflow(array_type, width: int):
+    too_big = Int(2 ** (8 * width))
+    for write in ("append", "set"):
+        arr = array_type()
+        program = Seq(
+            arr.decode(Bytes(encode_list([0], width))),
+            arr.append(too_big) if write == "append" else arr.set(0, too_big),
+            Int(1),
+        )
+        with pytest.raises(Panic):
+            compile_and_run(program)
+
+
+@pytest.mark.parametrize("bits", (1, 3, 8, 12, 31, 57))
+@given(data=st.data())
+@settings(deadline=None)
+def test_bit_packed_array(bits: int, data: st.DataObject):
+    values = data.draw(st.lists(st.integers(min_value=0, max_value=2**bits - 1), min_size=1, max_size=12))
+    index = data.draw(st.integers(min_value=0, max_value=len(values) - 1))
+    new_value = data.draw(st.integers(min_value=0, max_value=2**bits - 1))
+    expected = values.copy()
+    expected[index] = new_value
+
+    arr = BitPackedArray(bits)
+    program = Seq(
+        arr.initialize(),
+        *(arr.append(Int(val)) for val in values),
+        Assert(arr.encode() == Bytes(encode_bits(values, bits))),
+        arr.set(Int(index), Int(new_value)),
+        Assert(arr.encode() == Bytes(encode_bits(expected, bits))),
+        Assert(arr.length() == Int(len(expected))),
+        Assert(arr[index] == Int(new_value)),
+        Assert(arr[Int(len(expected) - 1)] == Int(expected[-1])),
+        Assert(arr.index(Int(new_value)) == Int(expected.index(new_value))),
+        Assert(arr.exists(Int(new_value))),
+        arr.sum(),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [sum(expected)]
+
+
+def test_bit_packed_array_example():
+    flags = BitPackedArray(3)
+    program = Seq(
+        flags.initialize(),
+        flags.append(Int(5)),
+        flags.append(Int(7)),
+        Assert(flags[1] == Int(7)),
+        Assert(flags.index(Int(6)) == Int(2**64 - 1)),
+        Len(flags.encode()),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [3]
+
+
+@pytest.mark.parametrize("bits", (3, 7, 57))
+def test_bit_packed_array_of_maximum_size(bits: int):
+    # the array is within 7 bytes of the 4096 bytes a value can hold, reads must not pad the whole array
+    count = (4096 - 2) * 8 // bits
+    values = [i % 2**bits for i in range(count)]
+    last = count - 1
+    encoded = encode_bits(values, bits)
+    assert len(encoded) > 4096 - 8
+    arr = BitPackedArray(bits)
+    program = Seq(
+        arr.decode(Bytes(encoded)),
+        Assert(arr[last] == Int(values[last])),
+        arr.set(last, Int(1)),
+        Assert(arr[last] == Int(1)),
+        Assert(arr.index(Int(1)) == Int(values.index(1))),
+        arr.sum(),
+    )
+
+    stack, _ = compile_and_run(program)
+    assert stack == [sum(values) - values[last] + 1]
+
+
+def test_bit_packed_array_overflow():
+    arr = BitPackedArray(5)
+    for write in (arr.append(Int(32)), arr.set(0, Int(32))):
+        program = Seq(arr.decode(Bytes(encode_bits([1], 5))), write, Int(1))
+        with pytest.raises(Panic):
+            compile_and_run(program)
+
+
+@pytest.mark.parametrize("bits", (0, 58, 64))
+def test_bit_packed_array_invalid_width(bits: int):
+    with pytest.raises(TealInputError):
+        BitPackedArray(bits)
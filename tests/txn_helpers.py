@@ -0,0 +1,19 @@
+"""Transactions and call records (in the format of the replay module) shared by the tests"""
+
+import base64
+
+from algosdk.encoding import msgpack_encode
+from algosdk.transaction import ApplicationCallTxn, OnComplete, SuggestedParams
+
+SENDER = "7777777777777777777777777777777777777777777777777774MSJUVU"
+PARAMS = SuggestedParams(fee=1000, first=1, last=1000, gh=base64.b64encode(bytes(32)).decode(), flat_fee=True)
+
+
+def app_call(amount: int) -> ApplicationCallTxn:
+    """NoOp call of application 1 with the amount as its only argument"""
+    return ApplicationCallTxn(SENDER, PARAMS, 1, OnComplete.NoOpOC, app_args=[amount.to_bytes(8, "big")])
+
+
+def call_record(amount: int) -> dict:
+    """Record of an app_call without the application state"""
+    return {"txn": msgpack_encode(app_call(amount))}